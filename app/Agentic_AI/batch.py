@@ -0,0 +1,255 @@
+"""
+Command-line batch screening with checkpointing.
+
+Usage (from the app/ directory):
+
+    python -m Agentic_AI.batch --jd jd.txt --resumes path/to/resumes/
+
+Pass several --jd files to screen the pool against multiple requisitions
+in one pass (each resume is parsed and embedded only once).
+
+Every stage and every chunk of resumes is checkpointed under
+data/checkpoints/<run_id>. Re-running the same command after a crash
+resumes from the last completed chunk. The run ID covers the JD, each
+resume's content, the weights and the chunking options, and an explicit
+--run-id is refused when its checkpoints were written for other inputs.
+
+For very large pools, --shards N scores N shards in parallel worker
+processes (or on remote workers, see sharding.py); --top-k K keeps only
+the top K candidates (sharded runs default to 100, so shards send back
+their top K rather than their whole pool). --stream screens in chunks within a memory budget,
+keeping only score rows and the top K (see streaming.py). --parquet PATH
+exports the ranked results table (see results_table.py) for BI tools.
+"""
+import argparse
+import json
+from pathlib import Path
+from typing import List
+
+from .checkpoint import CheckpointMismatch, RunCheckpoint, make_run_id, run_manifest
+from .config import (
+    DEFAULT_WEIGHTS,
+    CHECKPOINT_CHUNK_SIZE,
+    PROFILE_RUNS,
+    DEDUPE_ENABLED,
+    SHARD_WORKERS,
+    STREAM_MEMORY_MB,
+)
+from .scheduler import BATCH, priority
+from .graph import build_agent_graph, build_multi_jd_graph, AgentState, MultiJDState
+from .results_table import results_table, write_parquet
+
+RESUME_SUFFIXES = {".pdf", ".docx", ".doc", ".txt"}
+
+
+def collect_resume_paths(inputs: List[str]) -> List[str]:
+    paths: List[str] = []
+    for item in inputs:
+        p = Path(item)
+        if p.is_dir():
+            paths.extend(
+                str(f) for f in sorted(p.rglob("*")) if f.suffix.lower() in RESUME_SUFFIXES
+            )
+        else:
+            paths.append(str(p))
+    return paths
+
+
+def _print_duplicates(clusters) -> None:
+    if not clusters:
+        return
+    collapsed = sum(len(c.member_ids) - 1 for c in clusters)
+    print(f"Collapsed {collapsed} near-duplicate resume(s) into {len(clusters)} cluster(s):")
+    for c in clusters:
+        print(f"  {c.min_similarity:.2f}  " + " | ".join(c.member_names))
+
+
+def _print_rationale_stats(rstats) -> None:
+    print(
+        f"Rationales: {rstats.llm_candidates} by LLM ({rstats.llm_calls} calls, {rstats.reused} reused), "
+        f"templates: {rstats.template_shortlist} shortlist / {rstats.template_reject} reject / "
+        f"{rstats.template_over_budget} over budget"
+        + (f"; ~{rstats.est_seconds_saved:.1f}s LLM time saved" if rstats.est_seconds_saved else "")
+    )
+
+
+def _run_stream(args, jd_text: str, resume_paths: List[str], weights, run_id: str) -> None:
+    from .jd_parser import parse_jd
+    from .streaming import stream_rank
+
+    ckpt = RunCheckpoint(run_id)
+    if ckpt.has("jd"):
+        jd = ckpt.load("jd")
+    else:
+        jd = parse_jd(jd_text)
+        ckpt.save("jd", jd)
+    result = stream_rank(
+        jd,
+        resume_paths,
+        weights,
+        top_k=args.top_k or 100,
+        memory_mb=args.memory_mb,
+        spill=args.spill,
+        run_id=run_id,
+        ckpt=ckpt,
+    )
+    stats = result.stats
+    print(
+        f"Streamed {stats.count} candidates in {result.chunks} chunks (largest {result.max_chunk}): "
+        f"mean {stats.mean:.3f} ± {stats.std:.3f}, max {stats.max_score:.3f}"
+    )
+    _print_rationale_stats(result.rationale_stats)
+    for c in result.top[:10]:
+        print(f"{c.rank_full:>4}  {c.scores.composite_score:.3f}  {c.resume.name}")
+    if args.parquet:
+        print(f"Results written to {write_parquet(result.table, args.parquet)}")
+
+
+def _export_multi(result, path: str) -> None:
+    """One table for all JDs, with the JD's index and role title on each row."""
+    import pyarrow as pa
+
+    tables = []
+    for j, (jd, ranked) in enumerate(zip(result.jds, result.rankings)):
+        table = results_table(ranked)
+        table = table.add_column(0, "jd_index", pa.array([j] * table.num_rows, pa.int32()))
+        tables.append(table.add_column(1, "jd_role", pa.array([jd.role_title] * table.num_rows, pa.string())))
+    print(f"Results written to {write_parquet(pa.concat_tables(tables), path)}")
+
+
+def main(argv=None) -> None:
+    # Batch jobs yield LLM / embedding capacity to interactive (UI) runs
+    with priority(BATCH):
+        _main(argv)
+
+
+def _main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Resumable batch resume screening")
+    parser.add_argument("--jd", nargs="+", required=True, help="Job description text file(s)")
+    parser.add_argument("--resumes", nargs="+", required=True, help="Resume files or directories")
+    parser.add_argument("--weights", help="JSON file with scoring weights")
+    parser.add_argument("--run-id", help="Checkpoint run ID (default: derived from inputs)")
+    parser.add_argument("--chunk-size", type=int, default=CHECKPOINT_CHUNK_SIZE)
+    parser.add_argument(
+        "--no-dedupe",
+        dest="dedupe",
+        action="store_false",
+        default=DEDUPE_ENABLED,
+        help="Score near-duplicate resumes separately instead of once per cluster",
+    )
+    parser.add_argument(
+        "--shards",
+        type=int,
+        default=0,
+        help=f"Score in N shards across worker processes (e.g. {SHARD_WORKERS}) or SHARD_ADDRESS workers",
+    )
+    parser.add_argument(
+        "--top-k",
+        type=int,
+        default=None,
+        help="Keep only the top K candidates (0 = all; default 100 with --shards, else all)",
+    )
+    parser.add_argument("--parquet", help="Write the ranked results table to this Parquet file")
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Bounded-memory mode for very large pools: chunked, keeps score rows + top K only (no dedupe)",
+    )
+    parser.add_argument("--memory-mb", type=float, default=STREAM_MEMORY_MB, help="Memory budget for --stream")
+    parser.add_argument("--spill", action="store_true", help="With --stream, keep raw text in a JSONL spill file")
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        default=PROFILE_RUNS,
+        help="Profile CPU + memory per node (artifacts in data/profiles/<run_id>)",
+    )
+    args = parser.parse_args(argv)
+    if args.top_k is None:
+        args.top_k = 100 if args.shards > 1 else 0
+
+    jd_texts = [Path(p).read_text(encoding="utf-8") for p in args.jd]
+    resume_paths = collect_resume_paths(args.resumes)
+    weights = dict(DEFAULT_WEIGHTS)
+    if args.weights:
+        weights.update(json.loads(Path(args.weights).read_text(encoding="utf-8")))
+
+    # Options that decide chunk / shard boundaries or what a chunk keeps
+    if args.stream:
+        options = {"stream": True, "memory_mb": args.memory_mb, "top_k": args.top_k}
+    else:
+        options = {"chunk_size": args.chunk_size, "dedupe": args.dedupe, "shards": args.shards, "top_k": args.top_k}
+    manifest = run_manifest("\n---\n".join(jd_texts), resume_paths, weights, **options)
+    run_id = args.run_id or make_run_id(manifest)
+    try:
+        RunCheckpoint(run_id).check_manifest(manifest)
+    except CheckpointMismatch as exc:
+        parser.error(f"{exc}; pass a new --run-id or delete data/checkpoints/{run_id}")
+    print(f"Run {run_id}: {len(resume_paths)} resumes, {len(jd_texts)} JD(s)")
+
+    if len(jd_texts) > 1:
+        multi_state: MultiJDState = {
+            "run_id": run_id,
+            "checkpoint": True,
+            "chunk_size": args.chunk_size,
+            "jd_texts": jd_texts,
+            "resume_paths": resume_paths,
+            "dedupe": args.dedupe,
+            "weights": weights,
+        }
+        multi_final = build_multi_jd_graph().invoke(multi_state)
+        _print_duplicates(multi_final.get("duplicate_clusters", []))
+        result = multi_final["result"]
+        for jd, ranked in zip(result.jds, result.rankings):
+            print(f"\n== {jd.role_title}")
+            for c in ranked[:10]:
+                print(f"{c.rank_full:>4}  {c.scores.composite_score:.3f}  {c.resume.name}")
+        print("\n== Best-fit JD per candidate")
+        for c in result.rankings[0]:
+            j, score = result.best_fit[c.resume.resume_id]
+            print(f"{score:.3f}  {c.resume.name} -> {result.jds[j].role_title}")
+        if args.parquet:
+            _export_multi(result, args.parquet)
+        return
+
+    if args.stream:
+        _run_stream(args, jd_texts[0], resume_paths, weights, run_id)
+        return
+
+    state: AgentState = {
+        "run_id": run_id,
+        "checkpoint": True,
+        "chunk_size": args.chunk_size,
+        "jd_text": jd_texts[0],
+        "resume_paths": resume_paths,
+        "dedupe": args.dedupe,
+        "weights": weights,
+        "shards": args.shards,
+        "top_k": args.top_k,
+    }
+    graph = build_agent_graph()
+    if args.profile:
+        from .profiling import profile_invoke
+
+        final_state, profile_dir = profile_invoke(graph, state, run_id)
+        print(f"Profile written to {profile_dir}")
+    else:
+        final_state = graph.invoke(state)
+
+    _print_duplicates(final_state.get("duplicate_clusters", []))
+    stats = final_state.get("score_stats")
+    if stats is not None:
+        print(
+            f"Scored {stats.count} candidates in {args.shards} shards: "
+            f"mean {stats.mean:.3f} ± {stats.std:.3f}, max {stats.max_score:.3f}"
+        )
+    rstats = final_state.get("rationale_stats")
+    if rstats is not None:
+        _print_rationale_stats(rstats)
+    for c in final_state["full_results"][:10]:
+        print(f"{c.rank_full:>4}  {c.scores.composite_score:.3f}  {c.resume.name}")
+    if args.parquet:
+        print(f"Results written to {write_parquet(final_state['results_table'], args.parquet)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Content-addressed store for raw resume uploads.
+
+Files are saved as UPLOAD_DIR/<sha[:2]>/<sha><suffix>, so identical uploads
+are stored once (re-uploading the same resumes keeps disk usage flat) and
+two different files both named resume.pdf never overwrite each other.
+Parsing works from the in-memory bytes; persisting is off the critical path:
+
+    store = get_blob_store()
+    store.put_async(data, "resume.pdf")   # returns a Future[Path]
+"""
+import hashlib
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+from .config import UPLOAD_DIR, ensure_dir
+
+
+def content_hash(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+class BlobStore:
+    def __init__(self, root: Path = UPLOAD_DIR):
+        self.root = Path(root)
+        self._writer: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def path_for(self, digest: str, filename: str = "") -> Path:
+        suffix = Path(filename).suffix.lower()
+        return self.root / digest[:2] / f"{digest}{suffix}"
+
+    def put(self, data: bytes, filename: str = "", digest: Optional[str] = None) -> Path:
+        """Store `data` unless an identical blob exists; returns its path."""
+        path = self.path_for(digest or content_hash(data), filename)
+        if path.exists():
+            return path
+        ensure_dir(path.parent)
+        # Unique temp name so concurrent writers of the same blob don't clash
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+        return path
+
+    def put_async(self, data: bytes, filename: str = "", digest: Optional[str] = None) -> "Future[Path]":
+        """Queue `put` on a background writer thread."""
+        with self._lock:
+            if self._writer is None:
+                self._writer = ThreadPoolExecutor(max_workers=2, thread_name_prefix="blob-writer")
+        return self._writer.submit(self.put, data, filename, digest)
+
+
+_STORE: Optional[BlobStore] = None
+
+
+def get_blob_store() -> BlobStore:
+    """Process-wide store rooted at UPLOAD_DIR."""
+    global _STORE
+    if _STORE is None:
+        _STORE = BlobStore()
+    return _STORE
@@ -0,0 +1,104 @@
+import hashlib
+import json
+import os
+import pickle
+import shutil
+from pathlib import Path
+from typing import Any, Iterator, List, Optional, Sequence, Tuple
+
+from .config import CHECKPOINT_DIR
+
+
+class CheckpointMismatch(ValueError):
+    """The checkpoint directory was written for different inputs or options."""
+
+
+def file_digest(path: str) -> str:
+    """SHA-256 of a file's contents (read in blocks)."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def run_manifest(jd_text: str, resume_paths: Sequence[str], weights: dict, **options: Any) -> dict:
+    """
+    Everything checkpointed results depend on: the JD, each resume's path and
+    content hash (edited files do not reuse stale chunks), the weights and
+    the options that decide chunk boundaries (chunk size, shards, top-K, ...).
+    """
+    return {
+        "jd": hashlib.sha256(jd_text.encode("utf-8")).hexdigest(),
+        "resumes": [[str(p), file_digest(p)] for p in resume_paths],
+        "weights": weights,
+        "options": options,
+    }
+
+
+def make_run_id(manifest: dict) -> str:
+    """
+    Deterministic run ID for a batch: the same manifest (see run_manifest)
+    maps to the same checkpoint directory, so re-running resumes the batch.
+    """
+    payload = json.dumps(manifest, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def iter_chunks(items: Sequence[Any], size: int) -> Iterator[Tuple[int, List[Any]]]:
+    """Yield (chunk_index, chunk) pairs of at most `size` items."""
+    size = max(int(size), 1)
+    for i, start in enumerate(range(0, len(items), size)):
+        yield i, list(items[start: start + size])
+
+
+class RunCheckpoint:
+    """
+    Local checkpoint store for a single run.
+
+    Each stage (or chunk of a stage) is saved under a key such as
+    "jd" or "parse/00003" as a pickle file in CHECKPOINT_DIR / run_id.
+    Writes are atomic (tmp file + rename), so a crash mid-write never
+    leaves a half-written checkpoint behind.
+    """
+
+    def __init__(self, run_id: str, root: Optional[Path] = None):
+        self.run_id = run_id
+        self.dir = Path(root or CHECKPOINT_DIR) / run_id
+        self.dir.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.dir / f"{key}.pkl"
+
+    def has(self, key: str) -> bool:
+        return self._path(key).exists()
+
+    def load(self, key: str) -> Any:
+        with self._path(key).open("rb") as f:
+            return pickle.load(f)
+
+    def save(self, key: str, value: Any) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(".tmp")
+        with tmp.open("wb") as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+
+    def check_manifest(self, manifest: dict) -> None:
+        """
+        Record the run's manifest, or raise CheckpointMismatch when the
+        directory already holds chunks written for a different one.
+        """
+        if self.has("manifest"):
+            if self.load("manifest") != manifest:
+                raise CheckpointMismatch(
+                    f"checkpoint {self.run_id} was written for different resumes, JD, weights or chunking"
+                )
+            return
+        self.save("manifest", manifest)
+
+    def clear(self) -> None:
+        shutil.rmtree(self.dir, ignore_errors=True)
@@ -1,20 +1,151 @@
 import os
 from pathlib import Path
-from dotenv import load_dotenv
 
 BASE_DIR = Path(__file__).resolve().parents[2]
-DATA_DIR = BASE_DIR / "data"
+# Runtime output (logs, checkpoints, uploads, profiles, stores) lives under
+# DATA_DIR; set it in the process environment (not .env) to run elsewhere,
+# e.g. a load test writing to a temp directory.
+DATA_DIR = Path(os.getenv("DATA_DIR") or BASE_DIR / "data")
 UPLOAD_DIR = DATA_DIR / "uploads"
 LOG_DIR = DATA_DIR / "logs"
+CHECKPOINT_DIR = DATA_DIR / "checkpoints"
+PROFILE_DIR = DATA_DIR / "profiles"
 
-UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
-LOG_DIR.mkdir(parents=True, exist_ok=True)
 
-load_dotenv(BASE_DIR / ".env")
+def ensure_dir(path: Path) -> Path:
+    """Create a data directory on first write (importing config has no side effects)."""
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _load_settings() -> dict:
+    """Read .env (once) and derive env-driven settings."""
+    from dotenv import load_dotenv
+
+    load_dotenv(BASE_DIR / ".env")
+
+    OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
+
+    # Cross-run caches (feature and embedding stores) live in the user's cache
+    # directory, outside the repository
+    CACHE_DIR = Path(
+        os.getenv("CACHE_DIR") or Path(os.getenv("XDG_CACHE_HOME") or Path.home() / ".cache") / "resume-screening"
+    )
+    OPENAI_CHAT_MODEL = os.getenv("OPENAI_CHAT_MODEL", "gpt-4o-mini")
+    OPENAI_EMBED_MODEL = os.getenv("OPENAI_EMBED_MODEL", "text-embedding-3-small")
+    # Optional OpenAI-compatible endpoint (proxy, or a local stub server for tests)
+    OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL") or None
+
+    # Provider rate limits enforced client-side by the shared scheduler
+    # (0 = unlimited). Concurrency adapts between 1 and the max from observed
+    # 429s and latency.
+    LLM_RPM = float(os.getenv("LLM_RPM", "500"))
+    LLM_TPM = float(os.getenv("LLM_TPM", "200000"))
+    LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+    LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+    LLM_TARGET_LATENCY_S = float(os.getenv("LLM_TARGET_LATENCY_S", "15"))
+    EMBED_RPM = float(os.getenv("EMBED_RPM", "3000"))
+    EMBED_TPM = float(os.getenv("EMBED_TPM", "1000000"))
+    EMBED_MAX_CONCURRENCY = int(os.getenv("EMBED_MAX_CONCURRENCY", "4"))
+
+    # Embedding backend: "openai" (network), or local CPU backends "hashing"
+    # (stateless feature hashing) and "tfidf" (TF-IDF + SVD fitted on our corpus).
+    EMBED_BACKEND = os.getenv("EMBED_BACKEND", "openai")
+    EMBED_DIM = int(os.getenv("EMBED_DIM", "1024"))
+    EMBED_TFIDF_PATH = Path(os.getenv("EMBED_TFIDF_PATH", str(DATA_DIR / "models" / "tfidf_svd.npz")))
+    # Shortened OpenAI embeddings (text-embedding-3-* only; 0 = native size)
+    EMBED_DIMENSIONS = int(os.getenv("EMBED_DIMENSIONS", "0"))
+    # Persistent memory-mapped resume embeddings: float32 | float16 | int8
+    EMBED_STORE_ENABLED = os.getenv("EMBED_STORE_ENABLED", "1").lower() in ("1", "true", "yes")
+    EMBED_STORE_DTYPE = os.getenv("EMBED_STORE_DTYPE", "float32").lower()
+    EMBED_STORE_PATH = Path(os.getenv("EMBED_STORE_PATH", str(CACHE_DIR / "embeddings")))
+
+    # Resumable batch runs: resumes are parsed / embedded / scored in chunks of
+    # this size and each completed chunk is checkpointed under CHECKPOINT_DIR.
+    CHECKPOINT_CHUNK_SIZE = int(os.getenv("CHECKPOINT_CHUNK_SIZE", "100"))
+
+    # LLM prompt budgets (approximate tokens, ~4 chars per token)
+    RATIONALE_EVIDENCE_TOKENS = int(os.getenv("RATIONALE_EVIDENCE_TOKENS", "400"))
+    EVIDENCE_CHUNK_CHARS = int(os.getenv("EVIDENCE_CHUNK_CHARS", "400"))
+    BIAS_NOTES_TOKEN_BUDGET = int(os.getenv("BIAS_NOTES_TOKEN_BUDGET", "1500"))
+
+    # Candidates per batched rationale LLM call (1 = one call per candidate)
+    RATIONALE_BATCH_SIZE = int(os.getenv("RATIONALE_BATCH_SIZE", "5"))
+
+    # Score-gated rationales: clear shortlists / rejects get template rationales,
+    # only borderline candidates go to the LLM, at most RATIONALE_LLM_BUDGET per run.
+    RATIONALE_SHORTLIST_SCORE = float(os.getenv("RATIONALE_SHORTLIST_SCORE", "0.65"))
+    RATIONALE_REJECT_SCORE = float(os.getenv("RATIONALE_REJECT_SCORE", "0.35"))
+    RATIONALE_MIN_GAP = float(os.getenv("RATIONALE_MIN_GAP", "0.02"))
+    RATIONALE_SHORTLIST_COVERAGE = float(os.getenv("RATIONALE_SHORTLIST_COVERAGE", "1.0"))
+    RATIONALE_REJECT_COVERAGE = float(os.getenv("RATIONALE_REJECT_COVERAGE", "0.5"))
+    RATIONALE_LLM_BUDGET = int(os.getenv("RATIONALE_LLM_BUDGET", "3"))
+
+    # Per-resume, JD-independent scoring features cached across runs and JDs
+    FEATURE_STORE_ENABLED = os.getenv("FEATURE_STORE_ENABLED", "1").lower() in ("1", "true", "yes")
+    FEATURE_STORE_PATH = Path(os.getenv("FEATURE_STORE_PATH", str(CACHE_DIR / "features.sqlite")))
+
+    # Per-session incremental rescoring cache (incremental.py): least recently
+    # used entries are evicted past these many resumes / JDs.
+    SCORING_CACHE_MAX_RESUMES = int(os.getenv("SCORING_CACHE_MAX_RESUMES", "5000"))
+    SCORING_CACHE_MAX_JDS = int(os.getenv("SCORING_CACHE_MAX_JDS", "64"))
+
+    # Near-duplicate resumes (MinHash + LSH over word shingles): copies whose
+    # estimated Jaccard similarity reaches the threshold are scored once.
+    DEDUPE_ENABLED = os.getenv("DEDUPE_ENABLED", "1").lower() in ("1", "true", "yes")
+    DEDUPE_THRESHOLD = float(os.getenv("DEDUPE_THRESHOLD", "0.8"))
+
+    # Local screening job server (python -m Agentic_AI.job_server). When
+    # JOB_SERVER_URL is set the app submits runs there instead of in-process.
+    JOB_SERVER_URL = os.getenv("JOB_SERVER_URL", "").rstrip("/")
+    JOB_SERVER_PORT = int(os.getenv("JOB_SERVER_PORT", "8766"))
+    JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))
+    JOB_QUEUE_DEPTH = int(os.getenv("JOB_QUEUE_DEPTH", "16"))
+    JOB_MAX_PER_CLIENT = int(os.getenv("JOB_MAX_PER_CLIENT", "4"))
+    JOB_RESULT_TTL_S = float(os.getenv("JOB_RESULT_TTL_S", "3600"))
+
+    # Sharded scoring (python -m Agentic_AI.sharding): shards are scored in
+    # SHARD_WORKERS local processes, or by remote workers polling the queue
+    # server at SHARD_ADDRESS ("host:port") when it is set. SHARD_AUTHKEY has
+    # no default: it is required for any non-loopback address.
+    SHARD_WORKERS = int(os.getenv("SHARD_WORKERS", str(os.cpu_count() or 2)))
+    SHARD_ADDRESS = os.getenv("SHARD_ADDRESS", "")
+    SHARD_AUTHKEY = os.getenv("SHARD_AUTHKEY", "").encode("utf-8")
+    SHARD_TIMEOUT_S = float(os.getenv("SHARD_TIMEOUT_S", "600"))
+
+    # Streaming batch mode (batch --stream): chunk sizes adapt so parsed text in
+    # flight stays within STREAM_MEMORY_MB; raw text of scored resumes is dropped,
+    # or appended to STREAM_SPILL_DIR/<run_id>.jsonl with --spill.
+    STREAM_MEMORY_MB = int(os.getenv("STREAM_MEMORY_MB", "512"))
+    STREAM_SPILL_DIR = Path(os.getenv("STREAM_SPILL_DIR", str(DATA_DIR / "spill")))
+
+    # Speculative precompute in the UI: uploads are parsed + embedded and the
+    # JD is parsed (after PRECOMPUTE_JD_DEBOUNCE_S without edits) in the
+    # background, before Run is clicked.
+    PRECOMPUTE_ENABLED = os.getenv("PRECOMPUTE_ENABLED", "1").lower() in ("1", "true", "yes")
+    PRECOMPUTE_WORKERS = int(os.getenv("PRECOMPUTE_WORKERS", "2"))
+    PRECOMPUTE_JD_DEBOUNCE_S = float(os.getenv("PRECOMPUTE_JD_DEBOUNCE_S", "1.5"))
+
+    # Opt-in CPU + memory profiling of screening runs (artifacts in PROFILE_DIR)
+    PROFILE_RUNS = os.getenv("PROFILE_RUNS", "0").lower() in ("1", "true", "yes")
+    PROFILE_TOP_N = int(os.getenv("PROFILE_TOP_N", "15"))
+
+    return {k: v for k, v in locals().items() if k.isupper()}
+
+
+_SETTINGS: dict = {}
+
+
+def __getattr__(name: str):
+    # Env-driven settings are resolved lazily on first access
+    # (`from .config import X` included), so `.env` is only read when needed.
+    if not _SETTINGS:
+        _SETTINGS.update(_load_settings())
+    try:
+        return _SETTINGS[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
 
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY", "")
-OPENAI_CHAT_MODEL = os.getenv("OPENAI_CHAT_MODEL", "gpt-4o-mini")
-OPENAI_EMBED_MODEL = os.getenv("OPENAI_EMBED_MODEL", "text-embedding-3-small")
 
 DEFAULT_WEIGHTS = {
     "skill": 0.4,
@@ -0,0 +1,186 @@
+"""
+Relevance-ranked, token-budgeted evidence packing for LLM prompts.
+
+Resumes are split into small line-aligned chunks, every chunk is scored
+against the JD's must-have skills, key outcomes and experience ask, and
+the best chunks are packed round-robin (one per query per round) until
+the token budget is spent. Prompts get smaller and better targeted than
+fixed-length section prefixes.
+"""
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .config import EVIDENCE_CHUNK_CHARS, RATIONALE_EVIDENCE_TOKENS
+from .resume_parser import SECTION_MARKERS
+from .schemas import JD, ResumeParsed
+from .scoring import _tokenize, embed_stored
+
+
+@dataclass
+class Chunk:
+    text: str
+    section: str
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token for English text)."""
+    return len(text) // 4 + 1
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to roughly `max_tokens`, preferring a whitespace boundary."""
+    max_chars = max(max_tokens, 0) * 4
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    space = cut.rfind(" ")
+    return cut[:space] if space > max_chars // 2 else cut
+
+
+def _heading(line: str) -> str:
+    """Section marker if the line looks like a section heading, else ""."""
+    lowered = line.lower().strip().rstrip(":")
+    if len(lowered) <= 30:
+        for m in SECTION_MARKERS:
+            if lowered.startswith(m):
+                return m
+    return ""
+
+
+def chunk_resume(resume: ResumeParsed, max_chars: int = EVIDENCE_CHUNK_CHARS) -> List[Chunk]:
+    """
+    Split the resume into chunks of whole lines (≤ max_chars each). Chunks
+    never span a section heading and are labelled with their section.
+    """
+    chunks: List[Chunk] = []
+    buf: List[str] = []
+    buf_len = 0
+    section = "raw"
+
+    def flush():
+        nonlocal buf, buf_len
+        if buf:
+            chunks.append(Chunk(" ".join(buf), f"resume.{section}"))
+        buf, buf_len = [], 0
+
+    for line in resume.raw_text.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            continue
+        heading = _heading(stripped)
+        if heading:
+            flush()
+            section = heading
+            continue
+        if buf and buf_len + len(stripped) > max_chars:
+            flush()
+        buf.append(stripped[:max_chars])
+        buf_len += len(stripped) + 1
+    flush()
+    return chunks
+
+
+def _queries(jd: JD) -> List[Tuple[str, str]]:
+    """(query text, score dimension) pairs the evidence should support."""
+    queries = [(s, "SkillScore") for s in jd.must_have_skills if s.strip()]
+    queries += [(o, "OutcomeScore") for o in jd.key_outcomes if o.strip()]
+    queries.append(
+        (f"{jd.role_title} years of professional experience", "ExperienceScore")
+    )
+    return queries
+
+
+class EvidencePacker:
+    """
+    Packs evidence for many candidates against one JD. Query embeddings are
+    computed once; all candidates' chunks are embedded in one batch. Both go
+    through the persistent embedding store, so chunks of a resume and
+    queries such as a skill are embedded once across runs and JDs.
+    """
+
+    def __init__(self, jd: JD, budget_tokens: int = RATIONALE_EVIDENCE_TOKENS):
+        self.budget_tokens = budget_tokens
+        self.queries = _queries(jd)
+        self.query_tokens = [_tokenize(q) for q, _ in self.queries]
+        self.query_embeds = embed_stored([q for q, _ in self.queries])
+
+    def _relevance(self, chunks: List[Chunk], chunk_embeds: np.ndarray) -> np.ndarray:
+        """(n_queries × n_chunks) relevance: cosine + lexical token overlap."""
+        semantic = self.query_embeds @ chunk_embeds.T
+        lexical = np.zeros_like(semantic)
+        chunk_tokens = [_tokenize(c.text) for c in chunks]
+        for qi, qt in enumerate(self.query_tokens):
+            if not qt:
+                continue
+            for ci, ct in enumerate(chunk_tokens):
+                lexical[qi, ci] = len(qt & ct) / len(qt)
+        return semantic + lexical
+
+    def _pack(self, chunks: List[Chunk], relevance: np.ndarray) -> List[Dict[str, str]]:
+        order = np.argsort(-relevance, axis=1)
+        used: set[int] = set()
+        evidence: List[Dict[str, str]] = []
+        spent = 0
+        cursor = [0] * len(self.queries)
+        progressed = True
+        # Round-robin: each query takes its best unused chunk per round
+        while progressed and spent < self.budget_tokens:
+            progressed = False
+            for qi, (_, dimension) in enumerate(self.queries):
+                while cursor[qi] < len(chunks) and int(order[qi, cursor[qi]]) in used:
+                    cursor[qi] += 1
+                if cursor[qi] >= len(chunks):
+                    continue
+                ci = int(order[qi, cursor[qi]])
+                cost = estimate_tokens(chunks[ci].text)
+                if spent + cost > self.budget_tokens:
+                    cursor[qi] = len(chunks)  # this query's next-best no longer fits
+                    continue
+                used.add(ci)
+                spent += cost
+                progressed = True
+                evidence.append(
+                    {
+                        "text": chunks[ci].text,
+                        "source": chunks[ci].section,
+                        "score_dimension": dimension,
+                    }
+                )
+        return evidence
+
+    def pack_many(self, resumes: List[ResumeParsed]) -> Dict[str, List[Dict[str, str]]]:
+        per_resume = [chunk_resume(r) for r in resumes]
+        flat = [c for chunks in per_resume for c in chunks]
+        all_embeds = embed_stored([c.text for c in flat])
+
+        packed: Dict[str, List[Dict[str, str]]] = {}
+        offset = 0
+        for r, chunks in zip(resumes, per_resume):
+            if not chunks:
+                packed[r.resume_id] = []
+                continue
+            embeds = all_embeds[offset: offset + len(chunks)]
+            offset += len(chunks)
+            packed[r.resume_id] = self._pack(chunks, self._relevance(chunks, embeds))
+        return packed
+
+
+def fit_texts_to_budget(texts: List[str], budget_tokens: int) -> List[str]:
+    """
+    Share a token budget across several texts (short texts give their unused
+    share to the others) and truncate each at a word boundary, so the list
+    can be JSON-encoded whole instead of cutting the JSON string itself.
+    """
+    if not texts:
+        return []
+    out = list(texts)
+    remaining = budget_tokens
+    # Fit the shortest first so their leftover budget flows to longer texts
+    order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+    for n_left, i in zip(range(len(texts), 0, -1), order):
+        share = remaining // n_left
+        out[i] = truncate_to_tokens(texts[i], share)
+        remaining -= min(estimate_tokens(out[i]), share)
+    return out
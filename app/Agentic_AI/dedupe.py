@@ -0,0 +1,145 @@
+"""
+Near-duplicate resume detection with MinHash signatures and LSH banding.
+
+Each resume becomes a set of word 3-gram shingles; a MinHash signature of
+NUM_PERM values estimates Jaccard similarity between those sets. Signatures
+are split into BANDS bands and hashed into buckets, so only resumes sharing
+a bucket are compared — roughly linear in the number of resumes instead of
+all pairs. Pairs whose estimated similarity reaches the threshold are
+merged into clusters (union-find), and each cluster keeps one
+representative for embedding, scoring and rationales.
+"""
+import zlib
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from .config import DEDUPE_THRESHOLD
+from .schemas import DuplicateCluster, ResumeParsed
+from .scoring import WORD_RE
+
+SHINGLE_SIZE = 3
+NUM_PERM = 128
+BANDS = 16  # 8 rows per band: candidate-pair threshold ≈ (1/16) ** (1/8) ≈ 0.71
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = np.uint64((1 << 32) - 1)
+
+
+def _permutations(seed: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+    # a, b < 2**32 and shingle hashes < 2**32 (crc32), so a * x + b < 2**64:
+    # exact in uint64, no wraparound before the mod
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+    b = rng.integers(0, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+    return a, b
+
+
+_A, _B = _permutations()
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> np.ndarray:
+    """crc32 hashes of the word `size`-grams of `text` (unique, uint64)."""
+    words = WORD_RE.findall(text.lower())
+    if len(words) < size:
+        grams = [" ".join(words)] if words else []
+    else:
+        grams = [" ".join(words[i: i + size]) for i in range(len(words) - size + 1)]
+    return np.unique(np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64))
+
+
+def minhash(shingle_hashes: np.ndarray) -> np.ndarray:
+    """NUM_PERM-value MinHash signature of a shingle set."""
+    # (a * x + b) mod p, truncated to 32 bits, minimised over the set
+    hashed = (np.outer(_A, shingle_hashes) + _B[:, None]) % _PRIME
+    return (hashed & _MAX_HASH).min(axis=1)
+
+
+def _find(parent: List[int], i: int) -> int:
+    while parent[i] != i:
+        parent[i] = parent[parent[i]]
+        i = parent[i]
+    return i
+
+
+def _signatures(resumes: List[ResumeParsed]) -> Dict[int, np.ndarray]:
+    """MinHash signature per resume index; resumes without text are left out."""
+    signatures = {}
+    for i, r in enumerate(resumes):
+        sh = shingles(r.raw_text)
+        # Empty resumes would all share one signature; keep them apart
+        if len(sh):
+            signatures[i] = minhash(sh)
+    return signatures
+
+
+def _similarity(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    return float(np.mean(sig_a == sig_b))
+
+
+def _group(n: int, signatures: Dict[int, np.ndarray], threshold: float) -> List[List[int]]:
+    parent = list(range(n))
+    rows = NUM_PERM // BANDS
+    checked = set()
+    for band in range(BANDS):
+        buckets: Dict[bytes, List[int]] = defaultdict(list)
+        for i, sig in signatures.items():
+            buckets[sig[band * rows: (band + 1) * rows].tobytes()].append(i)
+        for members in buckets.values():
+            # Every pair in the bucket: a member can match another without
+            # matching the bucket's first member
+            for x, i in enumerate(members):
+                for j in members[x + 1:]:
+                    ri, rj = _find(parent, i), _find(parent, j)
+                    if ri == rj or (i, j) in checked:
+                        continue
+                    checked.add((i, j))
+                    if _similarity(signatures[i], signatures[j]) >= threshold:
+                        parent[rj] = ri
+
+    groups: Dict[int, List[int]] = defaultdict(list)
+    for i in range(n):
+        groups[_find(parent, i)].append(i)
+    return list(groups.values())
+
+
+def find_duplicate_clusters(
+    resumes: List[ResumeParsed], threshold: float = DEDUPE_THRESHOLD
+) -> List[List[int]]:
+    """
+    Groups of indices into `resumes` whose estimated Jaccard similarity is
+    at least `threshold`. Every resume appears in exactly one group.
+    """
+    return _group(len(resumes), _signatures(resumes), threshold)
+
+
+def collapse_duplicates(
+    resumes: List[ResumeParsed], threshold: float = DEDUPE_THRESHOLD
+) -> Tuple[List[ResumeParsed], List[DuplicateCluster]]:
+    """
+    One representative per near-duplicate group (the longest copy, which is
+    usually the most complete), in original upload order, plus the clusters
+    that had more than one member.
+    """
+    signatures = _signatures(resumes)
+    representatives: List[Tuple[int, ResumeParsed]] = []
+    clusters: List[DuplicateCluster] = []
+    for group in _group(len(resumes), signatures, threshold):
+        rep = max(group, key=lambda i: len(resumes[i].raw_text))
+        representatives.append((min(group), resumes[rep]))
+        if len(group) == 1:
+            continue
+        similarity = min(
+            _similarity(signatures[rep], signatures[i]) for i in group if i != rep
+        )
+        clusters.append(
+            DuplicateCluster(
+                representative_id=resumes[rep].resume_id,
+                member_ids=[resumes[i].resume_id for i in group],
+                member_names=[resumes[i].name for i in group],
+                min_similarity=similarity,
+            )
+        )
+    representatives.sort(key=lambda item: item[0])
+    return [r for _, r in representatives], clusters
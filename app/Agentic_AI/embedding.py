@@ -1,20 +1,221 @@
-from typing import List
+import hashlib
+import re
+import zlib
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Protocol, Tuple
+
 import numpy as np
-from langchain_openai import OpenAIEmbeddings
 
-from .config import OPENAI_EMBED_MODEL
+from .instrumentation import span
+from .scheduler import get_scheduler
+from .config import (
+    EMBED_BACKEND,
+    EMBED_DIM,
+    EMBED_DIMENSIONS,
+    EMBED_TFIDF_PATH,
+    OPENAI_BASE_URL,
+    OPENAI_EMBED_MODEL,
+)
+
+# Native output sizes of the OpenAI embedding models we support
+OPENAI_EMBED_DIMS = {
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "text-embedding-ada-002": 1536,
+}
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+class EmbeddingBackend(Protocol):
+    """Anything with `embed_documents` + a fixed output `dimension`."""
+
+    dimension: int
+
+    def embed_documents(self, texts: List[str]): ...
+
+
+# --- OpenAI (network) ---
+
+
+def _openai_dimensions(model: str) -> Optional[int]:
+    # text-embedding-3 models can return shortened vectors directly
+    return EMBED_DIMENSIONS if EMBED_DIMENSIONS and model.startswith("text-embedding-3") else None
+
+
+class OpenAIBackend:
+    def __init__(self, model: str = OPENAI_EMBED_MODEL):
+        from langchain_openai import OpenAIEmbeddings
+
+        self.model = model
+        dimensions = _openai_dimensions(model)
+        self.dimension = dimensions or OPENAI_EMBED_DIMS.get(model, EMBED_DIM)
+        # Retries / backoff are owned by the shared scheduler, not the client
+        self._client = OpenAIEmbeddings(
+            model=model, max_retries=0, base_url=OPENAI_BASE_URL, dimensions=dimensions
+        )
+
+    def embed_documents(self, texts: List[str]):
+        est_tokens = sum(len(t) for t in texts) // 4
+        return get_scheduler("embed").call(
+            lambda: self._client.embed_documents(texts), est_tokens=est_tokens
+        )
+
+
+# --- Local hashing trick (CPU, no fitting) ---
+
+
+class HashingBackend:
+    """
+    Signed feature hashing of word unigrams + bigrams with sublinear TF.
+    Stateless and deterministic across processes (crc32, not hash()).
+    """
+
+    def __init__(self, dimension: int = EMBED_DIM):
+        self.dimension = dimension
+        self._slots: Dict[str, Tuple[int, float]] = {}
+
+    def _slot(self, feature: str) -> Tuple[int, float]:
+        slot = self._slots.get(feature)
+        if slot is None:
+            h = zlib.crc32(feature.encode("utf-8"))
+            slot = (h % self.dimension, 1.0 if h & 0x80000000 else -1.0)
+            self._slots[feature] = slot
+        return slot
+
+    def embed_documents(self, texts: List[str]) -> np.ndarray:
+        out = np.zeros((len(texts), self.dimension), dtype="float32")
+        for i, text in enumerate(texts):
+            tokens = TOKEN_RE.findall(text.lower())
+            feats = tokens + [a + " " + b for a, b in zip(tokens, tokens[1:])]
+            counts: Dict[str, int] = {}
+            for f in feats:
+                counts[f] = counts.get(f, 0) + 1
+            for f, n in counts.items():
+                idx, sign = self._slot(f)
+                out[i, idx] += sign * (1.0 + np.log(n))
+        return out
+
 
+# --- Local TF-IDF + truncated SVD (CPU, fitted on our corpus) ---
 
-def get_embedding_model() -> OpenAIEmbeddings:
-    return OpenAIEmbeddings(model=OPENAI_EMBED_MODEL)
+
+class TfidfSvdBackend:
+    """
+    Projects TF-IDF vectors onto SVD components fitted with `fit_tfidf_svd`.
+    The fitted model lives in a single .npz file (EMBED_TFIDF_PATH).
+    """
+
+    def __init__(self, path: Path = EMBED_TFIDF_PATH):
+        path = Path(path)
+        if not path.exists():
+            raise RuntimeError(
+                f"TF-IDF embedding model not found at {path}. "
+                "Fit one first: python -m Agentic_AI.embedding fit <resume files/dirs>"
+            )
+        # Stored vectors are keyed on the fitted model: a refit starts a new store
+        self.model = "tfidf-" + hashlib.sha256(path.read_bytes()).hexdigest()[:16]
+        data = np.load(path, allow_pickle=False)
+        self.vocab = {t: i for i, t in enumerate(data["vocab"].tolist())}
+        self.idf = data["idf"].astype("float32")
+        self.components = data["components"].astype("float32")  # (V, k)
+        self.dimension = self.components.shape[1]
+
+    def embed_documents(self, texts: List[str]) -> np.ndarray:
+        out = np.zeros((len(texts), self.dimension), dtype="float32")
+        for i, text in enumerate(texts):
+            idx, tf = _term_counts(text, self.vocab)
+            if idx.size:
+                out[i] = (np.log1p(tf) * self.idf[idx]) @ self.components[idx]
+        return out
+
+
+def _term_counts(text: str, vocab: Dict[str, int]) -> Tuple[np.ndarray, np.ndarray]:
+    ids = [vocab[t] for t in TOKEN_RE.findall(text.lower()) if t in vocab]
+    if not ids:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype="float32")
+    idx, counts = np.unique(np.array(ids, dtype=np.int64), return_counts=True)
+    return idx, counts.astype("float32")
+
+
+def fit_tfidf_svd(
+    texts: List[str],
+    n_components: int = 256,
+    max_features: int = 20000,
+    path: Path = EMBED_TFIDF_PATH,
+    seed: int = 0,
+) -> Path:
+    """
+    Fit TF-IDF + randomized truncated SVD on a corpus and save it to `path`.
+    Pure numpy, so no extra dependency is needed.
+    """
+    doc_freq: Dict[str, int] = {}
+    for text in texts:
+        for t in set(TOKEN_RE.findall(text.lower())):
+            doc_freq[t] = doc_freq.get(t, 0) + 1
+    terms = sorted(doc_freq, key=lambda t: (-doc_freq[t], t))[:max_features]
+    vocab = {t: i for i, t in enumerate(terms)}
+    n_docs = max(len(texts), 1)
+    idf = np.log((1 + n_docs) / (1 + np.array([doc_freq[t] for t in terms], dtype="float32"))) + 1
+
+    X = np.zeros((len(texts), len(terms)), dtype="float32")
+    for i, text in enumerate(texts):
+        idx, tf = _term_counts(text, vocab)
+        X[i, idx] = np.log1p(tf) * idf[idx]
+    X /= np.linalg.norm(X, axis=1, keepdims=True) + 1e-9
+
+    # Randomized SVD: project onto a random subspace, orthonormalize, then
+    # take an exact SVD of the small projected matrix.
+    k = max(1, min(n_components, len(terms), len(texts)))
+    rng = np.random.default_rng(seed)
+    Q, _ = np.linalg.qr(X.T @ rng.standard_normal((X.shape[0], k + 10)).astype("float32"))
+    _, _, vt = np.linalg.svd(X @ Q, full_matrices=False)
+    components = (Q @ vt.T)[:, :k]  # (V, k)
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.savez_compressed(path, vocab=np.array(terms), idf=idf, components=components)
+    return path
+
+
+# --- Backend selection ---
+
+BACKENDS = {
+    "openai": OpenAIBackend,
+    "hashing": HashingBackend,
+    "tfidf": TfidfSvdBackend,
+}
+
+
+@lru_cache(maxsize=None)
+def get_embedding_model(backend: str = EMBED_BACKEND) -> EmbeddingBackend:
+    """Embedding backend selected by EMBED_BACKEND (openai | hashing | tfidf)."""
+    try:
+        return BACKENDS[backend.lower()]()
+    except KeyError:
+        raise ValueError(
+            f"Unknown EMBED_BACKEND {backend!r}; expected one of {sorted(BACKENDS)}"
+        ) from None
+
+
+def embedding_dimension() -> int:
+    """Output size of the configured backend, known for OpenAI without a client (or an API key)."""
+    if EMBED_BACKEND.lower() == "openai":
+        return _openai_dimensions(OPENAI_EMBED_MODEL) or OPENAI_EMBED_DIMS.get(OPENAI_EMBED_MODEL, EMBED_DIM)
+    return get_embedding_model().dimension
 
 
 def embed_texts(texts: List[str]) -> np.ndarray:
     if not texts:
-        return np.zeros((0, 1536), dtype="float32")
+        return np.zeros((0, embedding_dimension()), dtype="float32")
     emb_model = get_embedding_model()
-    vectors = emb_model.embed_documents(texts)
-    arr = np.array(vectors, dtype="float32")
+    with span("embed") as sp:
+        sp.items = len(texts)
+        # Embedding APIs don't return usage; estimate ~4 chars per token
+        sp.prompt_tokens = sum(len(t) for t in texts) // 4
+        vectors = emb_model.embed_documents(texts)
+    arr = np.asarray(vectors, dtype="float32")
     norms = np.linalg.norm(arr, axis=1, keepdims=True) + 1e-9
     arr = arr / norms
     return arr
@@ -24,3 +225,22 @@ def cosine_similarity(a: np.ndarray, b: np.ndarray) -> float:
     if a.size == 0 or b.size == 0:
         return 0.0
     return float(np.dot(a, b.T))
+
+
+if __name__ == "__main__":
+    # python -m Agentic_AI.embedding fit <resume files/dirs> [--components N]
+    import argparse
+
+    from .batch import collect_resume_paths
+    from .resume_parser import parse_resume
+
+    parser = argparse.ArgumentParser(description="Fit the local TF-IDF + SVD embedding model")
+    parser.add_argument("command", choices=["fit"])
+    parser.add_argument("inputs", nargs="+")
+    parser.add_argument("--components", type=int, default=256)
+    parser.add_argument("--out", type=Path, default=EMBED_TFIDF_PATH)
+    args = parser.parse_args()
+
+    corpus = [parse_resume(p).raw_text for p in collect_resume_paths(args.inputs)]
+    saved = fit_tfidf_svd(corpus, n_components=args.components, path=args.out)
+    print(f"Fitted on {len(corpus)} resumes -> {saved}")
@@ -0,0 +1,340 @@
+"""
+Persistent, memory-mapped store of resume embeddings.
+
+Vectors live in a flat binary file opened with np.memmap (one row per
+text), an SQLite index maps the SHA-256 of the embedded text to its row,
+and rows are optionally quantized:
+
+    float32  4 bytes / dim
+    float16  2 bytes / dim
+    int8     1 byte / dim + one float32 scale per row (symmetric, per vector)
+
+Combined with shortened embeddings (EMBED_DIMENSIONS, supported by the
+text-embedding-3 models) this cuts the footprint of a large candidate pool
+4-8x or more. Nothing is loaded up front: lookups read only the requested
+rows and `search` scores the pool block by block straight off the memmap.
+
+    python -m Agentic_AI.embedding_store report <resume files/dirs> [--jd jd.txt ...]
+
+measures what each dtype / dimension setting costs in ranking quality.
+"""
+import hashlib
+import sqlite3
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .config import (
+    EMBED_STORE_DTYPE,
+    EMBED_STORE_ENABLED,
+    EMBED_STORE_PATH,
+    ensure_dir,
+)
+from .instrumentation import record_cache_hits
+
+DTYPES = {"float32": np.float32, "float16": np.float16, "int8": np.int8}
+
+_QUERY_BATCH = 500
+
+
+def _key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def truncate(vectors: np.ndarray, dim: int) -> np.ndarray:
+    """Keep the first `dim` components and re-normalize (Matryoshka-style)."""
+    if not dim or dim >= vectors.shape[1]:
+        return vectors
+    out = vectors[:, :dim]
+    return out / (np.linalg.norm(out, axis=1, keepdims=True) + 1e-9)
+
+
+def quantize(vectors: np.ndarray, dtype: str) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    """(stored rows, per-row scales or None) for float32 input vectors."""
+    if dtype != "int8":
+        return vectors.astype(DTYPES[dtype]), None
+    scales = np.abs(vectors).max(axis=1) / 127.0
+    scales[scales == 0] = 1.0
+    q = np.clip(np.rint(vectors / scales[:, None]), -127, 127).astype(np.int8)
+    return q, scales.astype("float32")
+
+
+def dequantize(rows: np.ndarray, scales: Optional[np.ndarray]) -> np.ndarray:
+    """float32 unit vectors: rounding moves float16 / int8 rows off the unit sphere."""
+    if rows.dtype == np.float32:
+        return rows
+    out = rows.astype("float32")
+    if scales is not None:
+        out *= scales[:, None]
+    norms = np.linalg.norm(out, axis=1, keepdims=True)
+    return np.divide(out, norms, out=out, where=norms > 0)
+
+
+class EmbeddingStore:
+    def __init__(self, root: Path, dim: int, dtype: str = EMBED_STORE_DTYPE):
+        if dtype not in DTYPES:
+            raise ValueError(f"Unknown embedding store dtype {dtype!r}; expected one of {sorted(DTYPES)}")
+        self.root = Path(root)
+        self.dim = dim
+        self.dtype = dtype
+        self._np_dtype = np.dtype(DTYPES[dtype])
+        self._conn: Optional[sqlite3.Connection] = None
+        self._vectors: Optional[np.memmap] = None
+        self._scales: Optional[np.memmap] = None
+        self._lock = threading.RLock()  # one SQLite connection shared by threads
+
+    # --- files ---
+
+    @property
+    def vectors_path(self) -> Path:
+        return self.root / "vectors.bin"
+
+    @property
+    def scales_path(self) -> Path:
+        return self.root / "scales.bin"
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            ensure_dir(self.root)
+            conn = sqlite3.connect(str(self.root / "index.sqlite"), check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("CREATE TABLE IF NOT EXISTS rows (key TEXT PRIMARY KEY, row INTEGER NOT NULL)")
+            self._conn = conn
+        return self._conn
+
+    def _capacity(self) -> int:
+        path = self.vectors_path
+        return path.stat().st_size // (self.dim * self._np_dtype.itemsize) if path.exists() else 0
+
+    def _grow(self, rows: int) -> None:
+        """Extend the files to hold `rows` rows (sparse; caller holds the write lock)."""
+        ensure_dir(self.root)
+        with open(self.vectors_path, "ab") as f:
+            f.truncate(rows * self.dim * self._np_dtype.itemsize)
+        if self.dtype == "int8":
+            with open(self.scales_path, "ab") as f:
+                f.truncate(rows * 4)
+        self._vectors = self._scales = None
+
+    def _maps(self, min_rows: int = 0) -> Tuple[Optional[np.memmap], Optional[np.memmap]]:
+        """Memmaps of the vector (and scale) files, remapped if another writer grew them."""
+        if self._vectors is None or self._vectors.shape[0] < min_rows:
+            capacity = self._capacity()
+            if not capacity:
+                return None, None
+            self._vectors = np.memmap(self.vectors_path, dtype=self._np_dtype, mode="r+", shape=(capacity, self.dim))
+            if self.dtype == "int8":
+                self._scales = np.memmap(self.scales_path, dtype="float32", mode="r+", shape=(capacity,))
+        return self._vectors, self._scales
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._db().execute("SELECT COUNT(*) FROM rows").fetchone()[0]
+
+    # --- reads / writes ---
+
+    def _rows(self, keys: Sequence[str]) -> Dict[str, int]:
+        found: Dict[str, int] = {}
+        db = self._db()
+        for start in range(0, len(keys), _QUERY_BATCH):
+            batch = list(keys[start: start + _QUERY_BATCH])
+            found.update(
+                db.execute(f"SELECT key, row FROM rows WHERE key IN ({','.join('?' * len(batch))})", batch)
+            )
+        return found
+
+    def _read(self, rows: Sequence[int]) -> np.ndarray:
+        vectors, scales = self._maps(max(rows) + 1 if rows else 0)
+        if not rows:
+            return np.zeros((0, self.dim), dtype="float32")
+        idx = np.asarray(rows)
+        return dequantize(vectors[idx], scales[idx] if scales is not None else None)  # type: ignore[index]
+
+    def add(self, keys: Sequence[str], vectors: np.ndarray) -> None:
+        """Append vectors for new keys (existing keys are left as they are)."""
+        vectors = truncate(np.asarray(vectors, dtype="float32"), self.dim)
+        rows, scales = quantize(vectors, self.dtype)
+        db = self._db()
+        with self._lock:
+            # IMMEDIATE takes the write lock, so concurrent processes get distinct rows
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                existing = self._rows(keys)
+                new = [i for i, k in enumerate(keys) if k not in existing]
+                start = db.execute("SELECT COALESCE(MAX(row) + 1, 0) FROM rows").fetchone()[0]
+                if new:
+                    needed = start + len(new)
+                    if self._capacity() < needed:
+                        self._grow(max(needed, 2 * self._capacity(), 1024))
+                    vec_map, scale_map = self._maps(needed)
+                    target = np.arange(start, needed)
+                    vec_map[target] = rows[new]  # type: ignore[index]
+                    vec_map.flush()  # type: ignore[union-attr]
+                    if scale_map is not None:
+                        scale_map[target] = scales[new]  # type: ignore[index]
+                        scale_map.flush()
+                    db.executemany(
+                        "INSERT INTO rows VALUES (?, ?)", [(keys[i], int(r)) for i, r in zip(new, target)]
+                    )
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+
+    def get(self, keys: Sequence[str]) -> Tuple[np.ndarray, List[int]]:
+        """(float32 vectors for the stored keys, indices of keys not in the store)."""
+        with self._lock:
+            found = self._rows(keys)
+            missing = [i for i, k in enumerate(keys) if k not in found]
+            return self._read([found[k] for k in keys if k in found]), missing
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """Embeddings for `texts`: stored rows where present, else embedded and added."""
+        from .embedding import embed_texts
+
+        keys = [_key(t) for t in texts]
+        out = np.zeros((len(texts), self.dim), dtype="float32")
+        stored, missing = self.get(keys)
+        missing_set = set(missing)
+        hit = [i for i in range(len(texts)) if i not in missing_set]
+        out[hit] = stored
+        record_cache_hits(len(hit))
+        if missing:
+            # Duplicate texts in one call are embedded once
+            first: Dict[str, int] = {}
+            for i in missing:
+                first.setdefault(keys[i], i)
+            unique = list(first)
+            fresh = truncate(embed_texts([texts[first[k]] for k in unique]), self.dim)
+            self.add(unique, fresh)
+            # Read back so stored and fresh vectors carry the same quantization error
+            vecs, _ = self.get(unique)
+            by_key = dict(zip(unique, vecs))
+            for i in missing:
+                out[i] = by_key[keys[i]]
+        return out
+
+    def search(self, query: np.ndarray, k: int = 10, block_rows: int = 65536) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Top-k (rows, scores) by dot product with `query`, computed block by
+        block on the memmap so the pool never has to fit in memory.
+        """
+        n = len(self)
+        vectors, scales = self._maps(n)
+        if vectors is None or not n:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype="float32")
+        q = truncate(np.asarray(query, dtype="float32")[None, :], self.dim)[0]
+        best_rows = np.zeros(0, dtype=np.int64)
+        best_scores = np.zeros(0, dtype="float32")
+        for start in range(0, n, block_rows):
+            end = min(start + block_rows, n)
+            block = dequantize(vectors[start:end], scales[start:end] if scales is not None else None)
+            scores = block @ q
+            rows = np.concatenate([best_rows, np.arange(start, end)])
+            scores = np.concatenate([best_scores, scores])
+            keep = np.argpartition(-scores, min(k, len(scores)) - 1)[:k] if len(scores) > k else slice(None)
+            best_rows, best_scores = rows[keep], scores[keep]
+        order = np.argsort(-best_scores, kind="stable")
+        return best_rows[order], best_scores[order]
+
+    def footprint(self) -> Dict[str, float]:
+        """On-disk bytes vs. the same vectors stored as full float32."""
+        n = len(self)
+        per_vector = self.dim * self._np_dtype.itemsize + (4 if self.dtype == "int8" else 0)
+        return {"vectors": n, "dim": self.dim, "bytes_per_vector": per_vector, "bytes": n * per_vector}
+
+
+def quantization_report(
+    vectors: np.ndarray,
+    queries: np.ndarray,
+    settings: Sequence[Tuple[str, int]],
+    k: int = 10,
+) -> List[Dict[str, float]]:
+    """
+    Ranking change of each (dtype, dim) setting against full float32 vectors:
+    top-k overlap, Spearman correlation of scores and max score error, per query.
+    """
+    full_dim = vectors.shape[1]
+    reference = queries @ vectors.T
+    ref_top = np.argsort(-reference, axis=1)[:, :k]
+    ref_ranks = np.argsort(np.argsort(-reference, axis=1), axis=1)
+    report = []
+    for dtype, dim in settings:
+        dim = dim or full_dim
+        rows, scales = quantize(truncate(vectors, dim), dtype)
+        scores = truncate(queries, dim) @ dequantize(rows, scales).T
+        top = np.argsort(-scores, axis=1)[:, :k]
+        ranks = np.argsort(np.argsort(-scores, axis=1), axis=1)
+        n = vectors.shape[0]
+        d = (ranks - ref_ranks).astype("float64")
+        spearman = 1 - 6 * (d ** 2).sum(axis=1) / (n * (n ** 2 - 1)) if n > 1 else np.ones(len(queries))
+        bytes_per_vector = dim * np.dtype(DTYPES[dtype]).itemsize + (4 if dtype == "int8" else 0)
+        report.append(
+            {
+                "dtype": dtype,
+                "dim": dim,
+                "bytes_per_vector": bytes_per_vector,
+                "compression": full_dim * 4 / bytes_per_vector,
+                "top_k_overlap": float(np.mean([len(set(a) & set(b)) / k for a, b in zip(top, ref_top)])),
+                "spearman": float(np.mean(spearman)),
+                "max_score_error": float(np.abs(scores - reference).max()),
+            }
+        )
+    return report
+
+
+def store_name() -> str:
+    """
+    Per-model store directory: vectors from different models never mix. Local
+    fitted models (TF-IDF) name themselves by a hash of the model file.
+    """
+    from .embedding import get_embedding_model
+
+    backend = get_embedding_model()
+    model = getattr(backend, "model", None) or type(backend).__name__.lower()
+    return f"{model}-{backend.dimension}-{EMBED_STORE_DTYPE}"
+
+
+@lru_cache(maxsize=1)
+def get_embedding_store() -> Optional[EmbeddingStore]:
+    """Process-wide store for the configured model, or None when disabled."""
+    if not EMBED_STORE_ENABLED:
+        return None
+    from .embedding import get_embedding_model
+
+    return EmbeddingStore(EMBED_STORE_PATH / store_name(), get_embedding_model().dimension)
+
+
+if __name__ == "__main__":
+    # python -m Agentic_AI.embedding_store report <resume files/dirs> [--jd jd.txt ...]
+    import argparse
+
+    from .batch import collect_resume_paths
+    from .embedding import embed_texts
+    from .resume_parser import parse_resume
+
+    parser = argparse.ArgumentParser(description="Embedding store quantization report")
+    parser.add_argument("command", choices=["report"])
+    parser.add_argument("inputs", nargs="+")
+    parser.add_argument("--jd", nargs="*", default=[], help="JD files used as queries (default: sample resumes)")
+    parser.add_argument("--dims", nargs="*", type=int, default=[0, 512, 256])
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    texts = [parse_resume(p).raw_text for p in collect_resume_paths(args.inputs)]
+    vectors = embed_texts(texts)
+    if args.jd:
+        queries = embed_texts([Path(p).read_text(encoding="utf-8") for p in args.jd])
+    else:
+        queries = vectors[:: max(1, len(texts) // 20)]
+    settings = [(dtype, d) for d in args.dims for dtype in ("float32", "float16", "int8") if d < vectors.shape[1]]
+    print(f"{len(texts)} resumes, {len(queries)} queries, native dim {vectors.shape[1]}")
+    print(f"{'dtype':<8} {'dim':>5} {'bytes/vec':>10} {'smaller':>8} {'top-k':>6} {'spearman':>9} {'max err':>8}")
+    for r in quantization_report(vectors, queries, settings, args.k):
+        print(
+            f"{r['dtype']:<8} {r['dim']:>5} {r['bytes_per_vector']:>10} {r['compression']:>7.1f}x "
+            f"{r['top_k_overlap']:>6.2f} {r['spearman']:>9.4f} {r['max_score_error']:>8.4f}"
+        )
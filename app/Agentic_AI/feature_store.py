@@ -0,0 +1,125 @@
+"""
+Persistent store of JD-independent resume features.
+
+Token sets, lowercase text, years of experience, buzzword / metrics flags
+and section spans depend only on the resume text, so they are extracted
+once and saved in a local SQLite file (one zlib-compressed pickle per
+resume), keyed by the SHA-256 of the resume text and its parsed sections, so
+an edited resume or a parser change that moves sections misses the cache.
+Re-screening a standing candidate pool against a new JD then only does the
+JD-dependent work.
+
+Bump FEATURE_VERSION whenever `scoring.extract_features` changes.
+"""
+import hashlib
+import pickle
+import sqlite3
+import threading
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .config import FEATURE_STORE_ENABLED, FEATURE_STORE_PATH, ensure_dir
+from .instrumentation import record_cache_hits, span
+from .schemas import ResumeFeatures, ResumeParsed
+from .scoring import extract_features
+
+FEATURE_VERSION = 1
+
+# SQLite's default limit on bound parameters per statement is 999
+_QUERY_BATCH = 500
+
+
+def text_key(text: str) -> str:
+    """Stable resume ID for features: same text, same key, whatever the upload."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _feature_key(resume: ResumeParsed) -> str:
+    h = hashlib.sha256(resume.raw_text.encode("utf-8"))
+    for name in sorted(resume.sections):
+        if name != "raw":
+            h.update(f"\0{name}\0{resume.sections[name]}".encode("utf-8"))
+    return h.hexdigest()
+
+
+class FeatureStore:
+    def __init__(self, path: Path = FEATURE_STORE_PATH, memo_size: int = 5000):
+        self.path = Path(path)
+        self.memo_size = memo_size
+        self._memo: "OrderedDict[str, ResumeFeatures]" = OrderedDict()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            ensure_dir(self.path.parent)
+            conn = sqlite3.connect(str(self.path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS features ("
+                " key TEXT PRIMARY KEY, version INTEGER NOT NULL, data BLOB NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def _remember(self, key: str, features: ResumeFeatures) -> None:
+        self._memo[key] = features
+        self._memo.move_to_end(key)
+        while len(self._memo) > self.memo_size:
+            self._memo.popitem(last=False)
+
+    def _load(self, keys: List[str]) -> Dict[str, ResumeFeatures]:
+        found: Dict[str, ResumeFeatures] = {}
+        db = self._db()
+        for start in range(0, len(keys), _QUERY_BATCH):
+            batch = keys[start: start + _QUERY_BATCH]
+            rows = db.execute(
+                f"SELECT key, data FROM features WHERE version = ? AND key IN ({','.join('?' * len(batch))})",
+                [FEATURE_VERSION, *batch],
+            ).fetchall()
+            for key, data in rows:
+                found[key] = pickle.loads(zlib.decompress(data))
+        return found
+
+    def _save(self, items: Dict[str, ResumeFeatures]) -> None:
+        rows = [
+            (key, FEATURE_VERSION, zlib.compress(pickle.dumps(f, protocol=pickle.HIGHEST_PROTOCOL)))
+            for key, f in items.items()
+        ]
+        with self._db() as db:
+            db.executemany("INSERT OR REPLACE INTO features VALUES (?, ?, ?)", rows)
+
+    def get_many(self, resumes: List[ResumeParsed]) -> List[ResumeFeatures]:
+        """Features for each resume: memory, then disk, else extracted and saved."""
+        keys = [_feature_key(r) for r in resumes]
+        with self._lock, span("features") as sp:
+            sp.items = len(resumes)
+            out: Dict[str, ResumeFeatures] = {k: self._memo[k] for k in keys if k in self._memo}
+            missing = list({k for k in keys if k not in out})
+            if missing:
+                out.update(self._load(missing))
+            fresh = {}
+            for key, r in zip(keys, resumes):
+                if key not in out:
+                    out[key] = fresh[key] = extract_features(r)
+            if fresh:
+                self._save(fresh)
+            for key in keys:
+                self._remember(key, out[key])
+            record_cache_hits(len(resumes) - len(fresh))
+        return [out[k] for k in keys]
+
+
+_STORE: Optional[FeatureStore] = None
+
+
+def resume_features(resumes: List[ResumeParsed]) -> List[ResumeFeatures]:
+    """JD-independent features, via the process-wide store when enabled."""
+    global _STORE
+    if not FEATURE_STORE_ENABLED:
+        return [extract_features(r) for r in resumes]
+    if _STORE is None:
+        _STORE = FeatureStore()
+    return _STORE.get_many(resumes)
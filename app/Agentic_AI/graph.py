@@ -1,62 +1,281 @@
-from typing import List, TypedDict, Dict, Any
+import math
+import time
+from dataclasses import asdict
+from typing import List, TypedDict, Dict, Any, Callable, Optional, Tuple, Union
 
-from langgraph.graph import StateGraph, END
-
-from .schemas import JD, ResumeParsed, CandidateResult
-from .config import DEFAULT_WEIGHTS
+from .schemas import (
+    JD,
+    ResumeParsed,
+    CandidateResult,
+    MultiJDResult,
+    DuplicateCluster,
+    RationaleStats,
+    ScoreStats,
+)
+from .config import (
+    DEFAULT_WEIGHTS,
+    CHECKPOINT_CHUNK_SIZE,
+    RATIONALE_BATCH_SIZE,
+    DEDUPE_ENABLED,
+    SHARD_ADDRESS,
+    SHARD_WORKERS,
+)
+from .checkpoint import RunCheckpoint, iter_chunks
 from .jd_parser import parse_jd
-from .resume_parser import parse_resume
-from .scoring import rank_candidates
-from .llm_utils import generate_rationale_llm, generate_bias_notes_llm
+from .resume_parser import parse_resume, parse_resume_bytes
+from .embedding import embed_texts
+from .scoring import (
+    embed_resumes,
+    jd_embed_text,
+    score_candidates,
+    sort_candidates,
+)
+from .multi_jd import rank_candidates_multi
+from .llm_utils import generate_rationales_batch_llm, generate_bias_notes_llm
 from .storage import log_run
-
+from .results_table import results_table
+from .context_packing import EvidencePacker
+from .rationale_policy import BORDERLINE, REJECT, SHORTLIST, RationalePolicy, template_rationale
+from .dedupe import collapse_duplicates
+from .feature_store import resume_features
+from .incremental import ScoringCache, score_incremental
+from .sharding import ShardTask, merge_stats, merge_top_k, pool_ranks, run_local, run_remote, split_shards
+from .instrumentation import RunProfile, instrument_node, record_cache_hits, span
 
 class AgentState(TypedDict, total=False):
+    perf: RunProfile  # timing / token / call-count spans, filled in by every node
+    run_id: str
+    checkpoint: bool  # persist each stage / chunk under CHECKPOINT_DIR / run_id
+    chunk_size: int
+    scoring_cache: ScoringCache  # session cache for incremental rescoring on JD edits
     jd_text: str
     jd: JD
+    jd_changes: List[str]  # JD fields changed since the previous run with this cache
     resume_paths: List[str]
+    resume_files: List[Tuple[str, bytes]]  # (filename, bytes) uploads, parsed in memory
     resumes: List[ResumeParsed]
+    dedupe: bool  # collapse near-duplicate resumes before scoring (default DEDUPE_ENABLED)
+    duplicate_clusters: List[DuplicateCluster]
     weights: Dict[str, float]
+    shards: int  # > 1: score in shards across processes / hosts (see sharding.py)
+    top_k: int  # keep only the top-K candidates, by partial selection (0 = all; blind ranks cover all)
+    on_scored: Callable[[JD, List[CandidateResult]], None]  # each newly scored chunk, full mode (partial rankings)
     full_results: List[CandidateResult]
     blind_results: List[CandidateResult]
+    score_stats: ScoreStats  # composite-score summary over the whole pool (sharded runs)
+    rationale_policy: RationalePolicy  # which candidates get LLM rationales (default from config)
+    rationale_stats: RationaleStats
+    on_rationale: Callable[[CandidateResult, Dict[str, str]], None]  # streamed summary / action (UI)
+    results_table: Any  # pyarrow.Table of full_results (results_table.py)
     bias_notes: str  # optional, can be filled by node_bias_notes if used separately
 
 
+def _checkpoint(state: AgentState) -> Optional[RunCheckpoint]:
+    """Checkpoint store for this run, or None when checkpointing is off."""
+    if not state.get("checkpoint") or not state.get("run_id"):
+        return None
+    return RunCheckpoint(state["run_id"])  # type: ignore
+
+
+def _chunk_size(state: AgentState) -> int:
+    return state.get("chunk_size") or CHECKPOINT_CHUNK_SIZE
+
+
+@instrument_node("parse_jd")
 def node_parse_jd(state: AgentState) -> AgentState:
+    cache = state.get("scoring_cache")
+    if cache is not None:
+        jd, changes = cache.parse_jd(state["jd_text"], parse_jd)  # type: ignore
+        return {"jd": jd, "jd_changes": changes}
+
+    ckpt = _checkpoint(state)
+    if ckpt and ckpt.has("jd"):
+        record_cache_hits()
+        return {"jd": ckpt.load("jd")}
     jd = parse_jd(state["jd_text"]) # type: ignore
+    if ckpt:
+        ckpt.save("jd", jd)
     return {"jd": jd}
 
 
+def _parse_one(item: Union[str, Tuple[str, bytes]], cache: Optional[ScoringCache] = None) -> ResumeParsed:
+    if isinstance(item, tuple):
+        filename, data = item
+        if cache is not None:
+            # Usually already parsed in the background on upload (precompute.py)
+            return cache.parse_resume(filename, data, parse_resume_bytes)
+        return parse_resume_bytes(data, filename)
+    return parse_resume(item)
+
+
+@instrument_node("parse_resumes")
 def node_parse_resumes(state: AgentState) -> AgentState:
-    resumes = [parse_resume(p) for p in state["resume_paths"]]  # type: ignore
+    ckpt = _checkpoint(state)
+    # In-memory uploads (UI) take precedence over paths on disk (batch CLI)
+    items = state.get("resume_files") or state.get("resume_paths") or []
+    if ckpt is None:
+        cache = state.get("scoring_cache")
+        return {"resumes": [_parse_one(item, cache) for item in items]}
+
+    # Parse in chunks; chunks completed by an earlier (interrupted) run are
+    # restored instead of re-parsed.
+    resumes: List[ResumeParsed] = []
+    for i, chunk in iter_chunks(items, _chunk_size(state)):
+        key = f"parse/{i:05d}"
+        if ckpt.has(key):
+            parsed = ckpt.load(key)
+            record_cache_hits(len(parsed))
+        else:
+            parsed = [_parse_one(item) for item in chunk]
+            ckpt.save(key, parsed)
+        resumes.extend(parsed)
     return {"resumes": resumes}
 
 
-def node_score_full(state: AgentState) -> AgentState:
+@instrument_node("dedupe_resumes")
+def node_dedupe_resumes(state: AgentState) -> AgentState:
+    """
+    Collapse near-identical resumes (re-applications, agency copies) to one
+    representative each, so embedding, scoring and rationales run once per
+    cluster. Clusters are kept in state for the UI.
+    """
+    resumes = state["resumes"]  # type: ignore
+    # LangGraph passes unset keys as None, so fall back explicitly
+    dedupe = state.get("dedupe")
+    if not (DEDUPE_ENABLED if dedupe is None else dedupe):
+        return {"duplicate_clusters": []}
+    with span("minhash") as sp:
+        sp.items = len(resumes)
+        representatives, clusters = collapse_duplicates(resumes)
+    return {"resumes": representatives, "duplicate_clusters": clusters}
+
+
+def _score_sharded(
+    state: AgentState, stage: str, jd_embed, blind_mode: bool, ckpt: Optional[RunCheckpoint]
+) -> Tuple[List[CandidateResult], ScoreStats]:
+    """
+    Score shards in parallel (checkpointing each shard's top-K) and merge them.
+    With top_k, the blind pass returns only the full top-K candidates, ranked
+    against the whole pool (their rank_blind is set here).
+    """
+    top_k = state.get("top_k") or 0
+    keep = {c.resume.resume_id for c in state["full_results"]} if blind_mode and top_k else None  # type: ignore
+    tasks = []
+    for i, shard in enumerate(split_shards(state["resumes"], state["shards"])):  # type: ignore
+        keep_ids = [r.resume_id for r in shard if r.resume_id in keep] if keep is not None else None
+        tasks.append(
+            ShardTask(i, state["jd"], jd_embed, shard, state.get("weights", DEFAULT_WEIGHTS), blind_mode, top_k, keep_ids)  # type: ignore
+        )
+    done = []
+    for task in tasks:
+        key = f"{stage}/shard_{task.shard:05d}"
+        if ckpt and ckpt.has(key):
+            done.append(ckpt.load(key))
+            record_cache_hits(len(task.resumes))
+    todo = [t for t in tasks if t.shard not in {r.shard for r in done}]
+    with span("score") as sp:
+        sp.items = sum(len(t.resumes) for t in todo)
+        runner = run_remote(todo, SHARD_ADDRESS) if SHARD_ADDRESS else run_local(todo, SHARD_WORKERS)
+        for result in runner:
+            if ckpt:
+                ckpt.save(f"{stage}/shard_{result.shard:05d}", result)
+            done.append(result)
+    stats = merge_stats([r.stats for r in done])
+    if keep is None:
+        return merge_top_k(done, top_k), stats
+    ranks = pool_ranks(done)
+    blind = sorted((c for r in done for c in r.top), key=lambda c: ranks[c.resume.resume_id])
+    for c in blind:
+        c.rank_blind = ranks[c.resume.resume_id]
+    return blind, stats
+
+
+def _score_stage(state: AgentState, blind_mode: bool) -> Tuple[List[CandidateResult], Optional[ScoreStats]]:
+    """
+    Embed + score all resumes for one mode (full / blind) and sort them.
+    With checkpointing on, the JD embedding and each scored chunk of
+    resumes are persisted, so a restart only redoes the unfinished chunks.
+    With `on_scored`, full-mode scoring also runs chunk by chunk and hands
+    each scored chunk to the callback (partial rankings for the job server).
+    Sharded runs also return pool-wide score stats. `top_k` only cuts the
+    full ranking: the blind pass ranks the whole pool, so every top-K
+    candidate gets its blind rank (sharded: only the top-K come back, with
+    their pool-wide blind ranks).
+    """
     jd = state["jd"]   # type: ignore
     resumes = state["resumes"]  # type: ignore
     weights = state.get("weights", DEFAULT_WEIGHTS)
-    full_results = rank_candidates(jd, resumes, weights, blind_mode=False)
+    top_k = None if blind_mode else state.get("top_k") or None
+    ckpt = _checkpoint(state)
+    stage = "score_blind" if blind_mode else "score_full"
+
+    cache = state.get("scoring_cache")
+    if cache is not None and ckpt is None:
+        # Interactive JD editing: reuse embeddings and unchanged components
+        return sort_candidates(score_incremental(cache, jd, resumes, weights, blind_mode), top_k), None
+
+    if ckpt and ckpt.has(f"{stage}/jd_embed"):
+        jd_embed = ckpt.load(f"{stage}/jd_embed")
+        record_cache_hits()
+    else:
+        jd_embed = embed_texts([jd_embed_text(jd)])[0]
+        if ckpt:
+            ckpt.save(f"{stage}/jd_embed", jd_embed)
+
+    if (state.get("shards") or 0) > 1:
+        return _score_sharded(state, stage, jd_embed, blind_mode, ckpt)
+
+    on_scored = None if blind_mode else state.get("on_scored")
+    if ckpt is None and on_scored is None:
+        resume_embeds = embed_resumes(resumes, blind_mode=blind_mode)
+        features = resume_features(resumes)
+        with span("score") as sp:
+            sp.items = len(resumes)
+            results = score_candidates(jd, resumes, weights, jd_embed, resume_embeds, features)
+        return sort_candidates(results, top_k), None
+
+    results: List[CandidateResult] = []
+    for i, chunk in iter_chunks(resumes, _chunk_size(state)):
+        key = f"{stage}/{i:05d}"
+        if ckpt and ckpt.has(key):
+            scored = ckpt.load(key)
+            record_cache_hits(len(scored))
+        else:
+            chunk_embeds = embed_resumes(chunk, blind_mode=blind_mode)
+            features = resume_features(chunk)
+            with span("score") as sp:
+                sp.items = len(chunk)
+                scored = score_candidates(jd, chunk, weights, jd_embed, chunk_embeds, features)
+            if ckpt:
+                ckpt.save(key, scored)
+        results.extend(scored)
+        if on_scored is not None:
+            on_scored(jd, scored)
+    return sort_candidates(results, top_k), None
+
+
+@instrument_node("score_full")
+def node_score_full(state: AgentState) -> AgentState:
+    full_results, stats = _score_stage(state, blind_mode=False)
     for i, c in enumerate(full_results):
         c.rank_full = i + 1
-    return {"full_results": full_results}
+    update: AgentState = {"full_results": full_results}
+    if stats is not None:
+        update["score_stats"] = stats
+    return update
 
 
+@instrument_node("score_blind")
 def node_score_blind(state: AgentState) -> AgentState:
-    jd = state["jd"]    # type: ignore
-    resumes = state["resumes"]      # type: ignore
-    weights = state.get("weights", DEFAULT_WEIGHTS)
-    blind_results = rank_candidates(jd, resumes, weights, blind_mode=True)
+    blind_results, _ = _score_stage(state, blind_mode=True)
     for i, c in enumerate(blind_results):
-        c.rank_blind = i + 1
+        if c.rank_blind is None:  # sharded top-K runs come back ranked against the pool
+            c.rank_blind = i + 1
     return {"blind_results": blind_results}
 
 
-def node_rationales_and_log(state: AgentState) -> AgentState:
-    jd = state["jd"]    # type: ignore
-    full_results = state["full_results"]    # type: ignore
-
-    jd_json = {
+def _jd_to_json(jd: JD) -> Dict[str, Any]:
+    return {
         "role_title": jd.role_title,
         "must_have_skills": jd.must_have_skills,
         "nice_to_have_skills": jd.nice_to_have_skills,
@@ -66,68 +285,134 @@ def node_rationales_and_log(state: AgentState) -> AgentState:
         "risk_flags": jd.risk_flags,
     }
 
-    # Generate rationales for top-K candidates
-    for i, c in enumerate(full_results):
-        if i >= 3:
-            break
-        evidence = []
-        if "skills" in c.resume.sections:
-            evidence.append(
-                {
-                    "text": c.resume.sections["skills"][:600],
-                    "source": "resume.skills",
-                    "score_dimension": "SkillScore",
-                }
-            )
-        if "experience" in c.resume.sections:
-            evidence.append(
-                {
-                    "text": c.resume.sections["experience"][:600],
-                    "source": "resume.experience",
-                    "score_dimension": "ExperienceScore",
-                }
-            )
-        candidate_json = {
-            "resume_id": c.resume.resume_id,
-            "name": c.resume.name,
-            "scores": {
-                "CompositeScore": c.scores.composite_score,
-                "SkillScore": c.scores.skill_score,
-                "SemanticScore": c.scores.semantic_score,
-                "ExperienceScore": c.scores.experience_score,
-                "OutcomeScore": c.scores.outcome_score,
-                "RiskScore": c.scores.risk_score,
-            },
-        }
-        c.rationale = generate_rationale_llm(jd_json, candidate_json, evidence)
-
-    # Prepare log entry
-    serializable_candidates = []
-    for c in full_results:
-        s = c.scores
-        serializable_candidates.append(
-            {
-                "resume_id": c.resume.resume_id,
-                "name": c.resume.name,
-                "rank_full": c.rank_full,
-                "scores": {
-                    "CompositeScore": s.composite_score,
-                    "JDMatchScore": getattr(s, "jd_match_score", 0.0),
-                    "SkillScore": s.skill_score,
-                    "SemanticScore": s.semantic_score,
-                    "ExperienceScore": s.experience_score,
-                    "OutcomeScore": s.outcome_score,
-                    "RiskScore": s.risk_score,
-                    "YearsExp": getattr(s, "years_experience", 0.0),
-                },
-            }
+
+def _candidate_json(c: CandidateResult) -> Dict[str, Any]:
+    return {
+        "resume_id": c.resume.resume_id,
+        "name": c.resume.name,
+        "scores": {
+            "CompositeScore": c.scores.composite_score,
+            "SkillScore": c.scores.skill_score,
+            "SemanticScore": c.scores.semantic_score,
+            "ExperienceScore": c.scores.experience_score,
+            "OutcomeScore": c.scores.outcome_score,
+            "RiskScore": c.scores.risk_score,
+        },
+    }
+
+
+# RationaleStats field counting each template decision
+TEMPLATE_COUNTERS = {
+    SHORTLIST: "template_shortlist",
+    REJECT: "template_reject",
+    BORDERLINE: "template_over_budget",
+}
+
+
+def write_rationales(
+    jd: JD,
+    full_results: List[CandidateResult],
+    policy: Optional[RationalePolicy] = None,
+    ckpt: Optional[RunCheckpoint] = None,
+    cache: Optional[ScoringCache] = None,
+    on_partial: Optional[Callable[[CandidateResult, Dict[str, str]], None]] = None,
+) -> RationaleStats:
+    """
+    Set c.rationale on every ranked candidate (LLM or template, see
+    rationale_policy). With `on_partial`, LLM rationales are streamed and
+    on_partial(candidate, {"summary", "action"}) fires as those fields complete.
+    """
+    jd_json = _jd_to_json(jd)
+
+    # Only borderline candidates (within the LLM budget) go to the LLM;
+    # clear shortlists / rejects get template rationales
+    to_llm, templated = (policy or RationalePolicy()).plan(full_results)
+    stats = RationaleStats(llm_candidates=len(to_llm))
+    pending = []
+    for c in to_llm:
+        rationale_key = f"rationale/{c.resume.resume_id}"
+        cached = cache.rationale(jd_json, _candidate_json(c), c.resume.raw_text) if cache else None
+        if ckpt and ckpt.has(rationale_key):
+            c.rationale = ckpt.load(rationale_key)
+            record_cache_hits()
+            stats.reused += 1
+        elif cached is not None:
+            c.rationale = cached
+            record_cache_hits()
+            stats.reused += 1
+        else:
+            pending.append(c)
+
+    # Relevance-ranked, token-budgeted evidence for all pending candidates
+    evidence_map = EvidencePacker(jd).pack_many([c.resume for c in pending]) if pending else {}
+
+    # One LLM call per batch of candidates; failed entries retry individually
+    by_id = {c.resume.resume_id: c for c in pending}
+    forward = None if on_partial is None else (lambda rid, fields: on_partial(by_id[rid], fields))
+    t0 = time.perf_counter()
+    for _, batch in iter_chunks(pending, RATIONALE_BATCH_SIZE):
+        rationales = generate_rationales_batch_llm(
+            jd_json, [_candidate_json(c) for c in batch], evidence_map, on_partial=forward
         )
+        stats.llm_calls += 1
+        for c in batch:
+            c.rationale = {**rationales[c.resume.resume_id], "generated_by": "llm"}
+            if ckpt:
+                ckpt.save(f"rationale/{c.resume.resume_id}", c.rationale)
+            if cache:
+                cache.save_rationale(jd_json, _candidate_json(c), c.resume.raw_text, c.rationale)
+    stats.llm_seconds = time.perf_counter() - t0
 
-    log_run(jd_json, state.get("weights", DEFAULT_WEIGHTS), serializable_candidates)
-    # We mutated full_results in place; return state unchanged
-    return state
+    with span("rationale.templates") as sp:
+        sp.items = len(templated)
+        for c in full_results:
+            decision = templated.get(c.resume.resume_id)
+            if decision is None:
+                continue
+            c.rationale = template_rationale(c, jd, decision)
+            counter = TEMPLATE_COUNTERS[decision]
+            setattr(stats, counter, getattr(stats, counter) + 1)
+    if stats.llm_calls:
+        # What sending the templated candidates to the LLM would have cost at this run's pace
+        calls_saved = math.ceil(len(templated) / max(RATIONALE_BATCH_SIZE, 1))
+        stats.est_seconds_saved = calls_saved * stats.llm_seconds / stats.llm_calls
+    return stats
 
 
+@instrument_node("rationales_and_log")
+def node_rationales_and_log(state: AgentState) -> AgentState:
+    jd = state["jd"]    # type: ignore
+    full_results = state["full_results"]    # type: ignore
+    ckpt = _checkpoint(state)
+    stats = write_rationales(
+        jd, full_results, state.get("rationale_policy"), ckpt, state.get("scoring_cache"),
+        on_partial=state.get("on_rationale"),
+    )
+
+    blind_ranks = {c.resume.resume_id: c.rank_blind for c in state.get("blind_results") or []}
+    for c in full_results:
+        c.rank_blind = blind_ranks.get(c.resume.resume_id)
+    # One columnar table for the log, the UI and exports
+    with span("results_table") as sp:
+        sp.items = len(full_results)
+        table = results_table(full_results)
+
+    if ckpt is None or not ckpt.has("logged"):
+        log_run(
+            _jd_to_json(jd),
+            state.get("weights", DEFAULT_WEIGHTS),
+            table,
+            run_id=state.get("run_id"),
+            performance=state["perf"].to_dict() if state.get("perf") else None,
+            rationale_stats=asdict(stats),
+        )
+        if ckpt:
+            ckpt.save("logged", True)
+    # full_results were updated in place
+    return {"rationale_stats": stats, "results_table": table}
+
+
+@instrument_node("bias_notes")
 def node_bias_notes(state: AgentState) -> AgentState:
     """
     Optional node – NOT wired into the main graph to avoid name collision.
@@ -148,12 +433,84 @@ def node_bias_notes(state: AgentState) -> AgentState:
     return {"bias_notes": notes}
 
 
+class MultiJDState(TypedDict, total=False):
+    run_id: str
+    checkpoint: bool
+    chunk_size: int
+    jd_texts: List[str]
+    jds: List[JD]
+    resume_paths: List[str]
+    resumes: List[ResumeParsed]
+    dedupe: bool
+    duplicate_clusters: List[DuplicateCluster]
+    weights: Dict[str, float]
+    result: MultiJDResult
+
+
+@instrument_node("parse_jds")
+def node_parse_jds(state: MultiJDState) -> MultiJDState:
+    ckpt = _checkpoint(state)  # type: ignore[arg-type]
+    jds: List[JD] = []
+    for i, text in enumerate(state["jd_texts"]):  # type: ignore
+        key = f"jd/{i:03d}"
+        if ckpt and ckpt.has(key):
+            jds.append(ckpt.load(key))
+            continue
+        jd = parse_jd(text)
+        if ckpt:
+            ckpt.save(key, jd)
+        jds.append(jd)
+    return {"jds": jds}
+
+
+@instrument_node("score_matrix")
+def node_score_matrix(state: MultiJDState) -> MultiJDState:
+    weights = state.get("weights", DEFAULT_WEIGHTS)
+    result = rank_candidates_multi(state["jds"], state["resumes"], weights)  # type: ignore
+    for jd, ranked in zip(result.jds, result.rankings):
+        log_run(
+            _jd_to_json(jd),
+            weights,
+            results_table(ranked),
+            run_id=state.get("run_id"),
+        )
+    return {"result": result}
+
+
+def build_multi_jd_graph():
+    """
+    Screen one resume pool against several JDs: resumes are parsed and
+    embedded once, then scored against every JD in a single matrix pass.
+    """
+    from langgraph.graph import StateGraph, END
+
+    graph = StateGraph(MultiJDState)
+
+    graph.add_node("parse_jds", node_parse_jds)
+    graph.add_node("parse_resumes", node_parse_resumes)
+    graph.add_node("dedupe_resumes", node_dedupe_resumes)
+    graph.add_node("score_matrix", node_score_matrix)
+
+    graph.set_entry_point("parse_jds")
+    graph.add_edge("parse_jds", "parse_resumes")
+    graph.add_edge("parse_resumes", "dedupe_resumes")
+    graph.add_edge("dedupe_resumes", "score_matrix")
+    graph.add_edge("score_matrix", END)
+
+    return graph.compile()
+
+
 def build_agent_graph():
+    # langgraph is imported here rather than at module level so importing the
+    # package (nodes, states, batch CLI --help) stays fast.
+    from langgraph.graph import StateGraph, END
+
     graph = StateGraph(AgentState)
 
     # Main pipeline nodes
     graph.add_node("parse_jd", node_parse_jd)
     graph.add_node("parse_resumes", node_parse_resumes)
+    graph.add_node("dedupe_resumes", node_dedupe_resumes)
     graph.add_node("score_full", node_score_full)
     graph.add_node("score_blind", node_score_blind)
     graph.add_node("rationales_and_log", node_rationales_and_log)
@@ -161,7 +518,8 @@ def build_agent_graph():
     # Entry and edges for main flow
     graph.set_entry_point("parse_jd")
     graph.add_edge("parse_jd", "parse_resumes")
-    graph.add_edge("parse_resumes", "score_full")
+    graph.add_edge("parse_resumes", "dedupe_resumes")
+    graph.add_edge("dedupe_resumes", "score_full")
     graph.add_edge("score_full", "score_blind")
     graph.add_edge("score_blind", "rationales_and_log")
     graph.add_edge("rationales_and_log", END)
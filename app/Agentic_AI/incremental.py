@@ -0,0 +1,288 @@
+"""
+Incremental rescoring while a JD is being edited.
+
+A ScoringCache lives for a UI session and memoizes every piece of scoring
+work by what it actually depends on:
+
+- JD parse         -> normalized JD text
+- resume parse     -> upload bytes hash + filename
+- JD embedding     -> jd_embed_text(jd) (role, skills, outcomes)
+- resume embedding -> (resume text hash, blind mode)
+- skill hit column -> skill string, per resume
+- outcome column   -> outcome string, per resume
+- rationale        -> JD JSON + candidate scores + resume text
+
+After an edit only the parts of the new JD that differ from anything seen
+before are recomputed: adding a must-have skill computes one skill column,
+changing the experience range recomputes nothing but the (cheap)
+vectorized experience score, and resume embeddings are never redone.
+
+Every memo is an LRU bounded by SCORING_CACHE_MAX_RESUMES resumes (or
+SCORING_CACHE_MAX_JDS JD texts / skills), so a long session that keeps
+uploading new pools does not grow without limit.
+"""
+import hashlib
+import json
+import threading
+import uuid
+from collections import OrderedDict
+from dataclasses import fields, replace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .blob_store import content_hash
+from .config import SCORING_CACHE_MAX_JDS, SCORING_CACHE_MAX_RESUMES
+from .embedding import embed_texts
+from .feature_store import resume_features, text_key
+from .instrumentation import record_cache_hits, span
+from .schemas import JD, CandidateResult, ResumeFeatures, ResumeParsed
+from .scoring import (
+    _composite,
+    _risk_from_counts,
+    _skill_in_tokens,
+    build_scores,
+    embed_resumes,
+    jd_embed_text,
+)
+
+
+def diff_jd(old: Optional[JD], new: JD) -> List[str]:
+    """Names of JD fields that changed (all fields when there is no previous JD)."""
+    if old is None:
+        return [f.name for f in fields(JD)]
+    return [f.name for f in fields(JD) if getattr(old, f.name) != getattr(new, f.name)]
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split())
+
+
+class _LRU:
+    """Thread-safe mapping that keeps the `maxsize` most recently used entries."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = max(1, maxsize)
+        self._data: "OrderedDict[Any, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key) -> bool:
+        return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._data:
+                return default
+            self._data.move_to_end(key)
+            return self._data[key]
+
+    def put(self, key, value) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+
+class ScoringCache:
+    def __init__(self, max_resumes: int = SCORING_CACHE_MAX_RESUMES, max_jds: int = SCORING_CACHE_MAX_JDS):
+        self.max_resumes = max_resumes
+        self.last_jd: Optional[JD] = None
+        self._jd_parses = _LRU(max_jds)  # JD text key -> JD
+        self._jd_embeds = _LRU(max_jds)  # jd_embed_text -> vector
+        self._parsed = _LRU(max_resumes)  # upload key -> ResumeParsed
+        self._resume_embeds = _LRU(2 * max_resumes)  # (text key, blind) -> vector
+        # skill / outcome -> LRU of resume text key -> hit; a JD has a few dozen of them
+        self._skill_hits = _LRU(32 * max_jds)
+        self._outcome_hits = _LRU(32 * max_jds)
+        self._rationales = _LRU(max_resumes)  # rationale key -> rationale
+        self._lock = threading.Lock()
+
+    # --- JD side ---
+
+    @staticmethod
+    def _jd_key(jd_text: str) -> str:
+        return hashlib.sha256(_normalize(jd_text).encode("utf-8")).hexdigest()
+
+    def parse_jd(self, jd_text: str, parse: Callable[[str], JD]) -> Tuple[JD, List[str]]:
+        """
+        Parsed JD for this text (whitespace-insensitive; only new text is sent
+        to the LLM) and the fields that changed since the previous run.
+        """
+        key = self._jd_key(jd_text)
+        jd = self._jd_parses.get(key)
+        if jd is None:
+            jd = parse(jd_text)
+            self._jd_parses.put(key, jd)
+        else:
+            record_cache_hits()
+        changes = diff_jd(self.last_jd, jd)
+        self.last_jd = jd
+        return jd, changes
+
+    def warm_jd(self, jd_text: str, parse: Callable[[str], JD]) -> JD:
+        """Parse and embed a JD ahead of a run; unlike parse_jd, last_jd is left alone."""
+        key = self._jd_key(jd_text)
+        jd = self._jd_parses.get(key)
+        if jd is None:
+            jd = parse(jd_text)
+            self._jd_parses.put(key, jd)
+        self.jd_embed(jd)
+        return jd
+
+    def jd_embed(self, jd: JD) -> np.ndarray:
+        text = jd_embed_text(jd)
+        vec = self._jd_embeds.get(text)
+        if vec is None:
+            vec = embed_texts([text])[0]
+            self._jd_embeds.put(text, vec)
+        else:
+            record_cache_hits()
+        return vec
+
+    # --- resume side ---
+
+    def parse_resume(self, filename: str, data: bytes, parse: Callable[[bytes, str], ResumeParsed]) -> ResumeParsed:
+        """Parsed upload, memoized by file content + name; each call gets a fresh resume_id."""
+        key = f"{content_hash(data)}:{filename}"
+        parsed = self._parsed.get(key)
+        if parsed is None:
+            parsed = parse(data, filename)
+            self._parsed.put(key, parsed)
+        else:
+            record_cache_hits()
+        return replace(parsed, resume_id=str(uuid.uuid4()))
+
+    def resume_embeds(self, resumes: List[ResumeParsed], keys: List[str], blind_mode: bool) -> np.ndarray:
+        # Collected locally: a pool bigger than the cache evicts its own first rows
+        vecs = [self._resume_embeds.get((k, blind_mode)) for k in keys]
+        missing = [i for i, v in enumerate(vecs) if v is None]
+        if missing:
+            new = embed_resumes([resumes[i] for i in missing], blind_mode=blind_mode)
+            for i, vec in zip(missing, new):
+                vecs[i] = vec
+                self._resume_embeds.put((keys[i], blind_mode), vec)
+        record_cache_hits(len(keys) - len(missing))
+        return np.stack(vecs)
+
+    def _column(
+        self,
+        memo: _LRU,
+        item: str,
+        keys: List[str],
+        features: List[ResumeFeatures],
+        test: Callable[[str, ResumeFeatures], bool],
+    ) -> np.ndarray:
+        """Boolean column over resumes for one skill / outcome, memoized per resume."""
+        column = memo.get(item)
+        if column is None:
+            column = _LRU(self.max_resumes)
+            memo.put(item, column)
+        hits = []
+        for k, f in zip(keys, features):
+            hit = column.get(k)
+            if hit is None:
+                hit = test(item, f)
+                column.put(k, hit)
+            hits.append(hit)
+        return np.array(hits, dtype=bool)
+
+    def skill_hits(self, skills: List[str], keys: List[str], features: List[ResumeFeatures]) -> np.ndarray:
+        """(n_resumes × n_skills) skill-match matrix."""
+        cols = [
+            self._column(self._skill_hits, s, keys, features, lambda s, f: _skill_in_tokens(s, f.tokens))
+            for s in skills
+        ]
+        return np.stack(cols, axis=1) if cols else np.zeros((len(keys), 0), dtype=bool)
+
+    def outcome_hits(self, outcomes: List[str], keys: List[str], features: List[ResumeFeatures]) -> np.ndarray:
+        """(n_resumes × n_outcomes) matrix, same rule as scoring._outcome_score."""
+
+        def present(outcome: str, f: ResumeFeatures) -> bool:
+            chunk = outcome.lower()[:20]
+            return bool(chunk) and chunk in f.text_lower
+
+        cols = [self._column(self._outcome_hits, o, keys, features, present) for o in outcomes]
+        return np.stack(cols, axis=1) if cols else np.zeros((len(keys), 0), dtype=bool)
+
+
+    # --- LLM rationales ---
+
+    @staticmethod
+    def _rationale_key(jd_json: Dict[str, Any], candidate_json: Dict[str, Any], resume_text: str) -> str:
+        # resume_id changes on every parse, so key on the resume text instead
+        payload = {
+            "jd": jd_json,
+            "candidate": {k: v for k, v in candidate_json.items() if k != "resume_id"},
+            "resume": text_key(resume_text),
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+    def rationale(self, jd_json: Dict[str, Any], candidate_json: Dict[str, Any], resume_text: str) -> Optional[Dict[str, Any]]:
+        return self._rationales.get(self._rationale_key(jd_json, candidate_json, resume_text))
+
+    def save_rationale(
+        self, jd_json: Dict[str, Any], candidate_json: Dict[str, Any], resume_text: str, rationale: Dict[str, Any]
+    ) -> None:
+        self._rationales.put(self._rationale_key(jd_json, candidate_json, resume_text), rationale)
+
+
+def score_incremental(
+    cache: ScoringCache,
+    jd: JD,
+    resumes: List[ResumeParsed],
+    weights: Dict[str, float],
+    blind_mode: bool = False,
+) -> List[CandidateResult]:
+    """
+    Same results as scoring.score_candidates (unsorted), but every component
+    is looked up in `cache` first and only missing pieces are computed.
+    """
+    with cache._lock:
+        keys = [text_key(r.raw_text) for r in resumes]
+        features = resume_features(resumes)
+        with span("rescore.embed"):
+            jd_vec = cache.jd_embed(jd)
+            resume_vecs = cache.resume_embeds(resumes, keys, blind_mode)
+            semantic = resume_vecs @ jd_vec if len(resumes) else np.zeros(0, dtype="float32")
+
+        with span("rescore.components") as sp:
+            sp.items = len(resumes)
+            must = [s.strip() for s in jd.must_have_skills if s.strip()]
+            nice = [s.strip() for s in jd.nice_to_have_skills if s.strip()]
+            must_hits = cache.skill_hits(must, keys, features)
+            nice_hits = cache.skill_hits(nice, keys, features)
+            outcome_hits = cache.outcome_hits(jd.key_outcomes, keys, features)
+
+        skill = must_hits.sum(axis=1) / max(len(must), 1)
+        years = np.array([f.years for f in features], dtype="float32")
+        if jd.min_years_experience > 0:
+            experience = np.minimum(years / jd.min_years_experience, 1.0)
+        else:
+            experience = np.full(len(resumes), 0.5, dtype="float32")
+        if jd.key_outcomes:
+            outcome = outcome_hits.sum(axis=1) / max(len(jd.key_outcomes), 1)
+        else:
+            outcome = np.zeros(len(resumes), dtype="float32")
+        risk = np.array([_risk_from_counts(f.buzzword_count, f.has_metrics) for f in features], dtype="float32")
+        composite = _composite(weights, skill, semantic, experience, outcome, risk)
+
+    results: List[CandidateResult] = []
+    for i, r in enumerate(resumes):
+        scores = build_scores(
+            skill[i],
+            semantic[i],
+            experience[i],
+            outcome[i],
+            risk[i],
+            composite[i],
+            [s for k, s in enumerate(must) if must_hits[i, k]],
+            [s for k, s in enumerate(must) if not must_hits[i, k]],
+            [s for k, s in enumerate(nice) if nice_hits[i, k]],
+            years[i],
+        )
+        results.append(CandidateResult(resume=r, scores=scores, jd=jd))
+    return results
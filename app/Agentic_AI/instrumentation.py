@@ -0,0 +1,152 @@
+"""
+Lightweight per-run instrumentation for the screening graph.
+
+Each graph node runs inside a span; LLM and embedding calls (and anything
+else wrapped in `span(...)`) open child spans of whatever node is active.
+Spans with the same (parent, name) are aggregated, so 10k `parse_resume`
+calls become one row with a call count instead of 10k objects.
+"""
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from . import profiling
+
+
+@dataclass
+class SpanStats:
+    name: str
+    parent: Optional[str]
+    first_start_ms: float  # offset from run start
+    calls: int = 0
+    wall_ms: float = 0.0
+    max_ms: float = 0.0
+    items: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cache_hits: int = 0
+
+
+class Span:
+    """Mutable handle for an open span; counters are folded in on close."""
+
+    def __init__(self, name: str, parent: Optional[str]):
+        self.name = name
+        self.parent = parent
+        self.items = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cache_hits = 0
+
+    def add_usage(self, response: Any) -> None:
+        """Pull token usage off a LangChain chat response, if the provider reported it."""
+        usage = getattr(response, "usage_metadata", None) or {}
+        if usage:
+            self.prompt_tokens += int(usage.get("input_tokens", 0))
+            self.completion_tokens += int(usage.get("output_tokens", 0))
+            return
+        meta = getattr(response, "response_metadata", None) or {}
+        token_usage = meta.get("token_usage") or {}
+        self.prompt_tokens += int(token_usage.get("prompt_tokens", 0))
+        self.completion_tokens += int(token_usage.get("completion_tokens", 0))
+
+
+class RunProfile:
+    def __init__(self):
+        self._t0 = time.perf_counter()
+        self._stats: Dict[Tuple[Optional[str], str], SpanStats] = {}
+        self._lock = threading.Lock()
+
+    def _record(self, span: Span, start: float, end: float) -> None:
+        duration_ms = (end - start) * 1000
+        key = (span.parent, span.name)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = SpanStats(span.name, span.parent, (start - self._t0) * 1000)
+                self._stats[key] = stats
+            stats.calls += 1
+            stats.wall_ms += duration_ms
+            stats.max_ms = max(stats.max_ms, duration_ms)
+            stats.items += span.items
+            stats.prompt_tokens += span.prompt_tokens
+            stats.completion_tokens += span.completion_tokens
+            stats.cache_hits += span.cache_hits
+
+    def spans(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = [asdict(s) for s in self._stats.values()]
+        return sorted(rows, key=lambda r: r["first_start_ms"])
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "elapsed_ms": (time.perf_counter() - self._t0) * 1000,
+            "spans": self.spans(),
+        }
+
+
+_PROFILE: ContextVar[Optional[RunProfile]] = ContextVar("run_profile", default=None)
+_SPAN: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_profile() -> Optional[RunProfile]:
+    return _PROFILE.get()
+
+
+@contextmanager
+def span(name: str) -> Iterator[Span]:
+    """
+    Time a block as a child of the active span. Outside an instrumented
+    run this is a cheap no-op that still yields a usable Span.
+    """
+    parent = _SPAN.get()
+    sp = Span(name, parent.name if parent else None)
+    profile = _PROFILE.get()
+    if profile is None:
+        yield sp
+        return
+    token = _SPAN.set(sp)
+    start = time.perf_counter()
+    try:
+        yield sp
+    finally:
+        profile._record(sp, start, time.perf_counter())
+        _SPAN.reset(token)
+
+
+def record_cache_hits(n: int = 1) -> None:
+    """Count cache / checkpoint hits against the active span."""
+    sp = _SPAN.get()
+    if sp is not None:
+        sp.cache_hits += n
+
+
+def instrument_node(name: str):
+    """
+    Decorator for graph nodes: runs the node inside a `node.<name>` span
+    of the run's RunProfile (created on first use and carried in state["perf"]).
+    """
+
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(state):
+            profile = state.get("perf") or RunProfile()
+            token = _PROFILE.set(profile)
+            profiling.node_started(name)
+            try:
+                with span(f"node.{name}"):
+                    out = fn(state)
+            finally:
+                profiling.node_finished(name)
+                _PROFILE.reset(token)
+            out = dict(out) if out is not None else {}
+            out["perf"] = profile
+            return out
+
+        return wrapper
+
+    return deco
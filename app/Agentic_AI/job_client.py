@@ -0,0 +1,100 @@
+"""
+Small stdlib client for the local job server (see job_server.py).
+
+    client = JobClient("http://127.0.0.1:8766")
+    job_id = client.submit(jd_text, [("cv.pdf", data)], weights)["job_id"]
+    client.status(job_id)["state"]          # queued / running / done / failed
+    jd, candidates, summary = client.results(job_id)
+    client.results(job_id, offset=0, limit=20)  # while running: partial ranking so far
+"""
+import base64
+import json
+import urllib.error
+import urllib.parse
+import urllib.request
+from typing import Any, Dict, List, Optional, Tuple
+
+from .schemas import JD, CandidateResult
+from .serialization import candidate_from_dict, jd_from_dict
+
+
+class JobQueueFull(Exception):
+    """Server answered 429; `retry_after` is the suggested wait in seconds."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"job queue full, retry in {retry_after:.0f}s")
+        self.retry_after = retry_after
+
+
+class JobClient:
+    def __init__(self, base_url: str, client_id: str = "", timeout: float = 30.0):
+        self.base_url = base_url.rstrip("/")
+        self.client_id = client_id
+        self.timeout = timeout
+
+    def _request(self, method: str, path: str, payload: Optional[Dict[str, Any]] = None):
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        req = urllib.request.Request(self.base_url + path, data=data, method=method)
+        req.add_header("Content-Type", "application/json")
+        if self.client_id:
+            req.add_header("X-Client-Id", self.client_id)
+        try:
+            return urllib.request.urlopen(req, timeout=self.timeout)
+        except urllib.error.HTTPError as exc:
+            if exc.code == 429:
+                raise JobQueueFull(float(exc.headers.get("Retry-After", 5))) from None
+            raise
+
+    def submit(
+        self, jd_text: str, resume_files: List[Tuple[str, bytes]], weights: Dict[str, float]
+    ) -> Dict[str, Any]:
+        payload = {
+            "jd_text": jd_text,
+            "resumes": [
+                {"filename": name, "data_b64": base64.b64encode(data).decode("ascii")}
+                for name, data in resume_files
+            ],
+            "weights": weights,
+            "client_id": self.client_id,
+        }
+        with self._request("POST", "/jobs", payload) as resp:
+            return json.loads(resp.read())
+
+    def status(self, job_id: str) -> Dict[str, Any]:
+        with self._request("GET", f"/jobs/{job_id}") as resp:
+            return json.loads(resp.read())
+
+    def cancel(self, job_id: str) -> bool:
+        try:
+            with self._request("DELETE", f"/jobs/{job_id}"):
+                return True
+        except urllib.error.HTTPError:
+            return False
+
+    def results(
+        self, job_id: str, offset: int = 0, limit: Optional[int] = None
+    ) -> Tuple[JD, List[CandidateResult], Dict[str, Any]]:
+        """
+        Read the NDJSON result stream: (jd, candidates in rank order, summary).
+        While the job is running this is a page of the partial ranking and
+        summary["partial"] is True; summary["total"] counts all ranked rows.
+        """
+        jd: Optional[JD] = None
+        candidates: List[CandidateResult] = []
+        summary: Dict[str, Any] = {}
+        query = {"offset": offset} if offset else {}
+        if limit is not None:
+            query["limit"] = limit
+        path = f"/jobs/{job_id}/results" + (f"?{urllib.parse.urlencode(query)}" if query else "")
+        with self._request("GET", path) as resp:
+            for line in resp:
+                if not line.strip():
+                    continue
+                msg = json.loads(line)
+                if msg["type"] == "jd":
+                    jd = jd_from_dict(msg["jd"]) if msg["jd"] else None
+                elif msg["type"] == "candidate":
+                    candidates.append(candidate_from_dict(msg["candidate"], jd))  # type: ignore[arg-type]
+                elif msg["type"] == "summary":
+                    summary = msg
+        return jd, candidates, summary  # type: ignore[return-value]
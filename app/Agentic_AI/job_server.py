@@ -0,0 +1,490 @@
+"""
+Local screening job server: HTTP API, fair bounded queue, pre-warmed workers.
+
+    python -m Agentic_AI.job_server --port 8766 --workers 2 --queue-depth 16
+    JOB_SERVER_URL=http://127.0.0.1:8766 streamlit run app/app.py
+
+Endpoints (JSON unless noted):
+
+    POST   /jobs               {"jd_text", "resumes": [{"filename", "data_b64"}], "weights", "client_id"}
+                               -> 202 {"job_id", "position"}; 429 + Retry-After when the queue is full
+    GET    /jobs/<id>          -> status: queued / running / done / failed, queue position, timings
+    GET    /jobs/<id>/results  -> NDJSON stream: {"type": "jd"}, one {"type": "candidate"} per
+                                  candidate (in rank order), then {"type": "summary"};
+                                  ?offset=&limit= page through the ranking. While the job
+                                  is running this is the partial ranking of the resumes
+                                  scored so far ("partial": true in the summary)
+    DELETE /jobs/<id>          -> cancel a queued job
+    GET    /health             -> workers, queued, running
+
+Jobs run in a fixed pool of worker processes that import the graph, build
+it and create the LLM / embedding clients once at start-up. Queued jobs are
+dispatched round-robin across clients, so one recruiter's large batch does
+not starve everyone else, and the queue depth bounds memory and latency.
+If a worker process dies (OOM kill, segfault), the jobs in flight on it
+fail and a fresh pool takes over. Workers publish each scored chunk back
+to the server, so clients can page through a partial ranking before the
+rationales are done.
+Job state lives in the server, so a browser refresh can re-attach by job ID.
+"""
+import argparse
+import base64
+import json
+import multiprocessing
+import threading
+import time
+import uuid
+import urllib.parse
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Deque, Dict, List, Optional
+
+from .config import (
+    DEFAULT_WEIGHTS,
+    JOB_MAX_PER_CLIENT,
+    JOB_QUEUE_DEPTH,
+    JOB_RESULT_TTL_S,
+    JOB_SERVER_PORT,
+    JOB_WORKERS,
+)
+
+
+class QueueFull(Exception):
+    pass
+
+
+# --- worker process side ---
+
+_GRAPH = None
+_PROGRESS = None  # multiprocessing queue of (job_id, jd, scored candidates) back to the server
+
+
+def _warm_worker(progress=None) -> None:
+    """Pool initializer: pay heavy imports, graph compile and client setup once."""
+    global _GRAPH, _PROGRESS
+    _PROGRESS = progress
+    from .embedding import get_embedding_model
+    from .graph import build_agent_graph
+    from .llm_utils import get_llm
+
+    _GRAPH = build_agent_graph()
+    try:
+        get_llm()
+        get_embedding_model()
+    except Exception:  # noqa: BLE001 - missing credentials surface on the first job instead
+        pass
+
+
+def _ready() -> bool:
+    return True
+
+
+def run_job(job_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Run one screening job in a worker; returns JSON-safe results."""
+    from .serialization import candidate_to_dict, clusters_to_list, jd_to_dict
+
+    files = [
+        (r["filename"], base64.b64decode(r["data_b64"])) for r in payload["resumes"]
+    ]
+    state = {
+        "run_id": job_id,
+        "jd_text": payload["jd_text"],
+        "resume_files": files,
+        "weights": payload.get("weights") or DEFAULT_WEIGHTS,
+    }
+    if _PROGRESS is not None:
+        state["on_scored"] = lambda jd, scored: _PROGRESS.put(
+            (job_id, jd_to_dict(jd), [candidate_to_dict(c) for c in scored])
+        )
+    final_state = _GRAPH.invoke(state)  # type: ignore[union-attr]
+    perf = final_state.get("perf")
+    return {
+        "jd": jd_to_dict(final_state["jd"]),
+        "candidates": [candidate_to_dict(c) for c in final_state["full_results"]],
+        "duplicate_clusters": clusters_to_list(final_state.get("duplicate_clusters") or []),
+        "perf": perf.to_dict() if perf is not None else None,
+        "rationale_stats": asdict(final_state["rationale_stats"]),
+    }
+
+
+# --- server side ---
+
+
+@dataclass
+class Job:
+    job_id: str
+    client_id: str
+    payload: Optional[Dict[str, Any]]
+    state: str = "queued"  # queued | running | done | failed | cancelled
+    submitted_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
+    result: Optional[Dict[str, Any]] = None
+    n_resumes: Optional[int] = None
+    partial: Optional[Dict[str, Any]] = None  # {"jd", "candidates"} scored so far, in rank order
+
+    def __post_init__(self):
+        if self.payload and self.n_resumes is None:
+            self.n_resumes = len(self.payload.get("resumes") or [])
+
+    def status(self, position: Optional[int]) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "state": self.state,
+            "position": position,
+            "n_resumes": self.n_resumes,
+            "n_scored": len(self.partial["candidates"]) if self.partial else 0,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error,
+        }
+
+
+class FairQueue:
+    """
+    Bounded multi-client queue: FIFO per client, round-robin across clients.
+    `put` raises QueueFull when the total depth or the client's share is used up.
+    """
+
+    def __init__(self, max_depth: int, max_per_client: int):
+        self.max_depth = max_depth
+        self.max_per_client = max_per_client
+        self._queues: "OrderedDict[str, Deque[Job]]" = OrderedDict()
+        self._size = 0
+        self._cond = threading.Condition()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def put(self, job: Job) -> None:
+        with self._cond:
+            q = self._queues.setdefault(job.client_id, deque())
+            if self._size >= self.max_depth or len(q) >= self.max_per_client:
+                if not q:
+                    del self._queues[job.client_id]
+                raise QueueFull()
+            q.append(job)
+            self._size += 1
+            self._cond.notify()
+
+    def get(self) -> Job:
+        with self._cond:
+            while not self._size:
+                self._cond.wait()
+            client_id, q = next(iter(self._queues.items()))
+            job = q.popleft()
+            self._size -= 1
+            # Move this client to the back so the next pick serves someone else
+            del self._queues[client_id]
+            if q:
+                self._queues[client_id] = q
+            return job
+
+    def remove(self, job: Job) -> bool:
+        with self._cond:
+            q = self._queues.get(job.client_id)
+            if not q or job not in q:
+                return False
+            q.remove(job)
+            self._size -= 1
+            if not q:
+                del self._queues[job.client_id]
+            return True
+
+    def position(self, job: Job) -> Optional[int]:
+        """Approximate 1-based dispatch position under round-robin."""
+        with self._cond:
+            q = self._queues.get(job.client_id)
+            if not q or job not in q:
+                return None
+            rounds = list(q).index(job)  # full round-robin rounds before this job
+            order = list(self._queues)
+            mine = order.index(job.client_id)
+            ahead = 0
+            for i, client_id in enumerate(order):
+                # clients earlier in the rotation also get a turn in this job's round
+                ahead += min(len(self._queues[client_id]), rounds + (1 if i < mine else 0))
+            return ahead + 1
+
+
+class JobManager:
+    def __init__(
+        self,
+        workers: int = JOB_WORKERS,
+        queue_depth: int = JOB_QUEUE_DEPTH,
+        max_per_client: int = JOB_MAX_PER_CLIENT,
+        result_ttl: float = JOB_RESULT_TTL_S,
+    ):
+        self.workers = max(1, workers)
+        self.queue = FairQueue(queue_depth, max_per_client)
+        self.result_ttl = result_ttl
+        self.jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._slots = threading.Semaphore(self.workers)
+        self.pool = self._new_pool()
+        self._running = 0
+        threading.Thread(target=self._dispatch, daemon=True, name="job-dispatch").start()
+
+    def submit(self, payload: Dict[str, Any], client_id: str) -> Job:
+        job = Job(job_id=uuid.uuid4().hex[:16], client_id=client_id or "anonymous", payload=payload)
+        # Register first: a free worker may pick the job up as soon as it is queued
+        with self._lock:
+            self._expire()
+            self.jobs[job.job_id] = job
+        try:
+            self.queue.put(job)
+        except QueueFull:
+            with self._lock:
+                del self.jobs[job.job_id]
+            raise
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self.jobs.get(job_id)
+
+    def cancel(self, job: Job) -> bool:
+        if self.queue.remove(job):
+            job.state = "cancelled"
+            job.finished_at = time.time()
+            job.payload = None
+            return True
+        return False
+
+    def health(self) -> Dict[str, Any]:
+        return {"workers": self.workers, "queued": len(self.queue), "running": self._running}
+
+    def _expire(self) -> None:
+        cutoff = time.time() - self.result_ttl
+        for job_id in [j.job_id for j in self.jobs.values() if j.finished_at and j.finished_at < cutoff]:
+            del self.jobs[job_id]
+
+    def _publish(self, job_id: str, jd: Dict[str, Any], scored: List[Dict[str, Any]]) -> None:
+        """Merge a scored chunk into the job's partial ranking (same order as the final sort)."""
+        job = self.get(job_id)
+        if job is None or job.state != "running":
+            return
+        done = job.partial["candidates"] if job.partial else []
+        ranked = sorted(done + scored, key=lambda c: c["scores"]["composite_score"], reverse=True)
+        job.partial = {"jd": jd, "candidates": ranked}  # one assignment: readers see old or new
+
+    def _drain(self, progress) -> None:
+        while True:
+            try:
+                job_id, jd, scored = progress.get()
+            except (EOFError, OSError):  # pool shut down
+                return
+            self._publish(job_id, jd, scored)
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        # spawn: workers must not inherit the server's threads and sockets
+        ctx = multiprocessing.get_context("spawn")
+        # One progress queue per pool: a killed worker may leave its queue's lock held
+        progress = ctx.Queue()
+        threading.Thread(target=self._drain, args=(progress,), daemon=True, name="job-progress").start()
+        pool = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=ctx, initializer=_warm_worker, initargs=(progress,)
+        )
+        for _ in range(self.workers):
+            pool.submit(_ready)  # workers start on demand; start (and warm) them all now
+        return pool
+
+    def _replace_pool(self, broken: ProcessPoolExecutor) -> None:
+        """A worker died (OOM, segfault): start a fresh pool once for all affected jobs."""
+        with self._lock:
+            if self.pool is not broken:
+                return
+            self.pool = self._new_pool()
+        broken.shutdown(wait=False, cancel_futures=True)
+
+    def _dispatch(self) -> None:
+        while True:
+            self._slots.acquire()  # wait for a free worker before dequeuing
+            job = self.queue.get()
+            job.state = "running"
+            job.started_at = time.time()
+            with self._lock:
+                self._running += 1
+            while True:
+                pool = self.pool
+                try:
+                    future = pool.submit(run_job, job.job_id, job.payload)
+                except BrokenProcessPool:
+                    self._replace_pool(pool)
+                    continue
+                break
+            future.add_done_callback(lambda f, job=job, pool=pool: self._done(job, f, pool))
+
+    def _done(self, job: Job, future: Future, pool: ProcessPoolExecutor) -> None:
+        try:
+            result = future.result()
+        except BrokenProcessPool as exc:
+            # Every job in flight on the broken pool fails; the slot is released either way
+            self._replace_pool(pool)
+            self._finish(job, None, RuntimeError(f"worker process died: {exc}"))
+        except BaseException as exc:  # noqa: BLE001 - includes cancellation on shutdown
+            self._finish(job, None, exc)
+        else:
+            self._finish(job, result, None)
+
+    def _finish(self, job: Job, result: Optional[Dict[str, Any]], exc: Optional[BaseException]) -> None:
+        job.result = result
+        job.error = repr(exc) if exc is not None else None
+        job.state = "failed" if exc is not None else "done"
+        job.finished_at = time.time()
+        job.payload = None  # free the resume bytes
+        job.partial = None
+        with self._lock:
+            self._running -= 1
+        self._slots.release()
+
+    def close(self) -> None:
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _result_lines(job: Job, offset: int = 0, limit: Optional[int] = None):
+    """Final results once the job is done, else the partial ranking so far."""
+    partial = job.state != "done"
+    result = (job.partial or {}) if partial else (job.result or {})
+    candidates = result.get("candidates", [])
+    end = len(candidates) if limit is None else offset + limit
+    yield {"type": "jd", "jd": result.get("jd")}
+    for c in candidates[offset:end]:
+        yield {"type": "candidate", "candidate": c}
+    summary = {"type": "summary", "job_id": job.job_id, "partial": partial, "total": len(candidates)}
+    if partial:
+        summary["n_resumes"] = job.n_resumes
+    else:
+        summary.update(
+            duplicate_clusters=result.get("duplicate_clusters", []),
+            perf=result.get("perf"),
+            rationale_stats=result.get("rationale_stats"),
+        )
+    yield summary
+
+
+def make_handler(manager: JobManager):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def _send(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _job(self, parts: List[str]) -> Optional[Job]:
+            job = manager.get(parts[1]) if len(parts) >= 2 else None
+            if job is None:
+                self._send(404, {"error": "unknown job"})
+            return job
+
+        def do_POST(self):
+            if self.path.rstrip("/") != "/jobs":
+                return self._send(404, {"error": f"unknown path {self.path}"})
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                payload = json.loads(self.rfile.read(length))
+                if not payload.get("jd_text") or not payload.get("resumes"):
+                    raise ValueError("jd_text and resumes are required")
+            except (ValueError, json.JSONDecodeError) as exc:
+                return self._send(400, {"error": str(exc)})
+            client_id = payload.pop("client_id", None) or self.headers.get("X-Client-Id", "")
+            try:
+                job = manager.submit(payload, client_id)
+            except QueueFull:
+                return self._send(429, {"error": "queue full, retry later"}, {"Retry-After": "5"})
+            self._send(202, {"job_id": job.job_id, "position": manager.queue.position(job)})
+
+        def do_GET(self):
+            url = urllib.parse.urlsplit(self.path)
+            parts = url.path.strip("/").split("/")
+            if parts == ["health"]:
+                return self._send(200, manager.health())
+            if parts[0] != "jobs":
+                return self._send(404, {"error": f"unknown path {self.path}"})
+            job = self._job(parts)
+            if job is None:
+                return
+            if len(parts) == 2:
+                return self._send(200, job.status(manager.queue.position(job)))
+            if len(parts) == 3 and parts[2] == "results":
+                if job.state not in ("running", "done"):
+                    return self._send(409, job.status(manager.queue.position(job)))
+                try:
+                    query = urllib.parse.parse_qs(url.query)
+                    offset = max(0, int(query.get("offset", ["0"])[0]))
+                    limit = int(query["limit"][0]) if "limit" in query else None
+                except ValueError:
+                    return self._send(400, {"error": "offset and limit must be integers"})
+                # Chunked NDJSON: clients can render candidates as lines arrive
+                self.send_response(200)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                for line in _result_lines(job, offset, limit):
+                    data = (json.dumps(line) + "\n").encode("utf-8")
+                    self.wfile.write(f"{len(data):x}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.write(b"0\r\n\r\n")
+                return
+            self._send(404, {"error": f"unknown path {self.path}"})
+
+        def do_DELETE(self):
+            parts = self.path.strip("/").split("/")
+            job = self._job(parts) if parts[0] == "jobs" else None
+            if job is None:
+                return
+            if manager.cancel(job):
+                return self._send(200, job.status(None))
+            self._send(409, {"error": f"job is {job.state}"})
+
+    return Handler
+
+
+def start_server(port: int = JOB_SERVER_PORT, manager: Optional[JobManager] = None, host: str = "127.0.0.1"):
+    """Start the HTTP front end in a background thread; returns (server, base_url)."""
+    manager = manager or JobManager()
+    server = ThreadingHTTPServer((host, port), make_handler(manager))
+    server.manager = manager  # type: ignore[attr-defined]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Local screening job server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=JOB_SERVER_PORT)
+    parser.add_argument("--workers", type=int, default=JOB_WORKERS)
+    parser.add_argument("--queue-depth", type=int, default=JOB_QUEUE_DEPTH)
+    parser.add_argument("--max-per-client", type=int, default=JOB_MAX_PER_CLIENT)
+    args = parser.parse_args(argv)
+
+    manager = JobManager(args.workers, args.queue_depth, args.max_per_client)
+    server, url = start_server(args.port, manager, args.host)
+    print(f"Job server at {url} ({args.workers} workers, queue depth {args.queue_depth})")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+        manager.close()
+
+
+if __name__ == "__main__":
+    # Run the package module, not __main__, so objects sent to worker
+    # processes pickle by their importable names
+    from .job_server import main as _main
+
+    _main()
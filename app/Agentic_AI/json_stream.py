@@ -0,0 +1,87 @@
+"""
+Incremental scanner for JSON streamed token by token from an LLM.
+
+Reports the string fields of every object as soon as each value's closing
+quote arrives, long before the document is complete and parseable:
+
+    scanner = JSONFieldScanner()
+    for text in chunks:
+        for fields in scanner.feed(text):
+            ...   # e.g. {"resume_id": "r1", "summary": "Strong match ..."}
+
+Each reported dict holds all string fields completed so far in one object
+(nested objects are reported on their own). Numbers, booleans, arrays and
+text outside the outermost braces (code fences, prose) are skipped; callers
+still parse and validate the full text once the stream ends.
+"""
+import json
+from typing import Dict, List, Optional
+
+
+class _Object:
+    __slots__ = ("fields", "key", "expect_key")
+
+    def __init__(self):
+        self.fields: Dict[str, str] = {}
+        self.key: Optional[str] = None
+        self.expect_key = True
+
+
+class JSONFieldScanner:
+    def __init__(self):
+        self._stack: List[Optional[_Object]] = []  # None marks an array
+        self._in_string = False
+        self._escape = False
+        self._is_key = False
+        self._buf: List[str] = []
+
+    def feed(self, text: str) -> List[Dict[str, str]]:
+        """Consume a chunk; returns a snapshot for each object that gained a string field."""
+        updates: List[Dict[str, str]] = []
+        for ch in text:
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._end_string(updates)
+                    continue
+                self._buf.append(ch)
+                continue
+
+            if not self._stack and ch not in "{[":
+                continue  # preamble / code fences before the document starts
+            top = self._stack[-1] if self._stack else None
+            if ch == "{":
+                self._stack.append(_Object())
+            elif ch == "[":
+                self._stack.append(None)
+            elif ch in "}]":
+                if self._stack:
+                    self._stack.pop()
+            elif ch == '"':
+                self._in_string = True
+                self._is_key = top is not None and top.expect_key
+                self._buf = []
+            elif ch == ":" and top is not None:
+                top.expect_key = False
+            elif ch == "," and top is not None:
+                top.expect_key = True
+                top.key = None
+        return updates
+
+    def _end_string(self, updates: List[Dict[str, str]]) -> None:
+        top = self._stack[-1] if self._stack else None
+        if top is None:
+            return  # string inside an array
+        try:
+            value = json.loads('"' + "".join(self._buf) + '"')
+        except ValueError:
+            value = "".join(self._buf)
+        if self._is_key:
+            top.key = value
+        elif top.key is not None:
+            top.fields[top.key] = value
+            updates.append(dict(top.fields))
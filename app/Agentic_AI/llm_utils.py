@@ -1,22 +1,89 @@
 import json
-from typing import Any, Dict, List
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional
 
-import jsonschema
-from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
+from .config import OPENAI_CHAT_MODEL, OPENAI_BASE_URL, BIAS_NOTES_TOKEN_BUDGET
+from .prompts import (
+    JD_PARSE_INSTRUCTIONS,
+    RATIONALE_INSTRUCTIONS,
+    BATCH_RATIONALE_INSTRUCTIONS,
+    BIAS_AUDIT_INSTRUCTIONS,
+)
+from .instrumentation import span
+from .scheduler import get_scheduler
+from .context_packing import fit_texts_to_budget
+from .json_stream import JSONFieldScanner
 
-from .config import OPENAI_CHAT_MODEL
-from .prompts import JD_PARSE_INSTRUCTIONS, RATIONALE_INSTRUCTIONS, BIAS_AUDIT_INSTRUCTIONS
+# langchain / jsonschema are imported on first use: they dominate cold-start
+# time and are not needed until the first LLM call.
+if TYPE_CHECKING:
+    from langchain_core.prompts import ChatPromptTemplate
+    from langchain_openai import ChatOpenAI
 
 
-def get_llm(temperature: float = 0.0) -> ChatOpenAI:
-    return ChatOpenAI(model=OPENAI_CHAT_MODEL, temperature=temperature)
+def _prompt_from_messages(messages) -> "ChatPromptTemplate":
+    from langchain_core.prompts import ChatPromptTemplate
 
+    return ChatPromptTemplate.from_messages(messages)
 
-def parse_json_from_llm(prompt: ChatPromptTemplate, llm: ChatOpenAI, input_data: Dict[str, Any]) -> Dict[str, Any]:
+
+def _validate(instance: Any, schema: Dict[str, Any]) -> None:
+    import jsonschema
+
+    jsonschema.validate(instance=instance, schema=schema)
+
+
+# Completion tokens reserved per chat call when budgeting tokens/minute
+EST_COMPLETION_TOKENS = 500
+
+
+@lru_cache(maxsize=4)
+def get_llm(temperature: float = 0.0) -> "ChatOpenAI":
+    from langchain_openai import ChatOpenAI
+
+    # One client (and connection pool) per temperature, reused across calls.
+    # Retries / backoff are owned by the shared scheduler, not the client
+    return ChatOpenAI(
+        model=OPENAI_CHAT_MODEL,
+        temperature=temperature,
+        max_retries=0,
+        openai_api_base=OPENAI_BASE_URL,
+    )
+
+
+def invoke_llm(prompt: "ChatPromptTemplate", llm: "ChatOpenAI", input_data: Dict[str, Any], span_name: str = "llm.chat"):
+    """
+    Invoke prompt | llm through the shared rate-limit scheduler, inside an
+    instrumentation span (wall time, tokens).
+    """
     chain = prompt | llm
-    resp = chain.invoke(input_data)
-    text = resp.content if hasattr(resp, "content") else str(resp)
+    est_tokens = sum(len(str(v)) for v in input_data.values()) // 4 + EST_COMPLETION_TOKENS
+    with span(span_name) as sp:
+        sp.items = 1
+        resp = get_scheduler("chat").call(lambda: chain.invoke(input_data), est_tokens=est_tokens)
+        sp.add_usage(resp)
+    return resp
+
+
+def stream_llm(
+    prompt: "ChatPromptTemplate",
+    llm: "ChatOpenAI",
+    input_data: Dict[str, Any],
+    span_name: str = "llm.chat",
+) -> Iterator[str]:
+    """Like invoke_llm, but yields the completion text piece by piece as it arrives."""
+    chain = prompt | llm
+    est_tokens = sum(len(str(v)) for v in input_data.values()) // 4 + EST_COMPLETION_TOKENS
+    with span(span_name) as sp:
+        sp.items = 1
+        for chunk in get_scheduler("chat").stream(lambda: chain.stream(input_data), est_tokens=est_tokens):
+            sp.add_usage(chunk)  # providers report usage on the last chunk
+            text = chunk.content if hasattr(chunk, "content") else str(chunk)
+            if text:
+                yield text
+
+
+def _json_from_text(text: str) -> Dict[str, Any]:
     # try direct json
     try:
         return json.loads(text)
@@ -29,15 +96,45 @@ def parse_json_from_llm(prompt: ChatPromptTemplate, llm: ChatOpenAI, input_data:
         return json.loads(m.group(1))
 
 
+def parse_json_from_llm(
+    prompt: "ChatPromptTemplate",
+    llm: "ChatOpenAI",
+    input_data: Dict[str, Any],
+    span_name: str = "llm.chat",
+) -> Dict[str, Any]:
+    resp = invoke_llm(prompt, llm, input_data, span_name=span_name)
+    return _json_from_text(resp.content if hasattr(resp, "content") else str(resp))
+
+
+def stream_json_from_llm(
+    prompt: "ChatPromptTemplate",
+    llm: "ChatOpenAI",
+    input_data: Dict[str, Any],
+    on_fields: Callable[[Dict[str, str]], None],
+    span_name: str = "llm.chat",
+) -> Dict[str, Any]:
+    """
+    Streamed parse_json_from_llm: `on_fields` gets each object's completed
+    string fields while tokens arrive; the full text is parsed at the end.
+    """
+    scanner = JSONFieldScanner()
+    pieces: List[str] = []
+    for text in stream_llm(prompt, llm, input_data, span_name=span_name):
+        pieces.append(text)
+        for fields in scanner.feed(text):
+            on_fields(fields)
+    return _json_from_text("".join(pieces))
+
+
 def jd_json_from_text(jd_text: str) -> Dict[str, Any]:
     llm = get_llm(temperature=0.0)
-    prompt = ChatPromptTemplate.from_messages(
+    prompt = _prompt_from_messages(
         [
             ("system", JD_PARSE_INSTRUCTIONS),
             ("user", "{jd_text}"),
         ]
     )
-    return parse_json_from_llm(prompt, llm, {"jd_text": jd_text})
+    return parse_json_from_llm(prompt, llm, {"jd_text": jd_text}, span_name="llm.jd_parse")
 
 
 RATIONALE_SCHEMA: Dict[str, Any] = {
@@ -57,35 +154,62 @@ RATIONALE_SCHEMA: Dict[str, Any] = {
             },
         },
         "confidence": {"type": "number", "minimum": 0.0, "maximum": 1.0},
-        "action": {"type": "string", "enum": ["Shortlist", "Review", "Escalate"]},
+        "action": {"type": "string", "enum": ["Shortlist", "Review", "Escalate", "Reject"]},
     },
     "required": ["summary", "evidence", "confidence", "action"],
 }
 
 
+# Rationale fields surfaced while the response is still streaming
+RATIONALE_PARTIAL_FIELDS = ("summary", "action")
+
+
+def _partial_rationales(
+    on_partial: Callable[[Optional[str], Dict[str, str]], None],
+) -> Callable[[Dict[str, str]], None]:
+    """Scanner callback: forwards (resume_id, summary/action) whenever those change."""
+    last: Dict[Optional[str], Dict[str, str]] = {}
+
+    def forward(fields: Dict[str, str]) -> None:
+        partial = {k: fields[k] for k in RATIONALE_PARTIAL_FIELDS if k in fields}
+        rid = fields.get("resume_id")
+        if partial and partial != last.get(rid):
+            last[rid] = partial
+            on_partial(rid, partial)
+
+    return forward
+
+
 def generate_rationale_llm(
     jd_json: Dict[str, Any],
     candidate_json: Dict[str, Any],
     evidence_snippets: List[Dict[str, str]],
+    on_partial: Optional[Callable[[Dict[str, str]], None]] = None,
 ) -> Dict[str, Any]:
+    """
+    With `on_partial`, the response is streamed and on_partial gets
+    {"summary": ..., "action": ...} as each completes; the schema check
+    still runs on the full response.
+    """
     llm = get_llm(temperature=0.0)
-    prompt = ChatPromptTemplate.from_messages(
+    prompt = _prompt_from_messages(
         [
             ("system", RATIONALE_INSTRUCTIONS),
             ("user", "JD_JSON:\n{jd_json}\n\nCANDIDATE_JSON:\n{candidate_json}\n\nEVIDENCE_SNIPPETS:\n{evidence}"),
         ]
     )
-    raw = parse_json_from_llm(
-        prompt,
-        llm,
-        {
-            "jd_json": json.dumps(jd_json),
-            "candidate_json": json.dumps(candidate_json),
-            "evidence": json.dumps(evidence_snippets),
-        },
-    )
+    data = {
+        "jd_json": json.dumps(jd_json),
+        "candidate_json": json.dumps(candidate_json),
+        "evidence": json.dumps(evidence_snippets),
+    }
+    if on_partial is None:
+        raw = parse_json_from_llm(prompt, llm, data, span_name="llm.rationale")
+    else:
+        forward = _partial_rationales(lambda _rid, fields: on_partial(fields))
+        raw = stream_json_from_llm(prompt, llm, data, forward, span_name="llm.rationale")
     try:
-        jsonschema.validate(instance=raw, schema=RATIONALE_SCHEMA)
+        _validate(raw, schema=RATIONALE_SCHEMA)
         return raw
     except Exception:
         # fallback safe structure
@@ -97,19 +221,96 @@ def generate_rationale_llm(
         }
 
 
-def generate_bias_notes_llm(jd_json: Dict[str, Any], resumes: List[str]) -> str:
-    llm = get_llm(temperature=0.2)
-    prompt = ChatPromptTemplate.from_messages(
+def generate_rationales_batch_llm(
+    jd_json: Dict[str, Any],
+    candidates: List[Dict[str, Any]],
+    evidence_by_id: Dict[str, List[Dict[str, str]]],
+    on_partial: Optional[Callable[[str, Dict[str, str]], None]] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Generate rationales for several candidates in one LLM call.
+
+    Returns {resume_id: rationale}. Elements that are missing or fail
+    RATIONALE_SCHEMA validation are retried one by one with
+    generate_rationale_llm; the rest of the batch is kept. With
+    `on_partial`, responses are streamed and on_partial(resume_id, fields)
+    gets each candidate's summary / action as soon as they are complete.
+    """
+
+    def single(c: Dict[str, Any]) -> Dict[str, Any]:
+        rid = c["resume_id"]
+        forward = None if on_partial is None else (lambda fields: on_partial(rid, fields))
+        return generate_rationale_llm(jd_json, c, evidence_by_id.get(rid, []), on_partial=forward)
+
+    if len(candidates) <= 1:
+        return {c["resume_id"]: single(c) for c in candidates}
+
+    llm = get_llm(temperature=0.0)
+    prompt = _prompt_from_messages(
+        [
+            ("system", BATCH_RATIONALE_INSTRUCTIONS),
+            ("user", "JD_JSON:\n{jd_json}\n\nCANDIDATES_JSON:\n{candidates_json}"),
+        ]
+    )
+    payload = [
+        {**c, "evidence": evidence_by_id.get(c["resume_id"], [])} for c in candidates
+    ]
+    expected = {c["resume_id"] for c in candidates}
+    data = {"jd_json": json.dumps(jd_json), "candidates_json": json.dumps(payload)}
+    try:
+        if on_partial is None:
+            raw = parse_json_from_llm(prompt, llm, data, span_name="llm.rationale_batch")
+        else:
+            forward = _partial_rationales(lambda rid, fields: rid in expected and on_partial(rid, fields))
+            raw = stream_json_from_llm(prompt, llm, data, forward, span_name="llm.rationale_batch")
+        items = raw.get("rationales", []) if isinstance(raw, dict) else []
+    except Exception:
+        items = []
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        rid = item.get("resume_id")
+        rationale = {k: v for k, v in item.items() if k != "resume_id"}
+        if rid not in expected or rid in results:
+            continue
+        try:
+            _validate(rationale, schema=RATIONALE_SCHEMA)
+        except Exception:
+            continue
+        results[rid] = rationale
+
+    # Retry only the candidates whose entries were missing or invalid
+    for c in candidates:
+        rid = c["resume_id"]
+        if rid not in results:
+            results[rid] = single(c)
+    return results
+
+
+def _bias_notes_request(jd_json: Dict[str, Any], resumes: List[str]):
+    prompt = _prompt_from_messages(
         [
             ("system", BIAS_AUDIT_INSTRUCTIONS),
             ("user", "JD_JSON:\n{jd_json}\n\nRESUME_SNIPPETS:\n{resumes}"),
         ]
     )
-    chain = prompt | llm
-    resp = chain.invoke(
-        {
-            "jd_json": json.dumps(jd_json),
-            "resumes": json.dumps(resumes)[:6000],
-        }
-    )
+    data = {
+        "jd_json": json.dumps(jd_json),
+        # Truncate each snippet (not the encoded JSON) to stay within budget
+        "resumes": json.dumps(fit_texts_to_budget(resumes, BIAS_NOTES_TOKEN_BUDGET)),
+    }
+    return prompt, get_llm(temperature=0.2), data
+
+
+def generate_bias_notes_llm(jd_json: Dict[str, Any], resumes: List[str]) -> str:
+    prompt, llm, data = _bias_notes_request(jd_json, resumes)
+    resp = invoke_llm(prompt, llm, data, span_name="llm.bias_notes")
     return resp.content if hasattr(resp, "content") else str(resp)
+
+
+def stream_bias_notes_llm(jd_json: Dict[str, Any], resumes: List[str]) -> Iterator[str]:
+    """generate_bias_notes_llm, yielding the narrative token by token (for st.write_stream)."""
+    prompt, llm, data = _bias_notes_request(jd_json, resumes)
+    yield from stream_llm(prompt, llm, data, span_name="llm.bias_notes")
@@ -0,0 +1,124 @@
+"""
+Multi-requisition screening: one resume pool against many JDs in one pass.
+
+Resume features come from the feature store and resumes are embedded once,
+all JDs are embedded in a single batch, semantic scores for every
+(resume, JD) pair come from one matrix multiply, and skill matching is
+vectorized over a resume × skill-token incidence matrix.
+"""
+from typing import Dict, List
+
+import numpy as np
+
+from .schemas import JD, ResumeParsed, CandidateResult, MultiJDResult
+from .embedding import embed_texts
+from .feature_store import resume_features
+from .scoring import (
+    _composite,
+    _experience_score,
+    _outcome_score,
+    _overlap_passes,
+    _risk_from_counts,
+    _tokenize,
+    build_scores,
+    embed_resumes,
+    jd_embed_text,
+    sort_candidates,
+)
+
+
+def _skill_hit_matrix(skills: List[str], incidence: np.ndarray, vocab: Dict[str, int]) -> np.ndarray:
+    """
+    Boolean (n_resumes × n_skills) matrix: does each resume match each skill?
+    Applies the same token-overlap rule as `_skill_matches`, column-wise.
+    """
+    hits = np.zeros((incidence.shape[0], len(skills)), dtype=bool)
+    for j, skill in enumerate(skills):
+        skill_tokens = _tokenize(skill)
+        if not skill_tokens:
+            continue
+        cols = [vocab[t] for t in skill_tokens]
+        overlap = incidence[:, cols].sum(axis=1)
+        hits[:, j] = (overlap > 0) & _overlap_passes(overlap, len(skill_tokens))
+    return hits
+
+
+def rank_candidates_multi(
+    jds: List[JD],
+    resumes: List[ResumeParsed],
+    weights: Dict[str, float],
+    blind_mode: bool = False,
+) -> MultiJDResult:
+    """
+    Score every resume against every JD and return a ranked list per JD
+    plus the best-fit JD for each candidate.
+    """
+    if not jds or not resumes:
+        return MultiJDResult(jds=jds, rankings=[[] for _ in jds], best_fit={})
+
+    # --- Semantic matrix: one embedding batch per side, one matmul ---
+    jd_embeds = embed_texts([jd_embed_text(jd) for jd in jds])
+    resume_embeds = embed_resumes(resumes, blind_mode=blind_mode)
+    semantic = resume_embeds @ jd_embeds.T  # (n_resumes, n_jds)
+
+    # --- JD-independent resume features (feature store) ---
+    features = resume_features(resumes)
+    texts_lower = [f.text_lower for f in features]
+    years = np.array([f.years for f in features], dtype="float32")
+    risk = np.array([_risk_from_counts(f.buzzword_count, f.has_metrics) for f in features], dtype="float32")
+
+    # Resume × token incidence over the union of all JD skill tokens
+    vocab: Dict[str, int] = {}
+    for jd in jds:
+        for skill in jd.must_have_skills + jd.nice_to_have_skills:
+            for t in _tokenize(skill):
+                vocab.setdefault(t, len(vocab))
+    incidence = np.zeros((len(resumes), len(vocab)), dtype=np.int32)
+    for i, f in enumerate(features):
+        cols = [vocab[t] for t in f.tokens if t in vocab]
+        incidence[i, cols] = 1
+
+    rankings: List[List[CandidateResult]] = []
+    composites = np.zeros((len(resumes), len(jds)), dtype="float32")
+    for j, jd in enumerate(jds):
+        must = [s.strip() for s in jd.must_have_skills if s.strip()]
+        nice = [s.strip() for s in jd.nice_to_have_skills if s.strip()]
+        must_hits = _skill_hit_matrix(must, incidence, vocab)
+        nice_hits = _skill_hit_matrix(nice, incidence, vocab)
+
+        skill = must_hits.sum(axis=1) / max(len(must), 1)
+        if jd.min_years_experience > 0:
+            experience = np.minimum(years / jd.min_years_experience, 1.0)
+        else:
+            experience = np.full(len(resumes), 0.5, dtype="float32")
+        outcome = np.array([_outcome_score(jd, t) for t in texts_lower], dtype="float32")
+        composite = _composite(weights, skill, semantic[:, j], experience, outcome, risk)
+        composites[:, j] = composite
+
+        results: List[CandidateResult] = []
+        for i, r in enumerate(resumes):
+            scores = build_scores(
+                skill[i],
+                semantic[i, j],
+                experience[i],
+                outcome[i],
+                risk[i],
+                composite[i],
+                [s for k, s in enumerate(must) if must_hits[i, k]],
+                [s for k, s in enumerate(must) if not must_hits[i, k]],
+                [s for k, s in enumerate(nice) if nice_hits[i, k]],
+                years[i],
+            )
+            results.append(CandidateResult(resume=r, scores=scores, jd=jd))
+
+        ranked = sort_candidates(results)
+        for rank, c in enumerate(ranked):
+            c.rank_full = rank + 1
+        rankings.append(ranked)
+
+    best = composites.argmax(axis=1)
+    best_fit = {
+        r.resume_id: (int(best[i]), float(composites[i, best[i]]))
+        for i, r in enumerate(resumes)
+    }
+    return MultiJDResult(jds=jds, rankings=rankings, best_fit=best_fit)
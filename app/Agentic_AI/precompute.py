@@ -0,0 +1,131 @@
+"""
+Speculative precompute for the UI.
+
+Parsing, feature extraction and embedding of resumes depend neither on the
+JD nor on the weights, so they start as soon as files are uploaded. The JD
+is parsed (and embedded) once its text has been left alone for
+PRECOMPUTE_JD_DEBOUNCE_S. Results go into the session's ScoringCache and
+the feature / embedding stores, which the graph reads, so a run is mostly
+scoring and rationales.
+
+    pre = Precomputer(cache)
+    pre.submit_uploads(uploads)   # every rerun; files already seen are skipped
+    pre.submit_jd(jd_text)        # every rerun; debounced
+    pre.wait()                    # before invoking the graph
+
+Background work is best effort: if it fails, the run simply does it again.
+"""
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from functools import lru_cache
+from typing import Dict, List, Optional, Set, Tuple
+
+from .blob_store import content_hash
+from .config import PRECOMPUTE_JD_DEBOUNCE_S, PRECOMPUTE_WORKERS
+from .feature_store import resume_features, text_key
+from .incremental import ScoringCache
+from .jd_parser import parse_jd
+from .resume_parser import parse_resume_bytes
+
+
+@lru_cache(maxsize=1)
+def _executor() -> ThreadPoolExecutor:
+    # Shared by every session, so concurrent users can't multiply background threads
+    return ThreadPoolExecutor(max_workers=PRECOMPUTE_WORKERS, thread_name_prefix="precompute")
+
+
+class Precomputer:
+    def __init__(self, cache: ScoringCache, debounce_s: float = PRECOMPUTE_JD_DEBOUNCE_S):
+        self.cache = cache
+        self.debounce_s = debounce_s
+        self._lock = threading.Lock()
+        self._futures: List[Future] = []
+        self._submitted: Set[str] = set()  # upload keys handed to a worker
+        self._ready: Set[str] = set()  # upload keys parsed + embedded
+        self._current: Set[str] = set()  # keys in the latest submit_uploads call
+        self._jd_text: Optional[str] = None
+        self._jd_ready: Optional[str] = None
+        self._timer: Optional[threading.Timer] = None
+
+    # --- resumes ---
+
+    def submit_uploads(self, uploads: List[Tuple[str, bytes]]) -> None:
+        """Parse, featurize and embed (full + blind) the uploads not seen before."""
+        with self._lock:
+            new = []
+            self._current = set()
+            for name, data in uploads:
+                key = f"{content_hash(data)}:{name}"
+                self._current.add(key)
+                if key not in self._submitted:
+                    self._submitted.add(key)
+                    new.append((key, name, data))
+            if new:
+                self._futures.append(_executor().submit(self._warm_resumes, new))
+
+    def _warm_resumes(self, uploads: List[Tuple[str, str, bytes]]) -> None:
+        resumes = [self.cache.parse_resume(name, data, parse_resume_bytes) for _, name, data in uploads]
+        keys = [text_key(r.raw_text) for r in resumes]
+        resume_features(resumes)
+        # Held for the whole batch so a run that starts meanwhile waits for these
+        # vectors instead of embedding the same resumes again
+        with self.cache._lock:
+            for blind_mode in (False, True):
+                self.cache.resume_embeds(resumes, keys, blind_mode)
+        with self._lock:
+            self._ready.update(key for key, _, _ in uploads)
+
+    # --- JD ---
+
+    def submit_jd(self, jd_text: str) -> None:
+        """(Re)start the debounce timer; the JD is parsed once the text stops changing."""
+        with self._lock:
+            if jd_text == self._jd_text:
+                return
+            self._jd_text = jd_text
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not jd_text.strip():
+                return
+            self._timer = threading.Timer(self.debounce_s, self._fire_jd, args=(jd_text,))
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _fire_jd(self, jd_text: str) -> None:
+        with self._lock:
+            if jd_text != self._jd_text:
+                return  # edited again since the timer started
+            self._timer = None
+            self._futures.append(_executor().submit(self._warm_jd, jd_text))
+
+    def _warm_jd(self, jd_text: str) -> None:
+        self.cache.warm_jd(jd_text, parse_jd)
+        with self._lock:
+            self._jd_ready = jd_text
+
+    # --- run side ---
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """
+        Let in-flight work finish before a run so nothing is computed twice. A
+        JD still inside its debounce window is left to the run to parse.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+                self._jd_text = None  # re-armed by the next submit_jd
+            futures, self._futures = self._futures, []
+        wait_futures(futures, timeout=timeout)
+
+    def status(self) -> Dict[str, object]:
+        with self._lock:
+            self._futures = [f for f in self._futures if not f.done()]
+            return {
+                "resumes_ready": len(self._current & self._ready),
+                "resumes_total": len(self._current),
+                "jd_ready": self._jd_ready is not None and self._jd_ready == self._jd_text,
+                "busy": bool(self._futures) or self._timer is not None,
+            }
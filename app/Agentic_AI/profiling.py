@@ -0,0 +1,165 @@
+"""
+Opt-in CPU + memory profiling of a single screening run.
+
+Enable with PROFILE_RUNS=1 (or the sidebar toggle). Each graph node is run
+under cProfile and tracemalloc; artifacts are written to data/profiles/<run_id>/:
+
+- cpu.prof          cProfile stats (open with snakeviz / pstats)
+- cpu_top.txt       top functions by cumulative time
+- memory.json       peak traced memory of this run and top allocation sites per
+                    node, plus the process-lifetime peak RSS
+
+Each run has its own tracker, so concurrent profiled runs (two UI sessions,
+job server threads) never record each other's nodes. tracemalloc is process
+wide, though: only one run at a time traces memory, and a run that starts
+while another holds it is profiled for CPU only (memory.json says so).
+"""
+import cProfile
+import io
+import json
+import pstats
+import sys
+import threading
+import tracemalloc
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import PROFILE_DIR, PROFILE_TOP_N
+
+# The profiled run's tracker, in the contexts its graph nodes run in
+_TRACKER: ContextVar[Optional["NodeAllocationTracker"]] = ContextVar("profiling_tracker", default=None)
+# Held by the run that owns tracemalloc
+_TRACEMALLOC_LOCK = threading.Lock()
+
+
+def process_peak_rss_mb() -> Optional[float]:
+    """
+    Peak RSS of the whole process so far, not of one run: the OS never lowers
+    it, so in a long-lived app it reflects the largest run since start-up.
+    """
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+class NodeAllocationTracker:
+    """
+    Per-node profiling: diffs tracemalloc snapshots around each graph node
+    and runs a cProfile profiler inside the node. LangGraph executes nodes
+    on worker threads, and cProfile only sees the thread it was enabled on,
+    so profiling happens in the node itself and the stats are merged later.
+    With `memory=False` only the CPU profile is taken.
+    """
+
+    def __init__(self, top_n: int = PROFILE_TOP_N, memory: bool = True):
+        self.top_n = top_n
+        self.memory = memory
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self.profiles: List[cProfile.Profile] = []
+        self._open: Dict[str, Tuple[Optional[tracemalloc.Snapshot], int, cProfile.Profile]] = {}
+
+    def start(self, name: str) -> None:
+        profiler = cProfile.Profile()
+        if self.memory:
+            tracemalloc.reset_peak()
+            self._open[name] = (tracemalloc.take_snapshot(), tracemalloc.get_traced_memory()[0], profiler)
+        else:
+            self._open[name] = (None, 0, profiler)
+        profiler.enable()
+
+    def end(self, name: str) -> None:
+        if name not in self._open:
+            return
+        before, current_before, profiler = self._open.pop(name)
+        profiler.disable()
+        self.profiles.append(profiler)
+        if before is None:
+            return
+        current, peak = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+        stats = after.compare_to(before, "lineno")
+        self.nodes[name] = {
+            "net_mb": (current - current_before) / (1024 * 1024),
+            "peak_mb": peak / (1024 * 1024),
+            "top_allocations": [
+                {
+                    "site": str(s.traceback),
+                    "size_diff_kb": s.size_diff / 1024,
+                    "count_diff": s.count_diff,
+                }
+                for s in stats[: self.top_n]
+            ],
+        }
+
+
+def node_started(name: str) -> None:
+    tracker = _TRACKER.get()
+    if tracker is not None:
+        tracker.start(name)
+
+
+def node_finished(name: str) -> None:
+    tracker = _TRACKER.get()
+    if tracker is not None:
+        tracker.end(name)
+
+
+def profile_invoke(graph, state: Dict[str, Any], run_id: str, root: Path = PROFILE_DIR):
+    """
+    Run graph.invoke(state) under cProfile + tracemalloc and save artifacts.
+    Memory is only traced if no other run (or tool) is tracing already.
+    Returns (final_state, artifact_dir).
+    """
+    out_dir = Path(root) / run_id
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    memory = _TRACEMALLOC_LOCK.acquire(blocking=False)
+    if memory and tracemalloc.is_tracing():
+        _TRACEMALLOC_LOCK.release()  # started outside this module
+        memory = False
+    tracker = NodeAllocationTracker(memory=memory)
+    token = _TRACKER.set(tracker)
+    peak_traced = 0
+    try:
+        if memory:
+            tracemalloc.start(25)
+        final_state = graph.invoke(state)
+        if memory:
+            _, peak_traced = tracemalloc.get_traced_memory()
+    finally:
+        _TRACKER.reset(token)
+        if memory:
+            tracemalloc.stop()
+            _TRACEMALLOC_LOCK.release()
+
+    if tracker.profiles:
+        stats = pstats.Stats(*tracker.profiles, stream=io.StringIO())
+        stats.dump_stats(str(out_dir / "cpu.prof"))
+        buf = io.StringIO()
+        stats.stream = buf
+        stats.sort_stats("cumulative").print_stats(60)
+        (out_dir / "cpu_top.txt").write_text(buf.getvalue(), encoding="utf-8")
+
+    # Node trackers reset the tracemalloc peak, so take the max over nodes too
+    peak_traced_mb = max(
+        [peak_traced / (1024 * 1024)] + [n["peak_mb"] for n in tracker.nodes.values()]
+    )
+    report = {
+        "run_id": run_id,
+        "process_peak_rss_mb": process_peak_rss_mb(),
+        "peak_traced_mb": peak_traced_mb if memory else None,
+        "nodes": tracker.nodes,
+    }
+    if not memory:
+        report["memory_skipped"] = "tracemalloc was in use by another profiled run"
+    (out_dir / "memory.json").write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return final_state, out_dir
+
+
+def list_artifacts(out_dir: Path) -> List[Path]:
+    return sorted(p for p in Path(out_dir).iterdir() if p.is_file())
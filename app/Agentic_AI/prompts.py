@@ -28,7 +28,7 @@ Return ONLY JSON with keys:
   - source: which resume section it came from
   - score_dimension: one of SkillScore, ExperienceScore, OutcomeScore, RiskScore
 - confidence (number 0.0–1.0): how confident you are in the recommendation.
-- action (string): one of "Shortlist", "Review", "Escalate".
+- action (string): one of "Shortlist", "Review", "Escalate", "Reject".
 """
 
 BIAS_AUDIT_INSTRUCTIONS = """
@@ -48,3 +48,25 @@ Your task:
 
 Return a short, readable narrative. Do NOT rank candidates.
 """
+
+BATCH_RATIONALE_INSTRUCTIONS = """
+You are a senior recruiter assistant reviewing a shortlist.
+
+You receive:
+- JD_JSON: a structured json for the job description.
+- CANDIDATES_JSON: an array; each element has resume_id, name, scores and
+  evidence (notable text snippets from that candidate's resume).
+
+Return ONLY JSON of the form {{"rationales": [...]}} with exactly one element
+per candidate, each with keys:
+- resume_id (string): copied unchanged from the input.
+- summary (string): 2–4 sentences summarizing fit.
+- evidence (array of {{text, source, score_dimension}}):
+  - text: short resume quote supporting a score (from that candidate only)
+  - source: which resume section it came from
+  - score_dimension: one of SkillScore, ExperienceScore, OutcomeScore, RiskScore
+- confidence (number 0.0–1.0): how confident you are in the recommendation.
+- action (string): one of "Shortlist", "Review", "Escalate", "Reject".
+
+Judge each candidate independently; do not compare or rank them.
+"""
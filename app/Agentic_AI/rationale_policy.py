@@ -0,0 +1,126 @@
+"""
+Score-gated rationales: decide which candidates are worth an LLM call.
+
+Every ranked candidate gets a rationale. Clear-cut cases get a
+deterministic template built from their scores and resume sections:
+
+- shortlist: composite >= shortlist_score, must-have coverage >=
+  shortlist_coverage, and at least min_gap ahead of the next candidate
+- reject:    composite < reject_score or coverage < reject_coverage
+
+Everyone else is borderline. Borderline candidates go to the LLM in rank
+order until the per-run budget is spent; the rest get a "Review" template.
+"""
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import (
+    RATIONALE_LLM_BUDGET,
+    RATIONALE_MIN_GAP,
+    RATIONALE_REJECT_COVERAGE,
+    RATIONALE_REJECT_SCORE,
+    RATIONALE_SHORTLIST_COVERAGE,
+    RATIONALE_SHORTLIST_SCORE,
+)
+from .schemas import JD, CandidateResult
+
+SHORTLIST, REJECT, BORDERLINE = "shortlist", "reject", "borderline"
+
+# Resume sections quoted as template evidence, and the score they support
+_EVIDENCE_SECTIONS = [("skills", "SkillScore"), ("experience", "ExperienceScore"), ("summary", "OutcomeScore")]
+
+
+@dataclass
+class RationalePolicy:
+    shortlist_score: float = RATIONALE_SHORTLIST_SCORE
+    reject_score: float = RATIONALE_REJECT_SCORE
+    min_gap: float = RATIONALE_MIN_GAP
+    shortlist_coverage: float = RATIONALE_SHORTLIST_COVERAGE
+    reject_coverage: float = RATIONALE_REJECT_COVERAGE
+    llm_budget: int = RATIONALE_LLM_BUDGET
+
+    def classify(self, c: CandidateResult, next_score: Optional[float]) -> str:
+        score = c.scores.composite_score
+        coverage = must_have_coverage(c)
+        if score < self.reject_score or coverage < self.reject_coverage:
+            return REJECT
+        gap = score - next_score if next_score is not None else float("inf")
+        if score >= self.shortlist_score and coverage >= self.shortlist_coverage and gap >= self.min_gap:
+            return SHORTLIST
+        return BORDERLINE
+
+    def plan(self, ranked: List[CandidateResult]) -> Tuple[List[CandidateResult], Dict[str, str]]:
+        """
+        (candidates for the LLM, {resume_id: decision} for everyone else),
+        where decision is shortlist / reject / borderline (over budget).
+        """
+        to_llm: List[CandidateResult] = []
+        templated: Dict[str, str] = {}
+        for i, c in enumerate(ranked):
+            next_score = ranked[i + 1].scores.composite_score if i + 1 < len(ranked) else None
+            decision = self.classify(c, next_score)
+            if decision == BORDERLINE and len(to_llm) < self.llm_budget:
+                to_llm.append(c)
+            else:
+                templated[c.resume.resume_id] = decision
+        return to_llm, templated
+
+
+def must_have_coverage(c: CandidateResult) -> float:
+    hits = getattr(c.scores, "must_have_hits", [])
+    total = len(hits) + len(getattr(c.scores, "must_have_miss", []))
+    return len(hits) / total if total else 1.0
+
+
+def _skill_line(text: str, skill: str, max_chars: int = 200) -> Optional[str]:
+    """First resume line mentioning `skill`, as a short quote."""
+    pattern = re.compile(re.escape(skill), re.IGNORECASE)
+    for line in text.splitlines():
+        if pattern.search(line):
+            return line.strip()[:max_chars]
+    return None
+
+
+def _evidence(c: CandidateResult, limit: int = 3) -> List[Dict[str, str]]:
+    evidence: List[Dict[str, str]] = []
+    for skill in getattr(c.scores, "must_have_hits", [])[:2]:
+        line = _skill_line(c.resume.raw_text, skill)
+        if line:
+            evidence.append({"text": line, "source": "resume", "score_dimension": "SkillScore"})
+    for section, dimension in _EVIDENCE_SECTIONS:
+        if len(evidence) >= limit:
+            break
+        text = c.resume.sections.get(section, "").strip()
+        if text:
+            evidence.append({"text": text[:200], "source": section, "score_dimension": dimension})
+    return evidence[:limit]
+
+
+def template_rationale(c: CandidateResult, jd: JD, decision: str) -> Dict[str, Any]:
+    """Deterministic rationale from scores + resume sections (no LLM)."""
+    s = c.scores
+    hits = getattr(s, "must_have_hits", [])
+    miss = getattr(s, "must_have_miss", [])
+    years = getattr(s, "years_experience", 0.0)
+
+    parts = [f"Composite score {s.composite_score:.2f} (rank {c.rank_full})."]
+    if hits or miss:
+        parts.append(f"Meets {len(hits)} of {len(hits) + len(miss)} must-have skills.")
+    if miss:
+        parts.append("Missing: " + ", ".join(miss[:5]) + ".")
+    if jd.min_years_experience:
+        parts.append(f"About {years:.0f} years of experience vs. {jd.min_years_experience:g}+ required.")
+    if decision == SHORTLIST:
+        head, action, confidence = "Clear match on skills and overall fit.", "Shortlist", 0.8
+    elif decision == REJECT:
+        head, action, confidence = "Falls well short of the role's requirements.", "Reject", 0.8
+    else:
+        head, action, confidence = "Borderline; needs a recruiter's judgement.", "Review", 0.4
+    return {
+        "summary": " ".join([head] + parts),
+        "evidence": _evidence(c),
+        "confidence": confidence,
+        "action": action,
+        "generated_by": "template",
+    }
@@ -1,5 +1,6 @@
 import io
 from datetime import datetime
+from functools import lru_cache
 from typing import List
 
 from reportlab.lib.pagesizes import A4
@@ -16,16 +17,21 @@ from reportlab.platypus import (
 from .schemas import CandidateResult, JD
 
 
-def _heading(text: str) -> Paragraph:
+@lru_cache(maxsize=1)
+def _styles():
+    # Building the sample stylesheet is costly; share one per process
     styles = getSampleStyleSheet()
-    style = styles["Heading3"]
+    styles["BodyText"].leading = 14
+    return styles
+
+
+def _heading(text: str) -> Paragraph:
+    style = _styles()["Heading3"]
     return Paragraph(text, style)
 
 
 def _body(text: str) -> Paragraph:
-    styles = getSampleStyleSheet()
-    style = styles["BodyText"]
-    style.leading = 14
+    style = _styles()["BodyText"]
     return Paragraph(text.replace("\n", "<br/>"), style)
 
 
@@ -51,7 +57,7 @@ def build_candidate_report_pdf(
     story: List = []
 
     # ---- Title ----
-    styles = getSampleStyleSheet()
+    styles = _styles()
     title_style = styles["Title"]
     title = Paragraph(f"Candidate Report: {candidate.resume.name}", title_style)
     story.append(title)
@@ -0,0 +1,98 @@
+"""
+Columnar results table for a run.
+
+One Arrow table, built column by column from the ranked candidates (no
+per-row dicts), in rank order. The UI dataframe and charts, the run log and
+the Parquet export all read it:
+
+    table = results_table(full_results)
+    df = to_frame(table)                  # Arrow-backed pandas, no copy
+    write_parquet(table, "results.parquet")
+
+Columns: ids and ranks, one float64 column per score, must-have counts and
+coverage, the matched / missing must-haves as list<string>, and the
+recommended action with who wrote the rationale (llm / template).
+"""
+import io
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, List, Union
+
+import numpy as np
+
+from .schemas import CandidateResult, CandidateScores
+
+if TYPE_CHECKING:
+    import pandas as pd
+    import pyarrow as pa
+
+SCORE_COLUMNS = [
+    ("CompositeScore", lambda s: s.composite_score),
+    ("JDMatchScore", lambda s: getattr(s, "jd_match_score", 0.0)),
+    ("SkillScore", lambda s: s.skill_score),
+    ("SemanticScore", lambda s: s.semantic_score),
+    ("ExperienceScore", lambda s: s.experience_score),
+    ("OutcomeScore", lambda s: s.outcome_score),
+    ("RiskScore", lambda s: s.risk_score),
+    ("YearsExp", lambda s: getattr(s, "years_experience", 0.0)),
+]
+
+
+def _floats(scores: List[CandidateScores], get: Callable[[CandidateScores], float]) -> np.ndarray:
+    return np.fromiter((get(s) for s in scores), dtype="float64", count=len(scores))
+
+
+def results_table(results: List[CandidateResult]) -> "pa.Table":
+    import pyarrow as pa  # imported on first use, like the other heavy dependencies
+    import pyarrow.compute as pc
+
+    n = len(results)
+    scores = [c.scores for c in results]
+    rationales = [c.rationale or {} for c in results]
+    hits = [getattr(s, "must_have_hits", []) for s in scores]
+    miss = [getattr(s, "must_have_miss", []) for s in scores]
+    met = np.fromiter(map(len, hits), dtype="int32", count=n)
+    total = met + np.fromiter(map(len, miss), dtype="int32", count=n)
+    rank_full = pa.array([c.rank_full for c in results], pa.int32())
+    rank_blind = pa.array([c.rank_blind for c in results], pa.int32())
+
+    columns = {
+        "resume_id": pa.array([c.resume.resume_id for c in results], pa.string()),
+        "name": pa.array([c.resume.name for c in results], pa.string()),
+        "content_hash": pa.array([c.resume.content_hash for c in results], pa.string()),  # blob in UPLOAD_DIR
+        "rank_full": rank_full,
+        "rank_blind": rank_blind,
+        "rank_delta": pc.subtract(rank_blind, rank_full),  # null when either rank is missing
+        **{name: _floats(scores, get) for name, get in SCORE_COLUMNS},
+        "MustHaveMet": met,
+        "MustHaveTotal": total,
+        "MustHaveCoverage": met / np.maximum(total, 1),
+        "must_have_hits": pa.array(hits, pa.list_(pa.string())),
+        "must_have_miss": pa.array(miss, pa.list_(pa.string())),
+        "action": pa.array([r.get("action") for r in rationales], pa.string()),
+        "rationale_by": pa.array([r.get("generated_by") for r in rationales], pa.string()),
+    }
+    return pa.table(columns)
+
+
+def to_frame(table: "pa.Table") -> "pd.DataFrame":
+    """pandas view backed by the Arrow buffers (ArrowDtype columns)."""
+    import pandas as pd
+
+    return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def write_parquet(table: "pa.Table", path: Union[str, Path]) -> Path:
+    import pyarrow.parquet as pq
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(table, path, compression="zstd")
+    return path
+
+
+def parquet_bytes(table: "pa.Table") -> bytes:
+    import pyarrow.parquet as pq
+
+    buf = io.BytesIO()
+    pq.write_table(table, buf, compression="zstd")
+    return buf.getvalue()
@@ -1,35 +1,42 @@
 from pathlib import Path
-from typing import Dict, Optional
+from typing import BinaryIO, Dict, Optional
+import io
 import uuid
 import re
 
-import pdfplumber
-import docx2txt
-
 from .schemas import ResumeParsed
+from .instrumentation import span
+from .blob_store import content_hash
 
 EMAIL_RE = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
 PHONE_RE = re.compile(r"\+?\d[\d\s\-]{8,}")
+# Section headings we look for (also used by scoring and evidence packing)
+SECTION_MARKERS = ["summary", "skills", "experience", "education", "projects"]
+
 
+# pdfplumber / docx2txt are imported per format on first use (cold start).
+# Both accept a path or a binary file object, so uploads never touch disk.
+def _extract_text_from_pdf(source: BinaryIO) -> str:
+    import pdfplumber
 
-def _extract_text_from_pdf(path: Path) -> str:
     text = ""
-    with pdfplumber.open(path) as pdf:
+    with pdfplumber.open(source) as pdf:
         for page in pdf.pages:
             t = page.extract_text() or ""
             text += t + "\n"
     return text
 
 
-def _extract_text_from_docx(path: Path) -> str:
-    return docx2txt.process(str(path)) or ""
+def _extract_text_from_docx(source: BinaryIO) -> str:
+    import docx2txt
+
+    return docx2txt.process(source) or ""
 
 
 def _detect_sections(text: str) -> Dict[str, str]:
     lower = text.lower()
     sections = {"raw": text}
-    markers = ["summary", "skills", "experience", "education", "projects"]
-    for m in markers:
+    for m in SECTION_MARKERS:
         idx = lower.find(m)
         if idx != -1:
             sections[m] = text[idx: idx + 2000]
@@ -55,13 +62,20 @@ def _extract_phone(text: str) -> Optional[str]:
 
 
 def parse_resume(file_path: str) -> ResumeParsed:
-    p = Path(file_path)
-    if p.suffix.lower() == ".pdf":
-        text = _extract_text_from_pdf(p)
-    elif p.suffix.lower() in [".docx", ".doc"]:
-        text = _extract_text_from_docx(p)
-    else:
-        text = p.read_text(encoding="utf-8", errors="ignore")
+    return parse_resume_bytes(Path(file_path).read_bytes(), str(file_path))
+
+
+def parse_resume_bytes(data: bytes, filename: str) -> ResumeParsed:
+    """Parse an uploaded resume from memory; the suffix of `filename` picks the extractor."""
+    suffix = Path(filename).suffix.lower()
+    with span(f"extract{suffix or '.txt'}") as sp:
+        sp.items = 1
+        if suffix == ".pdf":
+            text = _extract_text_from_pdf(io.BytesIO(data))
+        elif suffix in [".docx", ".doc"]:
+            text = _extract_text_from_docx(io.BytesIO(data))
+        else:
+            text = data.decode("utf-8", errors="ignore")
 
     sections = _detect_sections(text)
     name = _extract_name(text)
@@ -75,4 +89,5 @@ def parse_resume(file_path: str) -> ResumeParsed:
         phone=phone,
         raw_text=text,
         sections=sections,
+        content_hash=content_hash(data),
     )
@@ -0,0 +1,295 @@
+"""
+Rate-limit-aware scheduler shared by all chat and embedding calls.
+
+- Token buckets for requests/minute and tokens/minute per provider.
+- Adaptive concurrency (AIMD): halve on 429s or very slow responses,
+  grow by one after a window of healthy calls.
+- Retries with jittered exponential backoff (honouring Retry-After).
+- Priorities: interactive (UI) calls are admitted before batch jobs.
+
+Usage:
+
+    resp = get_scheduler("chat").call(lambda: chain.invoke(data), est_tokens=1200)
+
+    with priority(BATCH):
+        graph.invoke(state)      # every LLM/embedding call inside is batch priority
+"""
+import heapq
+import itertools
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from .config import (
+    EMBED_MAX_CONCURRENCY,
+    EMBED_RPM,
+    EMBED_TPM,
+    LLM_MAX_CONCURRENCY,
+    LLM_MAX_RETRIES,
+    LLM_RPM,
+    LLM_TARGET_LATENCY_S,
+    LLM_TPM,
+)
+
+INTERACTIVE = 0
+BATCH = 10
+
+_PRIORITY: ContextVar[int] = ContextVar("scheduler_priority", default=INTERACTIVE)
+
+
+@contextmanager
+def priority(level: int) -> Iterator[None]:
+    """Run calls made inside this block (and in copied contexts) at `level`."""
+    token = _PRIORITY.set(level)
+    try:
+        yield
+    finally:
+        _PRIORITY.reset(token)
+
+
+class TokenBucket:
+    """Continuous-refill bucket; `reserve` returns how long to wait (may go into debt)."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self, n: float) -> float:
+        if self.capacity <= 0:  # unlimited
+            return 0.0
+        n = min(float(n), self.capacity)
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= n
+            return max(0.0, -self.tokens / self.rate)
+
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    code = getattr(exc, "status_code", None)
+    if code is None:
+        response = getattr(exc, "response", None)
+        code = getattr(response, "status_code", None)
+    return code if isinstance(code, int) else None
+
+
+def is_rate_limited(exc: BaseException) -> bool:
+    return _status_code(exc) == 429 or "RateLimit" in type(exc).__name__
+
+
+def is_retryable(exc: BaseException) -> bool:
+    if is_rate_limited(exc):
+        return True
+    code = _status_code(exc)
+    if code is not None:
+        return code >= 500 or code == 408
+    name = type(exc).__name__
+    return "Timeout" in name or "Connection" in name
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("retry-after") if hasattr(headers, "get") else None
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+@dataclass
+class SchedulerStats:
+    calls: int = 0
+    retries: int = 0
+    rate_limited: int = 0
+    failures: int = 0
+    concurrency_limit: int = 0
+    in_flight: int = 0
+    queued: int = 0
+
+
+class AdaptiveScheduler:
+    def __init__(
+        self,
+        name: str,
+        rpm: float,
+        tpm: float,
+        max_concurrency: int,
+        min_concurrency: int = 1,
+        max_retries: int = LLM_MAX_RETRIES,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        target_latency: float = LLM_TARGET_LATENCY_S,
+    ):
+        self.name = name
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_concurrency = max(1, min(min_concurrency, self.max_concurrency))
+        self.limit = self.max_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.target_latency = target_latency
+
+        self._cond = threading.Condition()
+        self._waiters: list = []
+        self._seq = itertools.count()
+        self._active = 0
+        self._healthy = 0
+        self._last_decrease = 0.0
+        self.stats = SchedulerStats(concurrency_limit=self.limit)
+
+    # --- concurrency slots, granted in (priority, arrival) order ---
+
+    def _acquire_slot(self, level: int) -> None:
+        with self._cond:
+            entry = (level, next(self._seq))
+            heapq.heappush(self._waiters, entry)
+            while not (self._waiters[0] == entry and self._active < self.limit):
+                self._cond.wait()
+            heapq.heappop(self._waiters)
+            self._active += 1
+            self._cond.notify_all()
+
+    def _release_slot(self) -> None:
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    def _count(self, name: str) -> None:
+        """Bump a stats counter; calls finish on many threads at once."""
+        with self._cond:
+            setattr(self.stats, name, getattr(self.stats, name) + 1)
+
+    # --- AIMD concurrency control ---
+
+    def _decrease(self) -> None:
+        with self._cond:
+            now = time.monotonic()
+            # One multiplicative decrease per cooldown, not one per failed call
+            if now - self._last_decrease < 1.0:
+                return
+            self._last_decrease = now
+            self.limit = max(self.min_concurrency, self.limit // 2)
+            self._healthy = 0
+
+    def _on_success(self, latency: float) -> None:
+        with self._cond:
+            if latency > 2 * self.target_latency:
+                self.limit = max(self.min_concurrency, self.limit - 1)
+                self._healthy = 0
+            elif latency <= self.target_latency:
+                self._healthy += 1
+                if self._healthy >= self.limit and self.limit < self.max_concurrency:
+                    self.limit += 1
+                    self._healthy = 0
+                    self._cond.notify_all()
+
+    def _backoff(self, attempt: int, exc: BaseException) -> float:
+        hinted = _retry_after(exc)
+        if hinted is not None:
+            return min(hinted, self.max_delay)
+        delay = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return delay * random.uniform(0.5, 1.5)
+
+    def call(self, fn: Callable[[], Any], est_tokens: int = 0, level: Optional[int] = None) -> Any:
+        level = _PRIORITY.get() if level is None else level
+        attempt = 0
+        while True:
+            self._acquire_slot(level)
+            try:
+                wait = max(self.requests.reserve(1), self.tokens.reserve(est_tokens))
+                if wait > 0:
+                    time.sleep(wait)
+                start = time.monotonic()
+                result = fn()
+            except Exception as exc:
+                if is_rate_limited(exc):
+                    self._count("rate_limited")
+                    self._decrease()
+                if attempt >= self.max_retries or not is_retryable(exc):
+                    self._count("failures")
+                    raise
+                delay = self._backoff(attempt, exc)
+            else:
+                self._count("calls")
+                self._on_success(time.monotonic() - start)
+                return result
+            finally:
+                self._release_slot()
+            # Back off without holding a slot, then requeue
+            attempt += 1
+            self._count("retries")
+            time.sleep(delay)
+
+    def stream(self, fn: Callable[[], Iterator[Any]], est_tokens: int = 0, level: Optional[int] = None) -> Iterator[Any]:
+        """
+        Like `call` for a streamed response: yields fn()'s chunks, holding the
+        slot until the stream ends (or the consumer stops). Failures before
+        the first chunk are retried; later ones are raised, since chunks were
+        already handed out. Time to first chunk is the AIMD latency signal.
+        """
+        level = _PRIORITY.get() if level is None else level
+        attempt = 0
+        while True:
+            self._acquire_slot(level)
+            first: Optional[float] = None
+            try:
+                wait = max(self.requests.reserve(1), self.tokens.reserve(est_tokens))
+                if wait > 0:
+                    time.sleep(wait)
+                start = time.monotonic()
+                for chunk in fn():
+                    if first is None:
+                        first = time.monotonic() - start
+                    yield chunk
+            except Exception as exc:
+                if is_rate_limited(exc):
+                    self._count("rate_limited")
+                    self._decrease()
+                if first is not None or attempt >= self.max_retries or not is_retryable(exc):
+                    self._count("failures")
+                    raise
+                delay = self._backoff(attempt, exc)
+            else:
+                self._count("calls")
+                self._on_success(first if first is not None else time.monotonic() - start)
+                return
+            finally:
+                self._release_slot()
+            attempt += 1
+            self._count("retries")
+            time.sleep(delay)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._cond:
+            self.stats.concurrency_limit = self.limit
+            self.stats.in_flight = self._active
+            self.stats.queued = len(self._waiters)
+            return asdict(self.stats)
+
+
+_SCHEDULERS: Dict[str, AdaptiveScheduler] = {}
+_SCHEDULERS_LOCK = threading.Lock()
+
+
+def get_scheduler(kind: str) -> AdaptiveScheduler:
+    """Process-wide scheduler for "chat" or "embed" calls."""
+    with _SCHEDULERS_LOCK:
+        sched = _SCHEDULERS.get(kind)
+        if sched is None:
+            if kind == "embed":
+                sched = AdaptiveScheduler("embed", EMBED_RPM, EMBED_TPM, EMBED_MAX_CONCURRENCY)
+            else:
+                sched = AdaptiveScheduler(kind, LLM_RPM, LLM_TPM, LLM_MAX_CONCURRENCY)
+            _SCHEDULERS[kind] = sched
+        return sched
@@ -1,5 +1,5 @@
 from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 
 
 @dataclass
@@ -23,6 +23,18 @@ class ResumeParsed:
     phone: Optional[str]
     raw_text: str
     sections: Dict[str, str]
+    content_hash: Optional[str] = None  # sha256 of the uploaded file bytes
+
+
+@dataclass
+class ResumeFeatures:
+    """JD-independent resume features, computed once per resume text."""
+    tokens: frozenset  # resume + skills-section tokens
+    text_lower: str
+    years: float
+    buzzword_count: int
+    has_metrics: bool
+    section_spans: Dict[str, Tuple[int, int]]  # section -> (start, end) in raw_text
 
 
 @dataclass
@@ -49,3 +61,54 @@ class CandidateResult:
     rationale: Optional[Dict[str, Any]] = None
     rank_full: Optional[int] = None
     rank_blind: Optional[int] = None
+
+
+@dataclass
+class MultiJDResult:
+    jds: List[JD]
+    # rankings[j] is the ranked candidate list for jds[j]
+    rankings: List[List[CandidateResult]]
+    # resume_id -> (index of best-fit JD, composite score against it)
+    best_fit: Dict[str, Tuple[int, float]] = field(default_factory=dict)
+
+
+@dataclass
+class DuplicateCluster:
+    """Near-identical resumes; only the representative goes through scoring."""
+    representative_id: str
+    member_ids: List[str]  # includes the representative
+    member_names: List[str]
+    min_similarity: float  # lowest estimated Jaccard similarity to the representative
+
+
+@dataclass
+class ScoreStats:
+    """Composite-score summary over a set of candidates (mergeable across shards)."""
+    count: int = 0
+    total: float = 0.0
+    total_sq: float = 0.0
+    min_score: float = float("inf")
+    max_score: float = float("-inf")
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    @property
+    def std(self) -> float:
+        if not self.count:
+            return 0.0
+        return max(self.total_sq / self.count - self.mean ** 2, 0.0) ** 0.5
+
+
+@dataclass
+class RationaleStats:
+    """Which candidates got an LLM rationale vs. a template, and what it saved."""
+    llm_candidates: int = 0
+    llm_calls: int = 0
+    llm_seconds: float = 0.0
+    reused: int = 0  # from checkpoint / session cache
+    template_shortlist: int = 0
+    template_reject: int = 0
+    template_over_budget: int = 0  # borderline, but the LLM budget was spent
+    est_seconds_saved: Optional[float] = None
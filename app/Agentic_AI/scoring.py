@@ -136,11 +136,15 @@
 
 
 
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 import re
 
-from .schemas import JD, ResumeParsed, CandidateScores, CandidateResult
+import numpy as np
+
+from .schemas import JD, ResumeParsed, ResumeFeatures, CandidateScores, CandidateResult
 from .embedding import embed_texts, cosine_similarity
+from .embedding_store import get_embedding_store
+from .resume_parser import SECTION_MARKERS
 from .utils import redact_pii
 
 
@@ -154,19 +158,8 @@ def _tokenize(text: str) -> set[str]:
     return set(WORD_RE.findall(text.lower()))
 
 
-def _skill_matches(skill: str, resume: ResumeParsed) -> bool:
-    """
-    Decide if a JD skill is "present" in the resume using token overlap.
-
-    - Use tokens from the whole resume + the skills section (if present).
-    - For short skills (1–2 tokens): at least 1 token must appear.
-    - For medium skills (3–4 tokens): at least 50% of tokens must appear.
-    - For long skills (5+ tokens): at least 40% of tokens must appear.
-    """
-    skill_tokens = _tokenize(skill)
-    if not skill_tokens:
-        return False
-
+def _resume_tokens(resume: ResumeParsed) -> set[str]:
+    """Tokens from the whole resume + the skills section (if present)."""
     # Tokens from entire resume
     all_tokens = _tokenize(resume.raw_text)
 
@@ -174,17 +167,18 @@ def _skill_matches(skill: str, resume: ResumeParsed) -> bool:
     skills_section = resume.sections.get("skills", "")
     if skills_section:
         all_tokens |= _tokenize(skills_section)
+    return all_tokens
 
-    overlap = skill_tokens & all_tokens
-    if not overlap:
-        return False
 
-    overlap_ratio = len(overlap) / len(skill_tokens)
-
-    n_tokens = len(skill_tokens)
+def _overlap_passes(n_overlap, n_tokens: int):
+    """
+    Token-overlap rule shared by scalar and vectorized skill matching.
+    `n_overlap` may be an int or a numpy array of per-resume overlap counts.
+    """
+    overlap_ratio = n_overlap / n_tokens
     if n_tokens <= 2:
         # at least 1 token present
-        return len(overlap) >= 1
+        return n_overlap >= 1
     elif n_tokens <= 4:
         # at least half the tokens present
         return overlap_ratio >= 0.5
@@ -193,6 +187,30 @@ def _skill_matches(skill: str, resume: ResumeParsed) -> bool:
         return overlap_ratio >= 0.4
 
 
+def _skill_matches(skill: str, resume: ResumeParsed) -> bool:
+    """
+    Decide if a JD skill is "present" in the resume using token overlap.
+
+    - Use tokens from the whole resume + the skills section (if present).
+    - For short skills (1–2 tokens): at least 1 token must appear.
+    - For medium skills (3–4 tokens): at least 50% of tokens must appear.
+    - For long skills (5+ tokens): at least 40% of tokens must appear.
+    """
+    return _skill_in_tokens(skill, _resume_tokens(resume))
+
+
+def _skill_in_tokens(skill: str, resume_tokens: frozenset) -> bool:
+    """`_skill_matches` against a precomputed resume token set."""
+    skill_tokens = _tokenize(skill)
+    if not skill_tokens:
+        return False
+
+    overlap = skill_tokens & resume_tokens
+    if not overlap:
+        return False
+    return bool(_overlap_passes(len(overlap), len(skill_tokens)))
+
+
 def _extract_years(text: str) -> float:
     m = re.search(r"(\d+)\+?\s+years?", text, re.I)
     if not m:
@@ -200,60 +218,86 @@ def _extract_years(text: str) -> float:
     return float(m.group(1))
 
 
-def compute_scores(
-    jd: JD,
-    resume: ResumeParsed,
-    weights: Dict[str, float],
-    jd_embed_vec,
-    resume_embed_vec,
-) -> CandidateScores:
-    # --- Skill coverage (must-have & nice-to-have) ---
-    must = [s.strip() for s in jd.must_have_skills if s.strip()]
-    must_hits = [s for s in must if _skill_matches(s, resume)]
-    must_miss = [s for s in must if not _skill_matches(s, resume)]
-    skill_score = len(must_hits) / max(len(must), 1)
-
-    nice = [s.strip() for s in jd.nice_to_have_skills if s.strip()]
-    nice_hits = [s for s in nice if _skill_matches(s, resume)]
-    nice_score = len(nice_hits) / max(len(nice), 1) if nice else 0.0
+def _resume_years(resume: ResumeParsed) -> float:
+    exp_section = resume.sections.get("experience", resume.raw_text)
+    return _extract_years(exp_section)
 
-    # --- Semantic similarity (JD vs resume) ---
-    semantic_score = cosine_similarity(jd_embed_vec, resume_embed_vec)
 
-    # --- Experience score ---
-    exp_section = resume.sections.get("experience", resume.raw_text)
-    years = _extract_years(exp_section)
+def _experience_score(years: float, jd: JD) -> float:
     if jd.min_years_experience > 0:
-        experience_score = min(years / jd.min_years_experience, 1.0)
-    else:
-        experience_score = 0.5
+        return min(years / jd.min_years_experience, 1.0)
+    return 0.5
 
-    # --- Outcome score (JD outcomes language present in resume) ---
-    text_lower = resume.raw_text.lower()
+
+def _outcome_score(jd: JD, text_lower: str) -> float:
+    """Fraction of JD outcomes whose leading language appears in the resume."""
     outcome_hits = 0
     for o in jd.key_outcomes:
         chunk = o.lower()[:20]
         if chunk and chunk in text_lower:
             outcome_hits += 1
-    outcome_score = (
-        outcome_hits / max(len(jd.key_outcomes), 1) if jd.key_outcomes else 0.0
-    )
+    return outcome_hits / max(len(jd.key_outcomes), 1) if jd.key_outcomes else 0.0
 
-    # --- Risk score (buzzwords without evidence/metrics) ---
-    buzzwords = ["hard-working", "team player", "self-starter", "passionate"]
-    buzz = sum(1 for b in buzzwords if b in text_lower)
-    has_metrics = bool(re.search(r"\d+%", text_lower)) or bool(
+
+BUZZWORDS = ["hard-working", "team player", "self-starter", "passionate"]
+
+
+def _buzzword_count(text_lower: str) -> int:
+    return sum(1 for b in BUZZWORDS if b in text_lower)
+
+
+def _has_metrics(text_lower: str) -> bool:
+    return bool(re.search(r"\d+%", text_lower)) or bool(
         re.search(r"\d{4}", text_lower)
     )
+
+
+def _risk_score(text_lower: str) -> float:
+    """Penalize buzzwords without evidence/metrics."""
+    return _risk_from_counts(_buzzword_count(text_lower), _has_metrics(text_lower))
+
+
+def _risk_from_counts(buzz: int, has_metrics: bool) -> float:
     risk_score = 0.2
     if buzz > 2 and not has_metrics:
         risk_score = 0.7
+    return risk_score
+
+
+def _section_spans(text: str) -> Dict[str, Tuple[int, int]]:
+    """(start, end) offsets of each detected section, as in resume_parser."""
+    lower = text.lower()
+    spans = {}
+    for m in SECTION_MARKERS:
+        idx = lower.find(m)
+        if idx != -1:
+            spans[m] = (idx, min(idx + 2000, len(text)))
+    return spans
 
-    # JDMatchScore combines main alignment components
-    jd_match_score = 0.5 * skill_score + 0.3 * semantic_score + 0.2 * outcome_score
 
-    # Composite score with recruiter-defined weights
-    composite = (
+def extract_features(resume: ResumeParsed) -> ResumeFeatures:
+    """Everything scoring needs from a resume that does not depend on the JD."""
+    text_lower = resume.raw_text.lower()
+    return ResumeFeatures(
+        tokens=frozenset(_resume_tokens(resume)),
+        text_lower=text_lower,
+        years=_resume_years(resume),
+        buzzword_count=_buzzword_count(text_lower),
+        has_metrics=_has_metrics(text_lower),
+        section_spans=_section_spans(resume.raw_text),
+    )
+
+
+def _composite(
+    weights: Dict[str, float],
+    skill_score,
+    semantic_score,
+    experience_score,
+    outcome_score,
+    risk_score,
+):
+    """Composite score with recruiter-defined weights (scalars or arrays)."""
+    return (
         weights.get("skill", 0.4) * skill_score
         + weights.get("semantic", 0.3) * semantic_score
         + weights.get("experience", 0.15) * experience_score
@@ -261,6 +305,22 @@ def compute_scores(
         - weights.get("risk", 0.05) * risk_score
     )
 
+
+def build_scores(
+    skill_score: float,
+    semantic_score: float,
+    experience_score: float,
+    outcome_score: float,
+    risk_score: float,
+    composite: float,
+    must_hits: List[str],
+    must_miss: List[str],
+    nice_hits: List[str],
+    years: float,
+) -> CandidateScores:
+    # JDMatchScore combines main alignment components
+    jd_match_score = 0.5 * skill_score + 0.3 * semantic_score + 0.2 * outcome_score
+
     scores = CandidateScores(
         skill_score=float(skill_score),
         semantic_score=float(semantic_score),
@@ -280,25 +340,98 @@ def compute_scores(
     return scores
 
 
-def rank_candidates(
+def compute_scores(
     jd: JD,
-    resumes: List[ResumeParsed],
+    resume: ResumeParsed,
     weights: Dict[str, float],
-    blind_mode: bool = False,
-) -> List[CandidateResult]:
-    # Optionally redact PII for blind mode
+    jd_embed_vec,
+    resume_embed_vec,
+    features: Optional[ResumeFeatures] = None,
+) -> CandidateScores:
+    # JD-independent work comes from precomputed features when available
+    if features is None:
+        features = extract_features(resume)
+
+    # --- Skill coverage (must-have & nice-to-have) ---
+    must = [s.strip() for s in jd.must_have_skills if s.strip()]
+    must_matched = [_skill_in_tokens(s, features.tokens) for s in must]
+    must_hits = [s for s, ok in zip(must, must_matched) if ok]
+    must_miss = [s for s, ok in zip(must, must_matched) if not ok]
+    skill_score = len(must_hits) / max(len(must), 1)
+
+    nice = [s.strip() for s in jd.nice_to_have_skills if s.strip()]
+    nice_hits = [s for s in nice if _skill_in_tokens(s, features.tokens)]
+
+    # --- Semantic similarity (JD vs resume) ---
+    semantic_score = cosine_similarity(jd_embed_vec, resume_embed_vec)
+
+    # --- Experience score ---
+    years = features.years
+    experience_score = _experience_score(years, jd)
+
+    # --- Outcome score (JD outcomes language present in resume) ---
+    outcome_score = _outcome_score(jd, features.text_lower)
+
+    # --- Risk score (buzzwords without evidence/metrics) ---
+    risk_score = _risk_from_counts(features.buzzword_count, features.has_metrics)
+
+    composite = _composite(
+        weights, skill_score, semantic_score, experience_score, outcome_score, risk_score
+    )
+
+    return build_scores(
+        skill_score,
+        semantic_score,
+        experience_score,
+        outcome_score,
+        risk_score,
+        composite,
+        must_hits,
+        must_miss,
+        nice_hits,
+        years,
+    )
+
+
+def jd_embed_text(jd: JD) -> str:
+    """Text used to embed the JD for semantic scoring."""
+    return " ".join(
+        [jd.role_title] + jd.must_have_skills + jd.nice_to_have_skills + jd.key_outcomes
+    )
+
+
+def embed_resumes(resumes: List[ResumeParsed], blind_mode: bool = False) -> np.ndarray:
+    """
+    Embed resume texts, optionally redacting PII first (blind mode).
+    Vectors are reused from the persistent embedding store when enabled.
+    """
     if blind_mode:
         texts = [redact_pii(r.raw_text) for r in resumes]
     else:
         texts = [r.raw_text for r in resumes]
+    return embed_stored(texts)
 
-    # Embed JD and resumes once
-    jd_text_for_embed = " ".join(
-        [jd.role_title] + jd.must_have_skills + jd.nice_to_have_skills + jd.key_outcomes
-    )
-    jd_embed = embed_texts([jd_text_for_embed])[0]
-    resume_embeds = embed_texts(texts)
 
+def embed_stored(texts: List[str]) -> np.ndarray:
+    """embed_texts, going through the persistent embedding store when it is enabled."""
+    store = get_embedding_store()
+    if store is None:
+        return embed_texts(texts)
+    return store.embed(texts)
+
+
+def score_candidates(
+    jd: JD,
+    resumes: List[ResumeParsed],
+    weights: Dict[str, float],
+    jd_embed,
+    resume_embeds,
+    features: Optional[List[ResumeFeatures]] = None,
+) -> List[CandidateResult]:
+    """
+    Score resumes against a JD with precomputed embeddings (unsorted).
+    `features` (e.g. from the feature store) skips the JD-independent work.
+    """
     results: List[CandidateResult] = []
     for idx, r in enumerate(resumes):
         scores = compute_scores(
@@ -307,6 +440,7 @@ def rank_candidates(
             weights=weights,
             jd_embed_vec=jd_embed,
             resume_embed_vec=resume_embeds[idx],
+            features=features[idx] if features is not None else None,
         )
         results.append(
             CandidateResult(
@@ -315,9 +449,40 @@ def rank_candidates(
                 jd=jd,
             )
         )
+    return results
 
-    # Sort by composite score (higher is better)
-    results_sorted = sorted(
-        results, key=lambda c: c.scores.composite_score, reverse=True
-    )
-    return results_sorted
+
+def sort_candidates(results: List[CandidateResult], top_k: Optional[int] = None) -> List[CandidateResult]:
+    """
+    Sort by composite score (higher is better). With `top_k`, only the best
+    top_k are selected (partial selection, O(n + k log k)) in the same order,
+    ties included, as the full sort.
+    """
+    if not top_k or top_k >= len(results):
+        return sorted(results, key=lambda c: c.scores.composite_score, reverse=True)
+    neg = -np.fromiter((c.scores.composite_score for c in results), dtype="float64", count=len(results))
+    kth = np.partition(neg, top_k - 1)[top_k - 1]
+    above = np.flatnonzero(neg < kth)
+    ties = np.flatnonzero(neg == kth)[: top_k - len(above)]  # earliest first, like a stable sort
+    idx = np.concatenate([above, ties])
+    idx = idx[np.lexsort((idx, neg[idx]))]
+    return [results[i] for i in idx]
+
+
+def rank_candidates(
+    jd: JD,
+    resumes: List[ResumeParsed],
+    weights: Dict[str, float],
+    blind_mode: bool = False,
+    resume_embeds: Optional[np.ndarray] = None,
+    features: Optional[List[ResumeFeatures]] = None,
+    top_k: Optional[int] = None,
+) -> List[CandidateResult]:
+    # Embed JD and resumes once (resume embeddings may be precomputed,
+    # e.g. restored from a checkpoint)
+    jd_embed = embed_texts([jd_embed_text(jd)])[0]
+    if resume_embeds is None:
+        resume_embeds = embed_resumes(resumes, blind_mode=blind_mode)
+
+    results = score_candidates(jd, resumes, weights, jd_embed, resume_embeds, features)
+    return sort_candidates(results, top_k)
@@ -0,0 +1,75 @@
+"""
+JSON-safe conversion of screening results, for the job server and clients.
+
+CandidateScores carries extra attributes (must-have hits, JDMatchScore, ...)
+attached after construction, so scores are (de)serialized explicitly
+rather than with dataclasses.asdict alone.
+"""
+from dataclasses import asdict
+from typing import Any, Dict, List
+
+from .schemas import JD, CandidateResult, CandidateScores, DuplicateCluster, ResumeParsed
+
+# Attributes build_scores attaches to CandidateScores
+SCORE_EXTRAS = {
+    "must_have_hits": list,
+    "must_have_miss": list,
+    "nice_to_have_hits": list,
+    "jd_match_score": float,
+    "years_experience": float,
+}
+
+
+def jd_to_dict(jd: JD) -> Dict[str, Any]:
+    return asdict(jd)
+
+
+def jd_from_dict(data: Dict[str, Any]) -> JD:
+    return JD(**data)
+
+
+def scores_to_dict(scores: CandidateScores) -> Dict[str, Any]:
+    out = {k: float(v) for k, v in asdict(scores).items()}
+    for name, kind in SCORE_EXTRAS.items():
+        if hasattr(scores, name):
+            out[name] = kind(getattr(scores, name))
+    return out
+
+
+def scores_from_dict(data: Dict[str, Any]) -> CandidateScores:
+    base = {k: v for k, v in data.items() if k not in SCORE_EXTRAS}
+    scores = CandidateScores(**base)
+    for name in SCORE_EXTRAS:
+        if name in data:
+            setattr(scores, name, data[name])
+    return scores
+
+
+def candidate_to_dict(c: CandidateResult) -> Dict[str, Any]:
+    """Candidate without its JD (sent once per job, not once per candidate)."""
+    return {
+        "resume": asdict(c.resume),
+        "scores": scores_to_dict(c.scores),
+        "rationale": c.rationale,
+        "rank_full": c.rank_full,
+        "rank_blind": c.rank_blind,
+    }
+
+
+def candidate_from_dict(data: Dict[str, Any], jd: JD) -> CandidateResult:
+    return CandidateResult(
+        resume=ResumeParsed(**data["resume"]),
+        scores=scores_from_dict(data["scores"]),
+        jd=jd,
+        rationale=data.get("rationale"),
+        rank_full=data.get("rank_full"),
+        rank_blind=data.get("rank_blind"),
+    )
+
+
+def clusters_to_list(clusters: List[DuplicateCluster]) -> List[Dict[str, Any]]:
+    return [asdict(c) for c in clusters]
+
+
+def clusters_from_list(data: List[Dict[str, Any]]) -> List[DuplicateCluster]:
+    return [DuplicateCluster(**c) for c in data]
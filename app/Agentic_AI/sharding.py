@@ -0,0 +1,351 @@
+"""
+Sharded scoring for very large applicant pools.
+
+The resume list is split into contiguous shards; each shard is embedded and
+scored in a separate worker process and sends back only its local top-K and
+its score statistics. A k-way heap merge of the (already sorted) shard lists
+gives exactly the global top-K that sorting the whole pool would.
+
+The blind pass only needs blind ranks for the full top-K: with `keep_ids`
+each shard returns just those candidates plus its sorted scores, from which
+the coordinator places them in the whole pool (`pool_ranks`).
+
+    ranked, stats = rank_sharded(jd, resumes, weights, top_k=100, workers=4)
+
+Across hosts, shards go through a small queue server (multiprocessing
+managers over TCP) that any number of workers poll:
+
+    python -m Agentic_AI.sharding serve --address 0.0.0.0:50000
+    python -m Agentic_AI.sharding work --address coordinator:50000 --processes 8   # per host
+    SHARD_ADDRESS=coordinator:50000 python -m Agentic_AI.batch --shards 64 --top-k 200 ...
+
+Set SHARD_AUTHKEY to the same secret on every host: the queues carry
+pickles, so the server and clients refuse a non-loopback address without it.
+"""
+import argparse
+import heapq
+import ipaddress
+import multiprocessing
+import queue
+import socket
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from multiprocessing.managers import BaseManager
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .config import SHARD_ADDRESS, SHARD_AUTHKEY, SHARD_TIMEOUT_S, SHARD_WORKERS
+from .schemas import JD, CandidateResult, ResumeParsed, ScoreStats
+
+
+@dataclass
+class ShardTask:
+    shard: int
+    jd: JD
+    jd_embed: np.ndarray  # embedded once by the coordinator
+    resumes: List[ResumeParsed]
+    weights: Dict[str, float]
+    blind_mode: bool = False
+    top_k: int = 0  # 0 = return the whole shard
+    keep_ids: Optional[List[str]] = None  # return only these candidates, whatever their rank
+
+
+@dataclass
+class ShardResult:
+    shard: int
+    top: List[CandidateResult]  # sorted by composite score, best first
+    stats: ScoreStats
+    elapsed_s: float
+    # With keep_ids: the shard's scores, best first, and each kept candidate's rank in the shard
+    ranked_scores: Optional[np.ndarray] = None
+    ranks: Optional[Dict[str, int]] = None
+
+
+def split_shards(items: Sequence, n_shards: int) -> List[List]:
+    """Split into at most `n_shards` contiguous, near-equal shards."""
+    n_shards = max(1, min(n_shards, len(items)))
+    size, extra = divmod(len(items), n_shards)
+    shards, start = [], 0
+    for i in range(n_shards):
+        end = start + size + (1 if i < extra else 0)
+        shards.append(list(items[start:end]))
+        start = end
+    return shards
+
+
+def score_shard(task: ShardTask) -> ShardResult:
+    """Worker side: embed + score one shard, keep its local top-K."""
+    from .feature_store import resume_features
+    from .scoring import embed_resumes, score_candidates, sort_candidates
+
+    t0 = time.perf_counter()
+    resume_embeds = embed_resumes(task.resumes, blind_mode=task.blind_mode)
+    features = resume_features(task.resumes)
+    scored = score_candidates(task.jd, task.resumes, task.weights, task.jd_embed, resume_embeds, features)
+    scores = np.array([c.scores.composite_score for c in scored], dtype="float64")
+    stats = ScoreStats(
+        count=len(scores),
+        total=float(scores.sum()),
+        total_sq=float((scores ** 2).sum()),
+        min_score=float(scores.min()) if len(scores) else float("inf"),
+        max_score=float(scores.max()) if len(scores) else float("-inf"),
+    )
+    if task.keep_ids is None:
+        top = sort_candidates(scored, task.top_k or None)
+        return ShardResult(task.shard, top, stats, time.perf_counter() - t0)
+    keep = set(task.keep_ids)
+    ranked = sort_candidates(scored)
+    ranks = {c.resume.resume_id: i + 1 for i, c in enumerate(ranked) if c.resume.resume_id in keep}
+    top = [c for c in ranked if c.resume.resume_id in ranks]
+    ranked_scores = np.array([c.scores.composite_score for c in ranked], dtype="float64")
+    return ShardResult(task.shard, top, stats, time.perf_counter() - t0, ranked_scores, ranks)
+
+
+def merge_stats(stats: Sequence[ScoreStats]) -> ScoreStats:
+    return ScoreStats(
+        count=sum(s.count for s in stats),
+        total=sum(s.total for s in stats),
+        total_sq=sum(s.total_sq for s in stats),
+        min_score=min((s.min_score for s in stats), default=float("inf")),
+        max_score=max((s.max_score for s in stats), default=float("-inf")),
+    )
+
+
+def merge_top_k(results: Sequence[ShardResult], top_k: int = 0) -> List[CandidateResult]:
+    """
+    k-way heap merge of per-shard rankings. Shards are merged in shard order,
+    so ties break like a stable sort of the unsharded pool.
+    """
+    ordered = sorted(results, key=lambda r: r.shard)
+    merged = heapq.merge(*(r.top for r in ordered), key=lambda c: -c.scores.composite_score)
+    return list(islice(merged, top_k) if top_k else merged)
+
+
+def pool_ranks(results: Sequence[ShardResult]) -> Dict[str, int]:
+    """
+    Pool-wide rank of every kept candidate (see ShardTask.keep_ids): its rank
+    in its shard plus the better scores in the other shards. Equal scores in
+    earlier shards count too, so ties rank like a stable sort of the pool.
+    """
+    ordered = sorted(results, key=lambda r: r.shard)
+    ascending = [-r.ranked_scores for r in ordered]  # type: ignore[operator]
+    ranks: Dict[str, int] = {}
+    for i, result in enumerate(ordered):
+        for c in result.top:
+            neg = -c.scores.composite_score
+            rank = result.ranks[c.resume.resume_id]  # type: ignore[index]
+            for j, other in enumerate(ascending):
+                if j != i:
+                    rank += int(np.searchsorted(other, neg, side="right" if j < i else "left"))
+            ranks[c.resume.resume_id] = rank
+    return ranks
+
+
+# --- transports ---
+
+
+def run_local(tasks: List[ShardTask], workers: int = SHARD_WORKERS) -> Iterator[ShardResult]:
+    """Score shards in a local process pool (spawned: no inherited threads/locks)."""
+    if len(tasks) <= 1 or workers <= 1:
+        yield from map(score_shard, tasks)
+        return
+    ctx = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=min(workers, len(tasks)), mp_context=ctx) as pool:
+        yield from pool.map(score_shard, tasks)
+
+
+def parse_address(address: str) -> Tuple[str, int]:
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def _is_loopback(host: str) -> bool:
+    try:
+        return ipaddress.ip_address(socket.gethostbyname(host)).is_loopback
+    except (OSError, ValueError):
+        return False
+
+
+def _require_authkey(address: str, authkey: bytes) -> None:
+    """Anyone who can connect can make the other side unpickle arbitrary objects."""
+    if not authkey and not _is_loopback(parse_address(address)[0]):
+        raise ValueError(f"set SHARD_AUTHKEY to a shared secret to use the shard queue server on {address}")
+
+
+class _ResultBoard:
+    """
+    Server side: one result queue per coordinator run, keyed by the run's
+    token, so concurrent runs never see (or drop) each other's results.
+    Results for runs that were closed (finished or abandoned) are discarded.
+    """
+
+    def __init__(self):
+        self._queues: Dict[str, queue.Queue] = {}
+        self._lock = threading.Lock()
+
+    def open(self, token: str) -> None:
+        with self._lock:
+            self._queues.setdefault(token, queue.Queue())
+
+    def close(self, token: str) -> None:
+        with self._lock:
+            self._queues.pop(token, None)
+
+    def is_open(self, token: str) -> bool:
+        with self._lock:
+            return token in self._queues
+
+    def put(self, token: str, item) -> None:
+        with self._lock:
+            q = self._queues.get(token)
+        if q is not None:
+            q.put(item)
+
+    def get(self, token: str, timeout: float):
+        with self._lock:
+            q = self._queues[token]
+        return q.get(timeout=timeout)
+
+
+class _QueueServer(BaseManager):
+    pass
+
+
+class _QueueClient(BaseManager):
+    pass
+
+
+_QueueClient.register("tasks")
+_QueueClient.register("results")
+
+
+def _connect(address: str, authkey: bytes = SHARD_AUTHKEY):
+    _require_authkey(address, authkey)
+    client = _QueueClient(address=parse_address(address), authkey=authkey)
+    client.connect()
+    return client.tasks(), client.results()
+
+
+def serve_queues(address: str, authkey: bytes = SHARD_AUTHKEY) -> None:
+    """Run the task queue and per-run result queue server (blocks)."""
+    _require_authkey(address, authkey)
+    tasks: queue.Queue = queue.Queue()
+    results = _ResultBoard()
+    _QueueServer.register("tasks", callable=lambda: tasks)
+    _QueueServer.register("results", callable=lambda: results)
+    server = _QueueServer(address=parse_address(address), authkey=authkey).get_server()
+    server.serve_forever()
+
+
+def work(address: str, authkey: bytes = SHARD_AUTHKEY) -> None:
+    """Worker loop: take shard tasks from the queue server, post results (blocks)."""
+    tasks, results = _connect(address, authkey)
+    while True:
+        token, task = tasks.get()
+        if not results.is_open(token):
+            continue  # its coordinator gave up or already failed
+        try:
+            results.put(token, (task.shard, score_shard(task), None))
+        except Exception as exc:  # noqa: BLE001 - reported to the coordinator
+            results.put(token, (task.shard, None, repr(exc)))
+
+
+def run_remote(
+    tasks: List[ShardTask],
+    address: str = SHARD_ADDRESS,
+    authkey: bytes = SHARD_AUTHKEY,
+    timeout: float = SHARD_TIMEOUT_S,
+) -> Iterator[ShardResult]:
+    """Send shards through the queue server; yields results as workers finish."""
+    task_q, results = _connect(address, authkey)
+    token = uuid.uuid4().hex  # this run's result queue on the server
+    results.open(token)
+    try:
+        for task in tasks:
+            task_q.put((token, task))
+        pending = {t.shard for t in tasks}
+        while pending:
+            try:
+                shard, result, error = results.get(token, timeout)
+            except queue.Empty:
+                raise TimeoutError(
+                    f"{len(pending)} shard(s) unfinished after {timeout:.0f}s; are workers running against {address}?"
+                ) from None
+            if error is not None:
+                raise RuntimeError(f"shard {shard} failed: {error}")
+            pending.discard(shard)
+            yield result
+    finally:
+        results.close(token)
+
+
+def rank_sharded(
+    jd: JD,
+    resumes: List[ResumeParsed],
+    weights: Dict[str, float],
+    top_k: int = 0,
+    n_shards: Optional[int] = None,
+    workers: int = SHARD_WORKERS,
+    blind_mode: bool = False,
+    address: str = SHARD_ADDRESS,
+    jd_embed: Optional[np.ndarray] = None,
+) -> Tuple[List[CandidateResult], ScoreStats]:
+    """
+    Global top-K (all candidates when top_k=0) and pool-wide score stats.
+    Runs on the queue server at `address` when set, else in local processes.
+    """
+    if jd_embed is None:
+        from .embedding import embed_texts
+        from .scoring import jd_embed_text
+
+        jd_embed = embed_texts([jd_embed_text(jd)])[0]
+    tasks = [
+        ShardTask(i, jd, jd_embed, shard, weights, blind_mode, top_k)
+        for i, shard in enumerate(split_shards(resumes, n_shards or workers))
+    ]
+    results = list(run_remote(tasks, address) if address else run_local(tasks, workers))
+    return merge_top_k(results, top_k), merge_stats([r.stats for r in results])
+
+
+def _work_processes(address: str, processes: int) -> None:
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=work, args=(address,), daemon=True) for _ in range(processes)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Sharded scoring queue server / workers")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve = sub.add_parser("serve", help="Run the shard queue server")
+    serve.add_argument("--address", default=SHARD_ADDRESS or "127.0.0.1:50000")
+    worker = sub.add_parser("work", help="Run shard workers against a queue server")
+    worker.add_argument("--address", default=SHARD_ADDRESS or "127.0.0.1:50000")
+    worker.add_argument("--processes", type=int, default=SHARD_WORKERS)
+    args = parser.parse_args(argv)
+    try:
+        _require_authkey(args.address, SHARD_AUTHKEY)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    if args.command == "serve":
+        print(f"Shard queue server on {args.address}")
+        serve_queues(args.address)
+    else:
+        print(f"{args.processes} shard worker(s) polling {args.address}")
+        _work_processes(args.address, args.processes)
+
+
+if __name__ == "__main__":
+    # Run the package module, not __main__, so objects sent to worker
+    # processes pickle by their importable names
+    from .sharding import main as _main
+
+    _main()
@@ -1,28 +1,50 @@
 import json
+import uuid
 from datetime import datetime
-from pathlib import Path
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, Optional
 
-from .config import LOG_DIR
+from .config import LOG_DIR, ensure_dir
+from .results_table import write_parquet
+
+if TYPE_CHECKING:
+    import pyarrow as pa
 
 
 RUNS_LOG = LOG_DIR / "runs.jsonl"
+RESULTS_DIR = LOG_DIR / "results"
 
 
 def log_run(
     jd_json: Dict[str, Any],
     weights: Dict[str, float],
-    candidates: List[Dict[str, Any]],
+    results: "pa.Table",
+    run_id: Optional[str] = None,
+    performance: Optional[Dict[str, Any]] = None,
+    rationale_stats: Optional[Dict[str, Any]] = None,
 ) -> None:
     """
-    Append a run entry to runs.jsonl for audit / debugging.
-    Each line: {"timestamp": ..., "jd": ..., "weights": ..., "candidates": [...]}
+    Append a run entry to runs.jsonl for audit / debugging; the per-candidate
+    results table (results_table.py) goes next to it as Parquet.
+    Each line: {"timestamp": ..., "run_id": ..., "jd": ..., "weights": ...,
+                "results_path": "results/<run_id>-<suffix>.parquet", "n_candidates": <row count>,
+                "performance": {"elapsed_ms": ..., "spans": [...]},
+                "rationale_stats": {"llm_calls": ..., "template_reject": ..., ...}}
     """
+    # Suffixed: a multi-JD run logs one table per JD under the same run_id
+    path = write_parquet(results, RESULTS_DIR / f"{run_id or 'run'}-{uuid.uuid4().hex[:8]}.parquet")
     entry = {
         "timestamp": datetime.utcnow().isoformat() + "Z",
+        "run_id": run_id,
         "jd": jd_json,
         "weights": weights,
-        "candidates": candidates,
+        # Older lines hold the candidate list itself under "candidates"
+        "results_path": str(path.relative_to(LOG_DIR)),
+        "n_candidates": results.num_rows,
     }
+    if performance is not None:
+        entry["performance"] = performance
+    if rationale_stats is not None:
+        entry["rationale_stats"] = rationale_stats
+    ensure_dir(LOG_DIR)
     with RUNS_LOG.open("a", encoding="utf-8") as f:
         f.write(json.dumps(entry) + "\n")
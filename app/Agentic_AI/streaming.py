@@ -0,0 +1,256 @@
+"""
+Bounded-memory streaming mode for very large batches.
+
+Resumes go through parse -> features -> embed -> score one chunk at a time.
+Once a chunk is scored only two things are kept:
+
+- one compact score row per resume (ids, component scores, full and blind
+  composite, must-have counts; ~100 bytes, no text)
+- the running top-K candidates, with the parsed resume their rationale
+  quotes as evidence
+
+Raw text, sections, the redacted blind-mode copy and the chunk's other
+CandidateResults are dropped (or appended to a JSONL spill file first).
+Chunk sizes adapt to the text volume seen so far, so the chunk in flight
+stays within STREAM_MEMORY_MB.
+
+    python -m Agentic_AI.batch --stream --jd jd.txt --resumes pool/ --top-k 200
+
+Near-duplicate collapsing is not applied: it needs every resume's shingles
+at once.
+"""
+import heapq
+import json
+import os
+from dataclasses import asdict, dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .checkpoint import RunCheckpoint
+from .config import STREAM_MEMORY_MB, STREAM_SPILL_DIR, ensure_dir
+from .embedding import cosine_similarity, embed_texts
+from .graph import _jd_to_json, write_rationales
+from .instrumentation import record_cache_hits, span
+from .results_table import SCORE_COLUMNS, results_table
+from .resume_parser import parse_resume
+from .schemas import JD, CandidateResult, RationaleStats, ResumeParsed, ScoreStats
+from .scoring import _composite, embed_resumes, extract_features, jd_embed_text, score_candidates, sort_candidates
+from .storage import log_run
+
+# Live bytes per parsed character while a chunk is in flight: raw text and
+# sections, the lowercase copy and token set in its features, the redacted
+# blind copy and the scored objects (measured with tracemalloc on the
+# synthetic benchmark corpus: ~31, rounded up).
+BYTES_PER_CHAR = 32
+# Share of the memory budget a chunk may use; the rest is score rows, the
+# top-K and the interpreter itself
+CHUNK_SHARE = 0.5
+
+
+@dataclass
+class ScoreRows:
+    """Compact scores of one chunk, in input order."""
+    resume_ids: List[str]
+    names: List[str]
+    content_hashes: List[Optional[str]]
+    scores: np.ndarray  # (n, len(SCORE_COLUMNS)) float64, CompositeScore first
+    blind: np.ndarray  # (n,) blind-mode composite
+    must_met: np.ndarray  # (n,) int16
+    must_total: np.ndarray  # (n,) int16
+
+
+@dataclass
+class StreamResult:
+    jd: JD
+    top: List[CandidateResult]  # best first, with ranks and rationales
+    table: Any  # pyarrow.Table: one row per resume in rank order (results_table schema)
+    stats: ScoreStats
+    rationale_stats: RationaleStats
+    chunks: int
+    max_chunk: int
+
+
+def chunk_size(budget_mb: float, chars_per_resume: float, dim: int, limit: int = 10_000) -> int:
+    """Resumes per chunk so that the chunk in flight fits its share of the budget."""
+    per_resume = chars_per_resume * BYTES_PER_CHAR + dim * 4 * 2  # + full and blind vectors
+    return int(max(8, min(limit, budget_mb * 2 ** 20 * CHUNK_SHARE / max(per_resume, 1.0))))
+
+
+def score_chunk(
+    jd: JD,
+    jd_embed: np.ndarray,
+    resumes: List[ResumeParsed],
+    weights: Dict[str, float],
+    top_k: int,
+) -> Tuple[ScoreRows, List[CandidateResult]]:
+    """Score one chunk in both modes; returns its score rows and local top-K."""
+    features = [extract_features(r) for r in resumes]  # not memoized: the store's memo would grow with the pool
+    with span("stream.embed") as sp:
+        sp.items = len(resumes)
+        full_embeds = embed_resumes(resumes)
+        blind_embeds = embed_resumes(resumes, blind_mode=True)
+    with span("stream.score") as sp:
+        sp.items = len(resumes)
+        scored = score_candidates(jd, resumes, weights, jd_embed, full_embeds, features)
+
+    s = [c.scores for c in scored]
+    values = np.array([[get(x) for _, get in SCORE_COLUMNS] for x in s], dtype="float64").reshape(len(s), -1)
+    # Blind mode only changes the semantic score (PII-redacted text)
+    blind_semantic = np.array([cosine_similarity(jd_embed, v) for v in blind_embeds], dtype="float64")
+    blind = _composite(
+        weights,
+        np.array([x.skill_score for x in s]),
+        blind_semantic,
+        np.array([x.experience_score for x in s]),
+        np.array([x.outcome_score for x in s]),
+        np.array([x.risk_score for x in s]),
+    )
+    met = np.array([len(getattr(x, "must_have_hits", [])) for x in s], dtype="int16")
+    rows = ScoreRows(
+        resume_ids=[r.resume_id for r in resumes],
+        names=[r.name for r in resumes],
+        content_hashes=[r.content_hash for r in resumes],
+        scores=values,
+        blind=np.asarray(blind, dtype="float64").reshape(len(s)),
+        must_met=met,
+        must_total=met + np.array([len(getattr(x, "must_have_miss", [])) for x in s], dtype="int16"),
+    )
+    return rows, sort_candidates(scored, top_k)
+
+
+def _spill(path: Path, paths: List[str], resumes: List[ResumeParsed], offset: int) -> int:
+    """
+    Write a chunk's records at `offset`, the end of the last checkpointed
+    chunk, dropping whatever a crashed run wrote after it. Returns the new end.
+    """
+    with path.open("ab") as f:
+        f.truncate(offset)
+        for p, r in zip(paths, resumes):
+            record = {"resume_id": r.resume_id, "path": p, "name": r.name, "raw_text": r.raw_text, "sections": r.sections}
+            f.write((json.dumps(record) + "\n").encode("utf-8"))
+        f.flush()
+        return f.seek(0, os.SEEK_END)
+
+
+def _ranks(scores: np.ndarray) -> np.ndarray:
+    """1-based ranks by descending score; ties keep input order (like a stable sort)."""
+    order = np.argsort(-scores, kind="stable")
+    ranks = np.empty(len(scores), dtype="int32")
+    ranks[order] = np.arange(1, len(scores) + 1, dtype="int32")
+    return ranks
+
+
+def _table(rows: List[ScoreRows], top: List[CandidateResult]):
+    """Results table over every resume; lists and rationale columns only for the top-K."""
+    import pyarrow as pa
+
+    ids = [rid for r in rows for rid in r.resume_ids]
+    scores = np.concatenate([r.scores for r in rows]) if rows else np.zeros((0, len(SCORE_COLUMNS)))
+    blind = np.concatenate([r.blind for r in rows]) if rows else np.zeros(0)
+    met = np.concatenate([r.must_met for r in rows]).astype("int32") if rows else np.zeros(0, "int32")
+    total = np.concatenate([r.must_total for r in rows]).astype("int32") if rows else np.zeros(0, "int32")
+    rank_full, rank_blind = _ranks(scores[:, 0]), _ranks(blind)
+    order = np.argsort(rank_full)
+
+    head = {c.resume.resume_id: c for c in top}
+    row_of = {rid: i for i, rid in enumerate(ids) if rid in head}
+    for c in top:
+        c.rank_blind = int(rank_blind[row_of[c.resume.resume_id]])
+
+    def top_only(get):
+        return [get(head[ids[i]]) if ids[i] in head else None for i in order]
+
+    columns = {
+        "resume_id": pa.array([ids[i] for i in order], pa.string()),
+        "name": pa.array([n for r in rows for n in r.names], pa.string()).take(order),
+        "content_hash": pa.array([h for r in rows for h in r.content_hashes], pa.string()).take(order),
+        "rank_full": rank_full[order],
+        "rank_blind": rank_blind[order],
+        "rank_delta": rank_blind[order] - rank_full[order],
+        **{name: scores[order, j] for j, (name, _) in enumerate(SCORE_COLUMNS)},
+        "MustHaveMet": met[order],
+        "MustHaveTotal": total[order],
+        "MustHaveCoverage": met[order] / np.maximum(total[order], 1),
+        "must_have_hits": pa.array(top_only(lambda c: getattr(c.scores, "must_have_hits", [])), pa.list_(pa.string())),
+        "must_have_miss": pa.array(top_only(lambda c: getattr(c.scores, "must_have_miss", [])), pa.list_(pa.string())),
+        "action": pa.array(top_only(lambda c: (c.rationale or {}).get("action")), pa.string()),
+        "rationale_by": pa.array(top_only(lambda c: (c.rationale or {}).get("generated_by")), pa.string()),
+    }
+    return pa.table(columns, schema=results_table([]).schema)
+
+
+def stream_rank(
+    jd: JD,
+    resume_paths: List[str],
+    weights: Dict[str, float],
+    top_k: int = 100,
+    memory_mb: float = STREAM_MEMORY_MB,
+    spill: bool = False,
+    run_id: Optional[str] = None,
+    ckpt: Optional[RunCheckpoint] = None,
+    first_chunk: int = 32,
+) -> StreamResult:
+    """
+    Rank `resume_paths` against `jd` in bounded memory: every resume gets a
+    score row and ranks (full and blind); the top_k get rationales. With
+    `ckpt`, each chunk's rows and top-K are checkpointed, so an interrupted
+    run resumes after its last completed chunk; the spill file is cut back
+    to that chunk's end first, so no record is written twice.
+    """
+    top_k = max(top_k, 1)
+    jd_embed = embed_texts([jd_embed_text(jd)])[0]
+    spill_path = ensure_dir(STREAM_SPILL_DIR) / f"{run_id or 'stream'}.jsonl" if spill else None
+
+    rows: List[ScoreRows] = []
+    top: List[CandidateResult] = []
+    start, i, size, max_chunk = 0, 0, first_chunk, 0
+    chars = parsed = 0
+    spill_end = 0  # spill file size after the last completed chunk
+    while start < len(resume_paths):
+        key = f"stream/{i:05d}"
+        if ckpt and ckpt.has(key):
+            end, chunk_rows, chunk_top, spill_end = ckpt.load(key)
+            record_cache_hits()
+        else:
+            end = min(start + size, len(resume_paths))
+            with span("stream.parse") as sp:
+                sp.items = end - start
+                resumes = [parse_resume(p) for p in resume_paths[start:end]]
+            chars += sum(len(r.raw_text) for r in resumes)
+            parsed += len(resumes)
+            if spill_path is not None:
+                spill_end = _spill(spill_path, resume_paths[start:end], resumes, spill_end)
+            chunk_rows, chunk_top = score_chunk(jd, jd_embed, resumes, weights, top_k)
+            del resumes  # only chunk_top keeps resumes (and their text) alive
+            if ckpt:
+                ckpt.save(key, (end, chunk_rows, chunk_top, spill_end))
+        rows.append(chunk_rows)
+        # Earlier chunks first, so ties rank like a stable sort of the whole pool
+        top = list(islice(heapq.merge(top, chunk_top, key=lambda c: -c.scores.composite_score), top_k))
+        max_chunk = max(max_chunk, end - start)
+        start, i = end, i + 1
+        if parsed:
+            size = chunk_size(memory_mb, chars / parsed, len(jd_embed))
+
+    for rank, c in enumerate(top, 1):
+        c.rank_full = rank
+    rationale_stats = write_rationales(jd, top, ckpt=ckpt)
+    with span("results_table"):
+        table = _table(rows, top)
+    composite = table.column("CompositeScore").to_numpy()
+    stats = ScoreStats(
+        count=len(composite),
+        total=float(composite.sum()),
+        total_sq=float((composite ** 2).sum()),
+        min_score=float(composite.min()) if len(composite) else float("inf"),
+        max_score=float(composite.max()) if len(composite) else float("-inf"),
+    )
+
+    if ckpt is None or not ckpt.has("logged"):
+        log_run(_jd_to_json(jd), weights, table, run_id=run_id, rationale_stats=asdict(rationale_stats))
+        if ckpt:
+            ckpt.save("logged", True)
+    return StreamResult(jd, top, table, stats, rationale_stats, chunks=i, max_chunk=max_chunk)
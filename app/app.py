@@ -3,31 +3,168 @@
 
 
 
+import dataclasses
+import queue
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
 import pandas as pd
 import streamlit as st
-from typing import List
+from typing import List, Optional, Tuple
 
-from Agentic_AI.config import DATA_DIR, UPLOAD_DIR, DEFAULT_WEIGHTS
+from Agentic_AI.config import DATA_DIR, DEFAULT_WEIGHTS, JOB_SERVER_URL, PRECOMPUTE_ENABLED, PROFILE_RUNS
+from Agentic_AI.blob_store import get_blob_store
 from Agentic_AI.graph import build_agent_graph, AgentState
+from Agentic_AI.incremental import ScoringCache
+from Agentic_AI.job_client import JobClient, JobQueueFull
+from Agentic_AI.llm_utils import stream_bias_notes_llm
+from Agentic_AI.precompute import Precomputer
+from Agentic_AI.results_table import parquet_bytes, results_table, to_frame
+from Agentic_AI.serialization import clusters_from_list, jd_to_dict
 from Agentic_AI.schemas import CandidateResult, JD, ResumeParsed
-from Agentic_AI.reporting import build_candidate_report_pdf  # PDF report builder
+from Agentic_AI.profiling import profile_invoke, list_artifacts
 
 
 st.set_page_config(page_title="Resume Screening Agent", layout="wide")
 
-if "graph" not in st.session_state:
-    st.session_state["graph"] = build_agent_graph()
-graph = st.session_state["graph"]
+
+@st.cache_resource(show_spinner=False)
+def get_graph():
+    # Compiled on the first run rather than at page load (langgraph import
+    # dominates cold start), then shared by every session.
+    return build_agent_graph()
+
+
+# --- per-run derived data, cached by run_id (underscored args are not hashed) ---
+
+# Table columns shown in the UI, with their display names
+UI_COLUMNS = {
+    "resume_id": "resume_id",
+    "name": "name",
+    "rank_full": "Rank (full)",
+    "rank_blind": "Rank (blind)",
+    "CompositeScore": "CompositeScore",
+    "JDMatchScore": "JDMatchScore",
+    "SkillScore": "SkillScore",
+    "SemanticScore": "SemanticScore",
+    "ExperienceScore": "ExperienceScore",
+    "OutcomeScore": "OutcomeScore",
+    "RiskScore": "RiskScore",
+    "YearsExp": "YearsExp",
+    "MustHaveMet": "MustHaveMet",
+    "MustHaveTotal": "MustHaveTotal",
+    "MustHaveCoverage": "MustHaveCoverage",
+    "action": "Action",
+    "rank_delta": "RankDelta",
+}
+
+
+@st.cache_data(show_spinner=False)
+def results_frame(run_id: str, _table) -> pd.DataFrame:
+    """Arrow-backed view of the run's results table (no per-row copies)."""
+    df = to_frame(_table.select(list(UI_COLUMNS))).rename(columns=UI_COLUMNS)
+    if df["RankDelta"].isna().any():
+        df = df.drop(columns="RankDelta")
+    return df
+
+
+@st.cache_data(show_spinner=False)
+def results_parquet(run_id: str, _table) -> bytes:
+    return parquet_bytes(_table)
+
+
+@st.cache_data(show_spinner=False)
+def view_order(
+    run_id: str,
+    sort_by: str,
+    descending: bool,
+    min_coverage: float,
+    actions: Tuple[str, ...],
+    name_query: str,
+    _df: pd.DataFrame,
+) -> List[int]:
+    """Positions into full_results after filtering and sorting (done here, not in the browser)."""
+    mask = _df["MustHaveCoverage"] >= min_coverage - 1e-9
+    if actions:
+        mask &= _df["Action"].isin(actions)
+    if name_query:
+        mask &= _df["name"].str.contains(name_query, case=False, regex=False, na=False)
+    view = _df[mask]
+    if sort_by in view:
+        # Rank (full) breaks ties, so equal scores keep their ranking order
+        view = view.sort_values([sort_by, "Rank (full)"], ascending=[not descending, True], na_position="last")
+    return view.index.tolist()
+
+
+@st.cache_data(show_spinner=False)
+def perf_frame(run_id: str, _perf: dict) -> pd.DataFrame:
+    return pd.DataFrame(_perf["spans"])
+
+
+@st.cache_data(show_spinner=False)
+def candidate_report_pdf(run_id: str, resume_id: str, _candidate: CandidateResult, _jd: JD) -> bytes:
+    from Agentic_AI.reporting import build_candidate_report_pdf  # reportlab loads on first report
+
+    return build_candidate_report_pdf(_candidate, _jd)
+
+
+def invoke_with_live_rationales(invoke, state: AgentState):
+    """
+    Run invoke(state) on a worker thread while LLM rationale summaries and
+    actions stream into a placeholder, as soon as each field is complete.
+    """
+    events: "queue.Queue[Tuple[CandidateResult, dict]]" = queue.Queue()
+    state = {**state, "on_rationale": lambda c, fields: events.put((c, fields))}
+    panel = st.empty()
+    live = {}
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        future = pool.submit(invoke, state)
+        while not (future.done() and events.empty()):
+            try:
+                c, fields = events.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            live[c.resume.resume_id] = (c.resume.name, fields)
+            panel.markdown(
+                "**Writing rationales...**\n\n"
+                + "\n".join(
+                    f"- **{name}** · {f.get('action', '…')}: {f.get('summary', '…')}"
+                    for name, f in live.values()
+                )
+            )
+    panel.empty()
+    return future.result()
 
 
-def save_uploaded_files(files) -> List[str]:
-    paths = []
+def read_uploaded_files(files) -> List[Tuple[str, bytes]]:
+    """
+    (filename, bytes) for each upload; the graph parses these in memory.
+    Raw files are persisted to the content-addressed store in the background.
+    """
+    store = get_blob_store()
+    uploads = []
     for f in files:
-        dest = UPLOAD_DIR / f.name
-        with open(dest, "wb") as out:
-            out.write(f.getbuffer())
-        paths.append(str(dest))
-    return paths
+        data = f.getvalue()
+        store.put_async(data, f.name)
+        uploads.append((f.name, data))
+    return uploads
+
+
+def session_cache() -> ScoringCache:
+    # Per-session memo: re-running after a JD edit only redoes what changed
+    if "scoring_cache" not in st.session_state:
+        st.session_state["scoring_cache"] = ScoringCache()
+    return st.session_state["scoring_cache"]
+
+
+def session_precomputer() -> Optional[Precomputer]:
+    """Background parse / embed into the session cache (not used with a job server)."""
+    if not PRECOMPUTE_ENABLED or JOB_SERVER_URL:
+        return None
+    if "precompute" not in st.session_state:
+        st.session_state["precompute"] = Precomputer(session_cache())
+    return st.session_state["precompute"]
 
 
 st.title("Resume Screening Agent 👩‍💼🤖")
@@ -40,7 +177,7 @@ This tool is an **Agentic AI Resume Screener** powered by LangChain + LangGraph
 
 1. **Perceive** – parses the Job Description and resumes  
 2. **Plan** – applies weighted scoring on skills, semantic fit, experience, outcomes, risk  
-3. **Act** – ranks candidates, suggests Shortlist / Review / Escalate  
+3. **Act** – ranks candidates, suggests Shortlist / Review / Escalate / Reject  
 4. **Reason** – explains decisions with evidence  
 5. **Log & Analyze** – logs each run for audit and fairness analysis
 """
@@ -50,6 +187,9 @@ This tool is an **Agentic AI Resume Screener** powered by LangChain + LangGraph
 with st.sidebar:
     st.header("Step 1 · Paste Job Description")
     jd_text = st.text_area("Job Description", height=260)
+    precompute = session_precomputer()
+    if precompute is not None:
+        precompute.submit_jd(jd_text)
 
     st.header("Step 2 · Configure Scoring")
     skill_w = st.slider("Skill weight", 0.0, 1.0, DEFAULT_WEIGHTS["skill"], 0.05)
@@ -74,12 +214,28 @@ with st.sidebar:
         "risk": risk_w,
     }
 
+    st.header("Diagnostics")
+    profile_run = st.toggle(
+        "Profile next run (CPU + memory)",
+        value=PROFILE_RUNS,
+        help="Saves a cProfile dump and per-node allocation sites to data/profiles/<run_id>.",
+    )
+
 st.header("Step 3 · Upload Resumes")
 uploaded_files = st.file_uploader(
     "Upload candidate resumes (PDF/DOCX). For the demo, 3–10 resumes is ideal.",
     type=["pdf", "docx"],
     accept_multiple_files=True,
 )
+if precompute is not None:
+    # Start parsing + embedding now; the run only has to score them
+    precompute.submit_uploads([(f.name, f.getvalue()) for f in uploaded_files or []])
+    ready = precompute.status()
+    if ready["resumes_total"]:
+        st.caption(
+            f"Prepared in the background: {ready['resumes_ready']}/{ready['resumes_total']} resumes"
+            + (" · JD parsed" if ready["jd_ready"] else "")
+        )
 
 col_run, col_bias = st.columns([1, 1])
 run_clicked = col_run.button("Run Screening Agent")
@@ -90,214 +246,382 @@ if run_clicked:
         st.error("Please paste a Job Description.")
     elif not uploaded_files:
         st.error("Please upload at least one resume.")
+    elif JOB_SERVER_URL:
+        # Hand the run to the job server; the page polls below and the job ID
+        # in the URL lets a refreshed tab pick the results back up.
+        uploads = read_uploaded_files(uploaded_files)
+        client = JobClient(JOB_SERVER_URL, st.session_state.setdefault("client_id", uuid.uuid4().hex[:8]))
+        try:
+            submitted = client.submit(jd_text, uploads, weights)
+        except JobQueueFull as exc:
+            st.warning(f"The screening queue is full, please retry in {exc.retry_after:.0f}s.")
+        else:
+            st.query_params["job"] = submitted["job_id"]
     else:
         with st.spinner("Agent perceiving: parsing JD and resumes..."):
-            paths = save_uploaded_files(uploaded_files)
+            uploads = read_uploaded_files(uploaded_files)
+            if precompute is not None:
+                precompute.wait()
             # run LangGraph pipeline until rationales and log
+            run_id = uuid.uuid4().hex[:16]
             initial_state: AgentState = {
+                "run_id": run_id,
                 "jd_text": jd_text,
-                "resume_paths": paths,
+                "resume_files": uploads,
                 "weights": weights,
+                "scoring_cache": session_cache(),
             }
-            final_state: AgentState = graph.invoke(initial_state)
-
-        jd: JD = final_state["jd"]  # type: ignore
-        full_results: List[CandidateResult] = final_state["full_results"]  # type: ignore
-        blind_results: List[CandidateResult] = final_state["blind_results"]  # type: ignore
-
-        blind_rank_map = {c.resume.resume_id: c.rank_blind for c in blind_results}
-        for c in full_results:
-            c.rank_blind = blind_rank_map.get(c.resume.resume_id)
-
-        # JD summary
-        st.header("Agent View of the Role (JD Summary)")
-        jd_col1, jd_col2 = st.columns([2, 2])
-        with jd_col1:
-            st.subheader(jd.role_title)
-            st.write(
-                f"Experience: {jd.min_years_experience}–{jd.max_years_experience} years"
-            )
-            if jd.locations:
-                st.write(f"Preferred locations: {', '.join(jd.locations)}")
-            st.write(f"Employment type: {jd.employment_type}")
-            st.markdown("**Must-have skills:**")
-            st.write(
-                ", ".join(jd.must_have_skills) if jd.must_have_skills else "Not detected"
-            )
-            st.markdown("**Nice-to-have skills:**")
-            st.write(
-                ", ".join(jd.nice_to_have_skills)
-                if jd.nice_to_have_skills
-                else "Not detected"
-            )
-
-        with jd_col2:
-            st.markdown("**Key outcomes expected:**")
-            if jd.key_outcomes:
-                for o in jd.key_outcomes:
-                    st.markdown(f"- {o}")
-            else:
-                st.write("Not explicitly specified.")
-            st.markdown(
-                "**Risk flags from JD (potential bias / unrealistic asks):**"
-            )
-            if jd.risk_flags:
-                for rf in jd.risk_flags:
-                    st.warning(rf)
-            else:
-                st.info("No obvious risk flags detected.")
-
-        # Build DataFrame for stats
-        st.header("Step 4 · Ranking Overview & Statistics")
-        rows = []
-        for c in full_results:
-            s = c.scores
-            must_hits = getattr(s, "must_have_hits", [])
-            must_miss = getattr(s, "must_have_miss", [])
-            rows.append(
-                {
-                    "resume_id": c.resume.resume_id,
-                    "name": c.resume.name,
-                    "Rank (full)": c.rank_full,
-                    "Rank (blind)": c.rank_blind,
-                    "CompositeScore": s.composite_score,
-                    "JDMatchScore": getattr(s, "jd_match_score", 0.0),
-                    "SkillScore": s.skill_score,
-                    "SemanticScore": s.semantic_score,
-                    "ExperienceScore": s.experience_score,
-                    "OutcomeScore": s.outcome_score,
-                    "RiskScore": s.risk_score,
-                    "YearsExp": getattr(s, "years_experience", 0.0),
-                    "MustHaveMet": len(must_hits),
-                    "MustHaveTotal": len(must_hits) + len(must_miss),
-                }
-            )
-        df = pd.DataFrame(rows)
-
-        m1, m2, m3, m4 = st.columns(4)
-        with m1:
-            st.metric("Total candidates", len(df))
-        with m2:
-            st.metric("Avg composite score", f"{df['CompositeScore'].mean():.3f}")
-        with m3:
-            if (df["MustHaveTotal"] > 0).any():
-                pct_meet_all = (
-                    (df["MustHaveMet"] == df["MustHaveTotal"]).mean() * 100
+            graph = get_graph()
+            profile_dir = None
+            if profile_run:
+                final_state, profile_dir = invoke_with_live_rationales(
+                    lambda state: profile_invoke(graph, state, run_id), initial_state
                 )
             else:
-                pct_meet_all = 0.0
-            st.metric("% meeting all must-haves", f"{pct_meet_all:.1f}%")
-        with m4:
-            st.metric("Avg JDMatchScore", f"{df['JDMatchScore'].mean():.3f}")
-
-        st.subheader("Ranked Candidates (table view)")
-        st.dataframe(
-            df.sort_values("Rank (full)").reset_index(drop=True),
-            use_container_width=True,
+                final_state = invoke_with_live_rationales(graph.invoke, initial_state)
+
+        # Keep the results across reruns (downloads, expanders, widget changes)
+        perf = final_state.get("perf")
+        st.session_state["last_run"] = {
+            "run_id": run_id,
+            "jd": final_state["jd"],
+            "full_results": final_state["full_results"],
+            "results_table": final_state["results_table"],
+            "duplicate_clusters": final_state.get("duplicate_clusters", []),
+            "jd_changes": final_state.get("jd_changes") or [],
+            "perf": perf.to_dict() if perf is not None else None,
+            "rationale_stats": dataclasses.asdict(final_state["rationale_stats"]),
+            "profile_dir": profile_dir,
+        }
+
+job_id = st.query_params.get("job")
+if JOB_SERVER_URL and job_id:
+    client = JobClient(JOB_SERVER_URL, st.session_state.get("client_id", ""))
+    try:
+        status = client.status(job_id)
+    except Exception:  # noqa: BLE001 - unknown/expired job or server restarted
+        status = {"state": "failed", "error": "job not found on the job server"}
+    if status["state"] in ("queued", "running"):
+        if status["state"] == "queued":
+            st.info(f"Job {job_id} queued (position {status.get('position')}).")
+        else:
+            st.info(f"Job {job_id} running on the job server...")
+            try:
+                _, partial, summary = client.results(job_id, limit=10)
+            except Exception:  # noqa: BLE001 - the job may finish or expire between polls
+                partial, summary = [], {}
+            if partial:
+                st.caption(
+                    f"Partial ranking: top {len(partial)} of {summary['total']} scored "
+                    f"({status.get('n_resumes')} resumes), rationales pending"
+                )
+                st.table(
+                    [{"Candidate": c.resume.name, "Composite score": round(c.scores.composite_score, 3)} for c in partial]
+                )
+        time.sleep(1.0)
+        st.rerun()
+    elif status["state"] == "done":
+        if st.session_state.get("last_run", {}).get("run_id") != job_id:
+            job_jd, job_results, summary = client.results(job_id)
+            st.session_state["last_run"] = {
+                "run_id": job_id,
+                "jd": job_jd,
+                "full_results": job_results,
+                "results_table": results_table(job_results),
+                "duplicate_clusters": clusters_from_list(summary.get("duplicate_clusters", [])),
+                "jd_changes": [],
+                "perf": summary.get("perf"),
+                "rationale_stats": summary.get("rationale_stats"),
+                "profile_dir": None,
+            }
+    else:
+        st.error(f"Job {job_id} {status['state']}: {status.get('error')}")
+        del st.query_params["job"]
+
+last_run = st.session_state.get("last_run")
+if last_run is not None:
+    run_id: str = last_run["run_id"]
+    jd: JD = last_run["jd"]
+    full_results: List[CandidateResult] = last_run["full_results"]
+    profile_dir = last_run["profile_dir"]
+
+    # JD summary
+    st.header("Agent View of the Role (JD Summary)")
+    jd_changes = last_run.get("jd_changes", [])
+    if jd_changes and len(jd_changes) < len(dataclasses.fields(JD)):
+        st.caption(
+            "Changed since the previous run: " + ", ".join(jd_changes)
+            + " — only the affected scores were recomputed."
+        )
+    jd_col1, jd_col2 = st.columns([2, 2])
+    with jd_col1:
+        st.subheader(jd.role_title)
+        st.write(
+            f"Experience: {jd.min_years_experience}–{jd.max_years_experience} years"
+        )
+        if jd.locations:
+            st.write(f"Preferred locations: {', '.join(jd.locations)}")
+        st.write(f"Employment type: {jd.employment_type}")
+        st.markdown("**Must-have skills:**")
+        st.write(
+            ", ".join(jd.must_have_skills) if jd.must_have_skills else "Not detected"
+        )
+        st.markdown("**Nice-to-have skills:**")
+        st.write(
+            ", ".join(jd.nice_to_have_skills)
+            if jd.nice_to_have_skills
+            else "Not detected"
         )
 
-        st.subheader("Score Distributions")
-        sc1, sc2 = st.columns(2)
-        with sc1:
-            st.bar_chart(df[["CompositeScore"]])
-        with sc2:
-            st.bar_chart(df[["SkillScore", "SemanticScore", "ExperienceScore"]])
-
-        st.subheader("Fairness: rank change in blind mode")
-        if df["Rank (blind)"].notna().all():
-            df["RankDelta"] = df["Rank (blind)"] - df["Rank (full)"]
-            st.bar_chart(df[["RankDelta"]])
+    with jd_col2:
+        st.markdown("**Key outcomes expected:**")
+        if jd.key_outcomes:
+            for o in jd.key_outcomes:
+                st.markdown(f"- {o}")
+        else:
+            st.write("Not explicitly specified.")
+        st.markdown(
+            "**Risk flags from JD (potential bias / unrealistic asks):**"
+        )
+        if jd.risk_flags:
+            for rf in jd.risk_flags:
+                st.warning(rf)
+        else:
+            st.info("No obvious risk flags detected.")
+
+    # Build DataFrame for stats
+    st.header("Step 4 · Ranking Overview & Statistics")
+    df = results_frame(run_id, last_run["results_table"])
+
+    m1, m2, m3, m4 = st.columns(4)
+    with m1:
+        st.metric("Total candidates", len(df))
+    with m2:
+        st.metric("Avg composite score", f"{df['CompositeScore'].mean():.3f}")
+    with m3:
+        if (df["MustHaveTotal"] > 0).any():
+            pct_meet_all = (
+                (df["MustHaveMet"] == df["MustHaveTotal"]).mean() * 100
+            )
+        else:
+            pct_meet_all = 0.0
+        st.metric("% meeting all must-haves", f"{pct_meet_all:.1f}%")
+    with m4:
+        st.metric("Avg JDMatchScore", f"{df['JDMatchScore'].mean():.3f}")
+
+    st.subheader("Ranked Candidates (table view)")
+    f1, f2, f3, f4 = st.columns([1.2, 0.8, 1.2, 1.2])
+    sort_by = f1.selectbox(
+        "Sort by",
+        ["Rank (full)", "CompositeScore", "JDMatchScore", "MustHaveCoverage", "SkillScore",
+         "SemanticScore", "ExperienceScore", "YearsExp", "RankDelta"],
+    )
+    descending = f2.toggle("Descending", value=sort_by != "Rank (full)")
+    min_coverage = f3.slider("Min must-have coverage", 0, 100, 0, 10, format="%d%%") / 100
+    name_query = f4.text_input("Name contains")
+    action_options = sorted(a for a in df["Action"].dropna().unique())
+    actions = tuple(st.multiselect("Recommended action", action_options)) if action_options else ()
+    order = view_order(run_id, sort_by, descending, min_coverage, actions, name_query, df)
+
+    st.caption(f"{len(order)} of {len(df)} candidates match the filters.")
+    st.dataframe(df.loc[order].reset_index(drop=True), use_container_width=True)
+    st.download_button(
+        "Download results (Parquet)",
+        data=results_parquet(run_id, last_run["results_table"]),
+        file_name=f"results_{run_id}.parquet",
+        mime="application/vnd.apache.parquet",
+    )
+
+    clusters = last_run["duplicate_clusters"]
+    if clusters:
+        collapsed = sum(len(c.member_ids) - 1 for c in clusters)
+        with st.expander(f"Near-duplicate resumes ({collapsed} collapsed into {len(clusters)} clusters)"):
             st.caption(
-                "Positive RankDelta = candidate moved down when PII removed; negative = moved up."
+                "Copies of the same resume were scored once; the longest copy represents each cluster."
+            )
+            names = {c.resume.resume_id: c.resume.name for c in full_results}
+            st.table(
+                pd.DataFrame(
+                    [
+                        {
+                            "Scored as": names.get(c.representative_id, c.representative_id),
+                            "Copies": len(c.member_ids),
+                            "Members": " | ".join(c.member_names),
+                            "Min similarity": round(c.min_similarity, 2),
+                        }
+                        for c in clusters
+                    ]
+                )
             )
 
-        # Candidate cards
-        st.header("Step 5 · Candidate Cards (Reasoning, Actions & Reports)")
-        for c in full_results:
-            s = c.scores
-            must_hits = getattr(s, "must_have_hits", [])
-            must_miss = getattr(s, "must_have_miss", [])
-            nice_hits = getattr(s, "nice_to_have_hits", [])
-            jd_match = getattr(s, "jd_match_score", 0.0)
-            years = getattr(s, "years_experience", 0.0)
-
-            with st.container():
-                st.markdown("---")
-                left, right = st.columns([1.5, 2])
-
-                with left:
-                    st.markdown(f"### {c.resume.name}")
-                    st.caption(f"Resume ID: {c.resume.resume_id}")
-                    st.write(f"Email: {c.resume.email or 'N/A'}")
-                    st.write(f"Phone: {c.resume.phone or 'N/A'}")
-
-                    st.metric("Rank (full)", c.rank_full)
-                    if c.rank_blind is not None:
-                        delta = c.rank_blind - (c.rank_full or 0)
-                        st.metric("Rank (blind)", c.rank_blind, delta=delta)
-
-                    st.write(f"Composite Score: **{s.composite_score:.3f}**")
-                    st.write(f"JDMatchScore: **{jd_match:.3f}**")
-                    st.write(
-                        f"Skill: {s.skill_score:.3f} | Semantic: {s.semantic_score:.3f} | "
-                        f"Exp: {s.experience_score:.3f} | Outcome: {s.outcome_score:.3f} | "
-                        f"Risk: {s.risk_score:.3f}"
-                    )
-                    st.write(f"Estimated years of experience: {years:.1f}")
-
-                    st.markdown("**Must-have skills coverage:**")
-                    total_must = len(must_hits) + len(must_miss)
-                    st.write(f"Met: {len(must_hits)} / {total_must}")
-                    if must_hits:
-                        st.caption("Matched: " + ", ".join(must_hits))
-                    if must_miss:
-                        st.caption("Missing: " + ", ".join(must_miss))
-
-                    if nice_hits:
-                        st.markdown("**Nice-to-have skills matched:**")
-                        st.caption(", ".join(nice_hits))
-
-                    if c.rationale:
-                        st.markdown("**Agent Recommendation:**")
-                        st.write(f"Action: **{c.rationale.get('action', 'Review')}**")
-                        st.write(f"Confidence: {c.rationale.get('confidence', 0.0):.2f}")
-
-                    # —— PDF export button ——
-                    pdf_bytes = build_candidate_report_pdf(c, jd)
+    st.subheader("Score Distributions")
+    sc1, sc2 = st.columns(2)
+    with sc1:
+        st.bar_chart(df[["CompositeScore"]])
+    with sc2:
+        st.bar_chart(df[["SkillScore", "SemanticScore", "ExperienceScore"]])
+
+    st.subheader("Fairness: rank change in blind mode")
+    if "RankDelta" in df:
+        st.bar_chart(df[["RankDelta"]])
+        st.caption(
+            "Positive RankDelta = candidate moved down when PII removed; negative = moved up."
+        )
+
+    # Candidate cards: only the current page is built
+    st.header("Step 5 · Candidate Cards (Reasoning, Actions & Reports)")
+    p1, p2 = st.columns([1, 1])
+    page_size = p1.selectbox("Cards per page", [10, 25, 50], index=0)
+    n_pages = max(1, -(-len(order) // page_size))
+    page = p2.number_input(f"Page (of {n_pages})", min_value=1, max_value=n_pages, value=1, step=1)
+    page_items = [full_results[i] for i in order[(page - 1) * page_size: page * page_size]]
+    pdf_ready = st.session_state.setdefault("pdf_ready", set())
+    for c in page_items:
+        s = c.scores
+        must_hits = getattr(s, "must_have_hits", [])
+        must_miss = getattr(s, "must_have_miss", [])
+        nice_hits = getattr(s, "nice_to_have_hits", [])
+        jd_match = getattr(s, "jd_match_score", 0.0)
+        years = getattr(s, "years_experience", 0.0)
+
+        with st.container():
+            st.markdown("---")
+            left, right = st.columns([1.5, 2])
+
+            with left:
+                st.markdown(f"### {c.resume.name}")
+                st.caption(f"Resume ID: {c.resume.resume_id}")
+                st.write(f"Email: {c.resume.email or 'N/A'}")
+                st.write(f"Phone: {c.resume.phone or 'N/A'}")
+
+                st.metric("Rank (full)", c.rank_full)
+                if c.rank_blind is not None:
+                    delta = c.rank_blind - (c.rank_full or 0)
+                    st.metric("Rank (blind)", c.rank_blind, delta=delta)
+
+                st.write(f"Composite Score: **{s.composite_score:.3f}**")
+                st.write(f"JDMatchScore: **{jd_match:.3f}**")
+                st.write(
+                    f"Skill: {s.skill_score:.3f} | Semantic: {s.semantic_score:.3f} | "
+                    f"Exp: {s.experience_score:.3f} | Outcome: {s.outcome_score:.3f} | "
+                    f"Risk: {s.risk_score:.3f}"
+                )
+                st.write(f"Estimated years of experience: {years:.1f}")
+
+                st.markdown("**Must-have skills coverage:**")
+                total_must = len(must_hits) + len(must_miss)
+                st.write(f"Met: {len(must_hits)} / {total_must}")
+                if must_hits:
+                    st.caption("Matched: " + ", ".join(must_hits))
+                if must_miss:
+                    st.caption("Missing: " + ", ".join(must_miss))
+
+                if nice_hits:
+                    st.markdown("**Nice-to-have skills matched:**")
+                    st.caption(", ".join(nice_hits))
+
+                if c.rationale:
+                    st.markdown("**Agent Recommendation:**")
+                    st.write(f"Action: **{c.rationale.get('action', 'Review')}**")
+                    st.write(f"Confidence: {c.rationale.get('confidence', 0.0):.2f}")
+
+                # —— PDF export button (report is built on request) ——
+                pdf_key = (run_id, c.resume.resume_id)
+                if pdf_key not in pdf_ready and st.button(
+                    "Prepare candidate report (PDF)", key=f"prep_{c.resume.resume_id}"
+                ):
+                    pdf_ready.add(pdf_key)
+                if pdf_key in pdf_ready:
+                    pdf_bytes = candidate_report_pdf(run_id, c.resume.resume_id, c, jd)
                     safe_name = c.resume.name.replace(" ", "_") or "candidate"
                     st.download_button(
                         label="Download candidate report (PDF)",
                         data=pdf_bytes,
                         file_name=f"{safe_name}_report.pdf",
                         mime="application/pdf",
+                        key=f"pdf_{c.resume.resume_id}",
                     )
 
-                with right:
-                    st.markdown("**Agent Rationale & Evidence**")
-                    if c.rationale:
-                        st.write(c.rationale.get("summary", ""))
-                        for ev in c.rationale.get("evidence", []):
-                            with st.expander(
-                                f"{ev.get('score_dimension', 'dimension')} · {ev.get('source', 'source')}"
-                            ):
-                                st.write(ev.get("text", "")[:1200])
-                    else:
-                        st.info("No rationale generated for this candidate.")
-
-                    st.markdown("**Resume Snippets**")
-                    if "summary" in c.resume.sections:
-                        with st.expander("Summary section"):
-                            st.write(c.resume.sections["summary"][:1000])
-                    if "experience" in c.resume.sections:
-                        with st.expander("Experience section"):
-                            st.write(c.resume.sections["experience"][:1000])
-                    if "skills" in c.resume.sections:
-                        with st.expander("Skills section"):
-                            st.write(c.resume.sections["skills"][:1000])
-
-        st.success("Run logged to data/logs/runs.jsonl.")
-
-if bias_clicked:
+            with right:
+                st.markdown("**Agent Rationale & Evidence**")
+                if c.rationale:
+                    st.write(c.rationale.get("summary", ""))
+                    for ev in c.rationale.get("evidence", []):
+                        with st.expander(
+                            f"{ev.get('score_dimension', 'dimension')} · {ev.get('source', 'source')}"
+                        ):
+                            st.write(ev.get("text", "")[:1200])
+                else:
+                    st.info("No rationale generated for this candidate.")
+
+                st.markdown("**Resume Snippets**")
+                if "summary" in c.resume.sections:
+                    with st.expander("Summary section"):
+                        st.write(c.resume.sections["summary"][:1000])
+                if "experience" in c.resume.sections:
+                    with st.expander("Experience section"):
+                        st.write(c.resume.sections["experience"][:1000])
+                if "skills" in c.resume.sections:
+                    with st.expander("Skills section"):
+                        st.write(c.resume.sections["skills"][:1000])
+
+    perf_dict = last_run["perf"]
+    if perf_dict is not None:
+        with st.expander("Performance"):
+            st.caption(f"Total wall time: {perf_dict['elapsed_ms'] / 1000:.2f}s")
+            rstats = last_run.get("rationale_stats")
+            if rstats:
+                templated = rstats["template_shortlist"] + rstats["template_reject"] + rstats["template_over_budget"]
+                saved = rstats["est_seconds_saved"]
+                st.caption(
+                    f"Rationales: {rstats['llm_candidates']} by LLM in {rstats['llm_calls']} call(s) "
+                    f"({rstats['reused']} reused), {templated} from templates"
+                    + (f", ~{saved:.1f}s of LLM time saved" if saved else "")
+                )
+            perf_df = perf_frame(run_id, perf_dict)
+            if not perf_df.empty:
+                st.dataframe(
+                    perf_df[
+                        [
+                            "parent",
+                            "name",
+                            "calls",
+                            "wall_ms",
+                            "max_ms",
+                            "items",
+                            "prompt_tokens",
+                            "completion_tokens",
+                            "cache_hits",
+                        ]
+                    ],
+                    use_container_width=True,
+                )
+
+    if profile_dir is not None:
+        with st.expander("Profiling artifacts"):
+            st.caption(f"Saved to {profile_dir}")
+            for artifact in list_artifacts(profile_dir):
+                st.download_button(
+                    label=f"Download {artifact.name}",
+                    data=artifact.read_bytes(),
+                    file_name=f"{run_id}_{artifact.name}",
+                    key=f"profile_{artifact.name}",
+                )
+
+    st.success(f"Run {run_id} logged to data/logs/runs.jsonl.")
+
+if bias_clicked and last_run is None:
     st.info(
         "Run the screening first; fairness uses the parsed JD and resumes from the last run."
     )
+elif last_run is not None and (bias_clicked or last_run.get("bias_notes")):
+    st.header("Bias & Fairness Insights")
+    if bias_clicked:
+        # Rendered token by token; kept for reruns
+        last_run["bias_notes"] = st.write_stream(
+            stream_bias_notes_llm(
+                jd_to_dict(last_run["jd"]), [c.resume.raw_text[:2000] for c in last_run["full_results"]]
+            )
+        )
+    else:
+        st.markdown(last_run["bias_notes"])
@@ -0,0 +1,137 @@
+"""
+Cold-start import-time check for the Agentic_AI package and the Streamlit
+app script (app/app.py, imported as `app`: a cold page load).
+
+Each module is imported in a fresh interpreter (best of --repeat runs) and
+the interpreter is then inspected for heavy dependencies that should only
+load on first use (langgraph, langchain, pdfplumber, reportlab, ...).
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --budget-ms 400 --save-baseline
+    python -m benchmarks.import_time --baseline benchmarks/import_baseline.json
+
+Exits non-zero when a module exceeds --budget-ms, pulls in a lazy
+dependency at import time, creates data directories, or (with --baseline)
+is slower than the baseline by more than --tolerance.
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+APP_DIR = ROOT / "app"
+DEFAULT_BASELINE = ROOT / "benchmarks" / "import_baseline.json"
+
+MODULES = [
+    "Agentic_AI.config",
+    "Agentic_AI.scoring",
+    "Agentic_AI.graph",
+    "Agentic_AI.batch",
+    "app",
+]
+
+# Per-module budgets overriding --budget-ms: streamlit + pandas alone take
+# ~700 ms cold, so the app is held to its own (larger) budget
+BUDGETS_MS = {"app": 1500.0}
+
+# Must not be imported as a side effect of importing the package
+LAZY_DEPENDENCIES = [
+    "langgraph",
+    "langchain_openai",
+    "langchain_core",
+    "openai",
+    "jsonschema",
+    "pdfplumber",
+    "docx2txt",
+    "reportlab",
+]
+
+_PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - t0
+print(json.dumps({{"ms": elapsed * 1000, "modules": sorted(sys.modules)}}))
+"""
+
+
+def measure(module: str, repeat: int) -> Dict:
+    """Best-of-`repeat` import time of `module` in a fresh interpreter."""
+    best = None
+    loaded: List[str] = []
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, "-c", _PROBE.format(module=module)],
+            cwd=APP_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        if best is None or result["ms"] < best:
+            best = result["ms"]
+            loaded = result["modules"]
+    heavy = sorted(
+        dep for dep in LAZY_DEPENDENCIES
+        if any(m == dep or m.startswith(dep + ".") for m in loaded)
+    )
+    return {"module": module, "import_ms": best, "lazy_loaded": heavy}
+
+
+def _data_dir_snapshot() -> set:
+    data_dir = ROOT / "data"
+    return {p for p in data_dir.iterdir()} if data_dir.exists() else set()
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Package import-time check")
+    parser.add_argument("--modules", nargs="+", default=MODULES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=500.0, help="Max import time per module")
+    parser.add_argument("--baseline", type=Path, help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help=f"Write results to {DEFAULT_BASELINE}")
+    parser.add_argument("--tolerance", type=float, default=0.5, help="Allowed slowdown vs baseline (0.5 = 50%%)")
+    args = parser.parse_args(argv)
+
+    before = _data_dir_snapshot()
+    results = [measure(m, args.repeat) for m in args.modules]
+    created = _data_dir_snapshot() - before
+
+    failures: List[str] = []
+    print(f"{'module':<24} {'import_ms':>10}  lazy deps loaded")
+    for r in results:
+        print(f"{r['module']:<24} {r['import_ms']:>10.1f}  {', '.join(r['lazy_loaded']) or '-'}")
+        budget = BUDGETS_MS.get(r["module"], args.budget_ms)
+        if r["import_ms"] > budget:
+            failures.append(f"{r['module']}: {r['import_ms']:.0f} ms > budget {budget:.0f} ms")
+        if r["lazy_loaded"]:
+            failures.append(f"{r['module']}: imports {', '.join(r['lazy_loaded'])} eagerly")
+    if created:
+        failures.append(f"importing created {', '.join(sorted(p.name for p in created))} under data/")
+
+    if args.baseline:
+        baseline = {r["module"]: r for r in json.loads(args.baseline.read_text(encoding="utf-8"))["modules"]}
+        for r in results:
+            base = baseline.get(r["module"])
+            if base and r["import_ms"] > base["import_ms"] * (1 + args.tolerance):
+                failures.append(
+                    f"{r['module']}: {r['import_ms']:.0f} ms vs baseline {base['import_ms']:.0f} ms"
+                )
+    if args.save_baseline:
+        DEFAULT_BASELINE.write_text(json.dumps({"modules": results}, indent=2), encoding="utf-8")
+        print(f"Baseline saved to {DEFAULT_BASELINE}")
+
+    if failures:
+        print("\nFAILED:")
+        for f in failures:
+            print("  " + f)
+        return 1
+    print("\nOK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,421 @@
+"""
+Load test: N concurrent simulated recruiters running screenings.
+
+    python -m benchmarks.load_test --users 1 5 10 20 --runs-per-user 3 --latency 0.2
+    python -m benchmarks.load_test --target job-server --users 5 10 --job-workers 2
+    python -m benchmarks.load_test --users 10 --error-rate 0.05 --baseline benchmarks/load_baseline.json
+
+Chat calls (and embeddings with --embed-backend openai) go to the local stub
+server (benchmarks/stub_openai_server.py) through the real clients and the
+shared scheduler, with injected latency, 429s and 500s. Each simulated user runs
+its own JD against its own sample of PDF / DOCX resumes, back to back,
+through one front end:
+
+    graph       build_agent_graph().invoke in threads of this process (like
+                concurrent Streamlit sessions, each with its own session cache)
+    job-server  JobClient against an in-process job server and its worker pool
+    cli         one `python -m Agentic_AI.batch` process per run
+
+For each concurrency level it reports throughput (runs/s, resumes/s),
+end-to-end and per-stage p50/p95/p99 latency (from each run's spans), the
+failed-run rate, injected server errors, scheduler retries, and whether
+every run's entry made it intact into the run log. Results are
+written as JSON; with --baseline the run exits non-zero when throughput at
+any level drops by more than --tolerance, and with --max-error-rate when
+too many runs fail.
+
+All run output (run log, results tables, checkpoints, embedding and feature
+stores, spills) goes to a temporary DATA_DIR that is deleted afterwards, so
+load runs never touch data/ or each other's baselines.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "app"))
+
+from benchmarks.run_benchmarks import RESULTS_DIR, _percentiles, compare  # noqa: E402
+from benchmarks.stub_openai_server import Limits, start_server  # noqa: E402
+from benchmarks.synthetic import generate_corpus, generate_jds  # noqa: E402
+
+TARGETS = ("graph", "job-server", "cli")
+
+
+def _stage_ms(spans: List[Dict]) -> Dict[str, float]:
+    """Wall time per span name for one run (summed over calls and parents)."""
+    totals: Dict[str, float] = defaultdict(float)
+    for s in spans:
+        totals[s["name"]] += s["wall_ms"]
+    return dict(totals)
+
+
+def _run_record(user: int, run_id: Optional[str], seconds: float, n_resumes: int,
+                spans: Optional[List[Dict]] = None, error: Optional[str] = None) -> Dict:
+    return {
+        "user": user,
+        "run_id": run_id,
+        "ok": error is None,
+        "error": error,
+        "seconds": seconds,
+        "resumes": n_resumes,
+        "stages": _stage_ms(spans or []),
+    }
+
+
+# --- front ends: each runs one screening and returns a run record ---
+
+
+class GraphTarget:
+    """In-process graph, one ScoringCache per user (as the app keeps per session)."""
+
+    def __init__(self):
+        from Agentic_AI.graph import build_agent_graph
+
+        self.graph = build_agent_graph()
+        self.caches: Dict[int, object] = {}
+
+    def run(self, user: int, jd_text: str, files: List[Tuple[str, bytes]], paths: List[str]) -> Dict:
+        from Agentic_AI.config import DEFAULT_WEIGHTS
+        from Agentic_AI.incremental import ScoringCache
+
+        run_id = f"load-{uuid.uuid4().hex[:12]}"
+        cache = self.caches.setdefault(user, ScoringCache())
+        t0 = time.perf_counter()
+        try:
+            final_state = self.graph.invoke({
+                "run_id": run_id,
+                "jd_text": jd_text,
+                "resume_files": files,
+                "weights": dict(DEFAULT_WEIGHTS),
+                "scoring_cache": cache,
+            })
+        except Exception as exc:  # noqa: BLE001 - a failed run is a data point
+            return _run_record(user, run_id, time.perf_counter() - t0, len(files), error=repr(exc))
+        perf = final_state.get("perf")
+        return _run_record(user, run_id, time.perf_counter() - t0, len(files), perf.spans() if perf else [])
+
+    def close(self) -> None:
+        pass
+
+
+class JobServerTarget:
+    """Job server (HTTP + fair queue + worker processes) started in this process."""
+
+    def __init__(self, workers: int, queue_depth: int, poll_s: float = 0.2):
+        from Agentic_AI.job_server import JobManager, start_server as start_job_server
+
+        self.manager = JobManager(workers=workers, queue_depth=queue_depth)
+        self.server, self.url = start_job_server(0, self.manager)
+        self.poll_s = poll_s
+        self.queue_full = 0
+
+    def run(self, user: int, jd_text: str, files: List[Tuple[str, bytes]], paths: List[str]) -> Dict:
+        from Agentic_AI.config import DEFAULT_WEIGHTS
+        from Agentic_AI.job_client import JobClient, JobQueueFull
+
+        client = JobClient(self.url, client_id=f"user{user}")
+        t0 = time.perf_counter()
+        job_id = None
+        try:
+            while job_id is None:
+                try:
+                    job_id = client.submit(jd_text, files, dict(DEFAULT_WEIGHTS))["job_id"]
+                except JobQueueFull as exc:
+                    self.queue_full += 1
+                    time.sleep(min(exc.retry_after, 1.0))
+            while True:
+                status = client.status(job_id)
+                if status["state"] not in ("queued", "running"):
+                    break
+                time.sleep(self.poll_s)
+            if status["state"] != "done":
+                raise RuntimeError(status.get("error") or status["state"])
+            _, _, summary = client.results(job_id)
+        except Exception as exc:  # noqa: BLE001
+            return _run_record(user, job_id, time.perf_counter() - t0, len(files), error=repr(exc))
+        seconds = time.perf_counter() - t0
+        spans = list((summary.get("perf") or {}).get("spans", []))
+        if status.get("started_at") and status.get("submitted_at"):
+            spans.append({"name": "queue_wait", "wall_ms": (status["started_at"] - status["submitted_at"]) * 1000})
+        return _run_record(user, job_id, seconds, len(files), spans)
+
+    def close(self) -> None:
+        self.server.shutdown()
+        self.manager.close()
+
+
+class CliTarget:
+    """One batch CLI process per run (cold start included)."""
+
+    def __init__(self, workdir: Path):
+        self.workdir = workdir
+
+    def run(self, user: int, jd_text: str, files: List[Tuple[str, bytes]], paths: List[str]) -> Dict:
+        from Agentic_AI.checkpoint import RunCheckpoint
+
+        run_id = f"load-{uuid.uuid4().hex[:12]}"
+        jd_path = self.workdir / f"{run_id}.txt"
+        jd_path.write_text(jd_text, encoding="utf-8")
+        cmd = [sys.executable, "-m", "Agentic_AI.batch", "--jd", str(jd_path), "--resumes", *paths, "--run-id", run_id]
+        t0 = time.perf_counter()
+        proc = subprocess.run(cmd, cwd=ROOT / "app", capture_output=True, text=True)
+        seconds = time.perf_counter() - t0
+        RunCheckpoint(run_id).clear()  # one-off runs, nothing to resume
+        if proc.returncode != 0:
+            tail = (proc.stderr.strip().splitlines() or ["exit %d" % proc.returncode])[-1]
+            return _run_record(user, run_id, seconds, len(paths), error=tail)
+        entry = _log_entries({run_id}).get(run_id) or {}
+        return _run_record(user, run_id, seconds, len(paths), (entry.get("performance") or {}).get("spans", []))
+
+    def close(self) -> None:
+        pass
+
+
+# --- runs.jsonl integrity ---
+
+
+def _log_entries(run_ids: set, offset: int = 0) -> Dict[str, Dict]:
+    from Agentic_AI.storage import RUNS_LOG
+
+    found = {}
+    if not RUNS_LOG.exists():
+        return found
+    with RUNS_LOG.open("rb") as f:
+        f.seek(offset)
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if entry.get("run_id") in run_ids:
+                found[entry["run_id"]] = entry
+    return found
+
+
+def _log_check(offset: int, run_ids: set) -> Dict[str, int]:
+    """Entries appended since `offset`: how many are unparseable, and which runs have none."""
+    from Agentic_AI.storage import RUNS_LOG
+
+    corrupt = 0
+    if RUNS_LOG.exists():
+        with RUNS_LOG.open("rb") as f:
+            f.seek(offset)
+            for line in f:
+                try:
+                    json.loads(line)
+                except ValueError:
+                    corrupt += 1
+    return {"log_lines_corrupt": corrupt, "log_entries_missing": len(run_ids - set(_log_entries(run_ids, offset)))}
+
+
+def _log_size() -> int:
+    from Agentic_AI.storage import RUNS_LOG
+
+    return RUNS_LOG.stat().st_size if RUNS_LOG.exists() else 0
+
+
+# --- one concurrency level ---
+
+
+def run_level(users: int, target, args, paths: List[str], blobs: Dict[str, bytes], limits: Limits) -> Dict:
+    from Agentic_AI.scheduler import get_scheduler
+
+    rng = random.Random(args.seed + users)
+    jds = generate_jds(users * args.runs_per_user, seed=args.seed + users)
+    work = [
+        (u, jds[u * args.runs_per_user + i], rng.sample(paths, min(args.resumes_per_run, len(paths))))
+        for u in range(users)
+        for i in range(args.runs_per_user)
+    ]
+    by_user: Dict[int, list] = defaultdict(list)
+    for u, jd_text, sample in work:
+        by_user[u].append((jd_text, sample))
+
+    server_before = dict(limits.counts)
+    sched_before = get_scheduler("chat").snapshot()
+    log_offset = _log_size()
+    records: List[Dict] = []
+    lock = threading.Lock()
+
+    def user_loop(u: int) -> None:
+        for jd_text, sample in by_user[u]:
+            files = [(Path(p).name, blobs[p]) for p in sample]
+            record = target.run(u, jd_text, files, sample)
+            with lock:
+                records.append(record)
+            if args.think_time:
+                time.sleep(rng.uniform(0, 2 * args.think_time))
+
+    t0 = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=users) as pool:
+        list(pool.map(user_loop, range(users)))
+    elapsed = time.perf_counter() - t0
+
+    ok = [r for r in records if r["ok"]]
+    stage_samples: Dict[str, List[float]] = defaultdict(list)
+    for r in ok:
+        for name, ms in r["stages"].items():
+            stage_samples[name].append(ms / 1000)
+    sched_after = get_scheduler("chat").snapshot()
+    level = {
+        "stage": "runs",  # compare() keys on (stage, scale)
+        "scale": users,
+        "users": users,
+        "target": args.target,
+        "runs": len(records),
+        "failed": len(records) - len(ok),
+        "error_rate": (len(records) - len(ok)) / max(len(records), 1),
+        "errors": sorted({r["error"] for r in records if r["error"]})[:5],
+        "seconds": elapsed,
+        "items_per_sec": len(ok) / elapsed if elapsed > 0 else 0.0,
+        "resumes_per_sec": sum(r["resumes"] for r in ok) / elapsed if elapsed > 0 else 0.0,
+        "latency": _percentiles([r["seconds"] for r in ok]),
+        "stages": {name: {"runs": len(v), **_percentiles(v)} for name, v in stage_samples.items()},
+        "server": {k: limits.counts[k] - server_before.get(k, 0) for k in limits.counts},
+        # In-process scheduler only (job-server / cli runs schedule in their own processes)
+        "scheduler": {k: sched_after[k] - sched_before[k] for k in ("calls", "retries", "rate_limited", "failures")},
+        **_log_check(log_offset, {r["run_id"] for r in ok if r["run_id"]}),
+    }
+    if isinstance(target, JobServerTarget):
+        level["queue_full"] = target.queue_full
+    _print_level(level, args.top_stages)
+    return level
+
+
+def _print_level(level: Dict, top_stages: int) -> None:
+    lat = level["latency"]
+    print(
+        f"\n== {level['users']} users ({level['target']}): {level['runs']} runs in {level['seconds']:.1f}s  "
+        f"{level['items_per_sec']:.2f} runs/s  {level['resumes_per_sec']:.1f} resumes/s  "
+        f"failed {level['error_rate'] * 100:.1f}%"
+    )
+    print(f"  {'end-to-end':<28} p50 {lat['p50_ms']:>9.0f}ms  p95 {lat['p95_ms']:>9.0f}ms  p99 {lat['p99_ms']:>9.0f}ms")
+    stages = sorted(level["stages"].items(), key=lambda kv: -kv[1]["p95_ms"])[:top_stages]
+    for name, s in stages:
+        print(f"  {name:<28} p50 {s['p50_ms']:>9.1f}ms  p95 {s['p95_ms']:>9.1f}ms  p99 {s['p99_ms']:>9.1f}ms")
+    print(
+        f"  server {level['server']}  scheduler {level['scheduler']}  "
+        f"runs.jsonl corrupt {level['log_lines_corrupt']} missing {level['log_entries_missing']}"
+    )
+    for err in level["errors"]:
+        print(f"  error: {err}")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Concurrent-user load test")
+    parser.add_argument("--target", choices=TARGETS, default="graph")
+    parser.add_argument("--users", nargs="+", type=int, default=[1, 5, 10, 20], help="Concurrency levels")
+    parser.add_argument("--runs-per-user", type=int, default=2)
+    parser.add_argument("--resumes-per-run", type=int, default=8)
+    parser.add_argument("--corpus", type=int, default=60, help="Resumes in the shared pool users sample from")
+    parser.add_argument("--formats", nargs="+", default=["pdf", "docx"])
+    parser.add_argument("--think-time", type=float, default=0.0, help="Mean seconds between a user's runs")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed runs before the first level")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.1, help="Stub seconds per LLM / embedding request")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Stub random 500 probability")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Stub random 429 probability")
+    parser.add_argument("--rpm", type=int, default=0, help="Stub requests/minute before 429s (0 = unlimited)")
+    parser.add_argument(
+        "--embed-backend",
+        default="hashing",
+        help="EMBED_BACKEND: local hashing / tfidf, or openai via the stub server (needs cached tiktoken files)",
+    )
+    parser.add_argument("--job-workers", type=int, default=2)
+    parser.add_argument("--top-stages", type=int, default=12, help="Stages to print per level (all are saved)")
+    parser.add_argument("--corpus-dir", type=Path, default=ROOT / "data" / "bench_corpus")
+    parser.add_argument("--output", type=Path, help="Results JSON path (default: benchmarks/results/load_<ts>.json)")
+    parser.add_argument("--baseline", type=Path, help="Earlier load-test JSON to compare throughput against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed throughput drop (0.2 = 20%%)")
+    parser.add_argument("--max-error-rate", type=float, default=None, help="Fail when more runs fail than this")
+    args = parser.parse_args(argv)
+
+    limits = Limits(args.rpm, args.error_rate, args.rate_limit_rate, args.latency, seed=args.seed)
+    stub, url = start_server(0, limits)
+    workdir = Path(tempfile.mkdtemp(prefix="load_test_"))
+    # Must be set before Agentic_AI.config is imported; job server workers
+    # and CLI processes inherit them
+    os.environ["OPENAI_BASE_URL"] = url
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    os.environ["EMBED_BACKEND"] = args.embed_backend
+    data_dir = workdir / "data"
+    os.environ["DATA_DIR"] = str(data_dir)
+    os.environ["EMBED_STORE_PATH"] = str(data_dir / "embeddings")
+    os.environ["FEATURE_STORE_PATH"] = str(data_dir / "features.sqlite")
+    os.environ["STREAM_SPILL_DIR"] = str(data_dir / "spill")
+    # The fitted TF-IDF model is an input, not run output: keep reading it from data/
+    os.environ.setdefault("EMBED_TFIDF_PATH", str(ROOT / "data" / "models" / "tfidf_svd.npz"))
+
+    paths = generate_corpus(args.corpus_dir / f"load_seed{args.seed}", args.corpus, seed=args.seed, formats=args.formats)
+    blobs = {p: Path(p).read_bytes() for p in paths}
+
+    target = None
+    try:
+        if args.target == "graph":
+            target = GraphTarget()
+        elif args.target == "job-server":
+            target = JobServerTarget(args.job_workers, queue_depth=max(args.users) * 2)
+        else:
+            target = CliTarget(workdir)
+        for _ in range(args.warmup):
+            sample = paths[: args.resumes_per_run]
+            target.run(-1, generate_jds(1, seed=args.seed + 999)[0], [(Path(p).name, blobs[p]) for p in sample], sample)
+        levels = [run_level(users, target, args, paths, blobs, limits) for users in args.users]
+    finally:
+        if target is not None:
+            target.close()
+        stub.shutdown()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    from Agentic_AI.profiling import process_peak_rss_mb
+
+    payload = {
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "config": {k: (str(v) if isinstance(v, Path) else v) for k, v in vars(args).items()},
+        "process_peak_rss_mb": process_peak_rss_mb(),
+        "levels": levels,
+    }
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    out = args.output or RESULTS_DIR / f"load_{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.json"
+    out.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    print(f"\nResults written to {out}")
+
+    ok = True
+    if args.max_error_rate is not None:
+        for level in levels:
+            if level["error_rate"] > args.max_error_rate:
+                print(f"FAIL: {level['users']} users: {level['error_rate'] * 100:.1f}% of runs failed")
+                ok = False
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(levels, baseline["levels"], args.tolerance)
+        if regressions:
+            print("\nREGRESSIONS:")
+            for r in regressions:
+                print("  " + r)
+            ok = False
+        else:
+            print("\nNo regressions against baseline.")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+"""
+Exercise the shared LLM scheduler against the local stub server with
+injected rate limits and errors.
+
+    python -m benchmarks.rate_limit_check --calls 60 --threads 16 --rate-limit-rate 0.2
+
+Every call must eventually succeed (retries + backoff), the scheduler must
+observe the injected 429s and shrink its concurrency, and interactive calls
+should finish ahead of batch calls. Exits non-zero otherwise.
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "app"))
+
+from benchmarks.stub_openai_server import Limits, start_server  # noqa: E402
+from benchmarks.synthetic import generate_jds  # noqa: E402
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Scheduler rate-limit check")
+    parser.add_argument("--calls", type=int, default=60)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--rpm", type=int, default=0)
+    parser.add_argument("--rate-limit-rate", type=float, default=0.2)
+    parser.add_argument("--error-rate", type=float, default=0.05)
+    parser.add_argument("--latency", type=float, default=0.05)
+    args = parser.parse_args(argv)
+
+    limits = Limits(args.rpm, args.error_rate, args.rate_limit_rate, args.latency, seed=0)
+    server, url = start_server(0, limits)
+    # Must be set before the first Agentic_AI.config setting is read
+    os.environ["OPENAI_BASE_URL"] = url
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    os.environ.setdefault("LLM_MAX_RETRIES", "10")
+
+    from Agentic_AI.llm_utils import jd_json_from_text
+    from Agentic_AI.scheduler import BATCH, INTERACTIVE, get_scheduler, priority
+
+    jds = generate_jds(args.calls)
+    finished = {INTERACTIVE: [], BATCH: []}
+    errors = []
+    t0 = time.monotonic()
+
+    def one(i: int):
+        level = INTERACTIVE if i % 4 == 0 else BATCH
+        with priority(level):
+            try:
+                jd_json_from_text(jds[i])
+                finished[level].append(time.monotonic() - t0)
+            except Exception as exc:  # noqa: BLE001 - report every failure
+                errors.append(repr(exc))
+
+    with ThreadPoolExecutor(args.threads) as pool:
+        list(pool.map(one, range(args.calls)))
+    server.shutdown()
+
+    snap = get_scheduler("chat").snapshot()
+    print(f"server responses: {limits.counts}")
+    print(f"scheduler: {snap}")
+    for level, name in ((INTERACTIVE, "interactive"), (BATCH, "batch")):
+        if finished[level]:
+            print(f"{name:<12} n={len(finished[level]):>3}  median finish {statistics.median(finished[level]):.2f}s")
+
+    ok = True
+    if errors:
+        print(f"FAIL: {len(errors)} calls failed, e.g. {errors[0]}")
+        ok = False
+    if limits.counts["429"] and snap["rate_limited"] == 0:
+        print("FAIL: server sent 429s but the scheduler did not observe them")
+        ok = False
+    print("OK" if ok else "FAILED")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
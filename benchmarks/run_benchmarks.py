@@ -0,0 +1,196 @@
+"""
+Benchmark the parse / score / rank / report stages on a synthetic corpus.
+
+Usage (from the repo root):
+
+    python -m benchmarks.run_benchmarks --scales 10 100 1000
+    python -m benchmarks.run_benchmarks --scales 100 --save-baseline
+    python -m benchmarks.run_benchmarks --scales 100 --baseline benchmarks/baseline.json
+
+Chat and embedding models are replaced by deterministic local stubs
+(see benchmarks/stubs.py); use --chat-latency / --embed-latency to inject
+provider latency. Results are written as JSON; with --baseline the run
+exits non-zero when any stage's throughput drops by more than --tolerance.
+"""
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "app"))
+
+from benchmarks.stubs import install_stubs  # noqa: E402
+from benchmarks.synthetic import generate_corpus, generate_jds  # noqa: E402
+
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+DEFAULT_BASELINE = ROOT / "benchmarks" / "baseline.json"
+
+
+def _percentiles(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {"p50_ms": 0.0, "p95_ms": 0.0, "p99_ms": 0.0, "max_ms": 0.0}
+    ordered = sorted(samples)
+
+    def pct(p: float) -> float:
+        idx = min(int(round(p / 100 * (len(ordered) - 1))), len(ordered) - 1)
+        return ordered[idx] * 1000
+
+    return {"p50_ms": pct(50), "p95_ms": pct(95), "p99_ms": pct(99), "max_ms": ordered[-1] * 1000}
+
+
+def measure(name: str, items: List, fn: Callable, batch: bool = False) -> Dict:
+    """
+    Run `fn` over `items` (per item, or once over all items when batch=True)
+    and return throughput, latency percentiles and peak traced memory.
+    """
+    tracemalloc.start()
+    latencies: List[float] = []
+    outputs = []
+    start = time.perf_counter()
+    if batch:
+        t0 = time.perf_counter()
+        outputs.append(fn(items))
+        latencies.append(time.perf_counter() - t0)
+    else:
+        for item in items:
+            t0 = time.perf_counter()
+            outputs.append(fn(item))
+            latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    result = {
+        "stage": name,
+        "items": len(items),
+        "seconds": elapsed,
+        "items_per_sec": len(items) / elapsed if elapsed > 0 else 0.0,
+        "peak_traced_mb": peak / (1024 * 1024),
+        **_percentiles(latencies),
+    }
+    print(
+        f"  {name:<14} {result['items']:>7} items  {result['items_per_sec']:>10.1f}/s  "
+        f"p50 {result['p50_ms']:.2f}ms  p95 {result['p95_ms']:.2f}ms  "
+        f"peak {result['peak_traced_mb']:.1f}MB"
+    )
+    return {"result": result, "outputs": outputs}
+
+
+def run_scale(n: int, args, corpus_dir: Path) -> List[Dict]:
+    from Agentic_AI.config import DEFAULT_WEIGHTS
+    from Agentic_AI.jd_parser import parse_jd
+    from Agentic_AI.reporting import build_candidate_report_pdf
+    from Agentic_AI.resume_parser import parse_resume
+    from Agentic_AI.scoring import rank_candidates
+
+    print(f"\n== scale {n}")
+    paths = generate_corpus(corpus_dir, n, seed=args.seed, formats=args.formats)
+    jd_texts = generate_jds(args.jds, seed=args.seed)
+
+    stages = []
+    parsed = measure("parse_resume", paths, parse_resume)
+    stages.append(parsed["result"])
+    resumes = parsed["outputs"]
+
+    jd_run = measure("parse_jd", jd_texts, parse_jd)
+    stages.append(jd_run["result"])
+    jd = jd_run["outputs"][0]
+
+    ranked = measure(
+        "rank", resumes, lambda rs: rank_candidates(jd, rs, DEFAULT_WEIGHTS), batch=True
+    )
+    ranked["result"]["items_per_sec"] = n / ranked["result"]["seconds"]
+    stages.append(ranked["result"])
+    results = ranked["outputs"][0]
+
+    report_sample = results[: args.report_sample]
+    stages.append(
+        measure("report_pdf", report_sample, lambda c: build_candidate_report_pdf(c, jd))["result"]
+    )
+
+    for s in stages:
+        s["scale"] = n
+    return stages
+
+
+def compare(current: List[Dict], baseline: List[Dict], tolerance: float) -> List[str]:
+    """Return a list of regression messages (empty when within tolerance)."""
+    base = {(b["stage"], b["scale"]): b for b in baseline}
+    regressions = []
+    for c in current:
+        b = base.get((c["stage"], c["scale"]))
+        if not b or b["items_per_sec"] <= 0:
+            continue
+        ratio = c["items_per_sec"] / b["items_per_sec"]
+        if ratio < 1.0 - tolerance:
+            regressions.append(
+                f"{c['stage']}@{c['scale']}: {c['items_per_sec']:.1f}/s vs "
+                f"baseline {b['items_per_sec']:.1f}/s ({(1 - ratio) * 100:.0f}% slower)"
+            )
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Synthetic-corpus pipeline benchmarks")
+    parser.add_argument("--scales", nargs="+", type=int, default=[10, 100])
+    parser.add_argument("--formats", nargs="+", default=["pdf", "docx", "txt"])
+    parser.add_argument("--jds", type=int, default=3, help="JDs to parse per scale")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--report-sample", type=int, default=50, help="Candidates to build PDF reports for")
+    parser.add_argument("--chat-latency", type=float, default=0.0, help="Seconds per stub chat call")
+    parser.add_argument("--embed-latency", type=float, default=0.0, help="Seconds per stub embedding call")
+    parser.add_argument("--corpus-dir", type=Path, default=ROOT / "data" / "bench_corpus")
+    parser.add_argument("--output", type=Path, help="Results JSON path (default: benchmarks/results/<ts>.json)")
+    parser.add_argument("--baseline", type=Path, help="Baseline JSON to compare against")
+    parser.add_argument("--save-baseline", action="store_true", help=f"Also write results to {DEFAULT_BASELINE}")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed throughput drop (0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    install_stubs(chat_latency=args.chat_latency, embed_latency=args.embed_latency)
+
+    stages: List[Dict] = []
+    for n in args.scales:
+        stages.extend(run_scale(n, args, args.corpus_dir / f"n{n}_seed{args.seed}"))
+
+    from Agentic_AI.profiling import process_peak_rss_mb
+
+    payload = {
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {
+            "seed": args.seed,
+            "formats": args.formats,
+            "chat_latency": args.chat_latency,
+            "embed_latency": args.embed_latency,
+        },
+        "process_peak_rss_mb": process_peak_rss_mb(),  # whole run; per-stage peaks are traced
+        "stages": stages,
+    }
+    RESULTS_DIR.mkdir(parents=True, exist_ok=True)
+    out = args.output or RESULTS_DIR / f"{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.json"
+    out.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    print(f"\nResults written to {out}")
+    if args.save_baseline:
+        DEFAULT_BASELINE.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+        print(f"Baseline saved to {DEFAULT_BASELINE}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(stages, baseline["stages"], args.tolerance)
+        if regressions:
+            print("\nREGRESSIONS:")
+            for r in regressions:
+                print("  " + r)
+            return 1
+        print("\nNo regressions against baseline.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,182 @@
+"""
+Local OpenAI-compatible stub server with injectable rate limits and errors.
+
+Serves /v1/chat/completions (blocking or streamed) and /v1/embeddings with
+the deterministic responses from benchmarks/stubs.py, so the real ChatOpenAI /
+OpenAIEmbeddings clients (and the shared scheduler in front of them) can be
+exercised offline:
+
+    python -m benchmarks.stub_openai_server --port 8765 --rpm 60 --error-rate 0.05
+    OPENAI_BASE_URL=http://127.0.0.1:8765/v1 OPENAI_API_KEY=stub streamlit run app/app.py
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+from benchmarks.stubs import StubEmbeddings, respond
+
+
+class Limits:
+    """Server-side fault injection: RPM window, random 429/500s, latency."""
+
+    def __init__(self, rpm: int = 0, error_rate: float = 0.0, rate_limit_rate: float = 0.0,
+                 latency: float = 0.0, seed: Optional[int] = None):
+        self.rpm = rpm
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.latency = latency
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._window: list = []
+        self.counts = {"ok": 0, "429": 0, "500": 0}
+
+    def check(self) -> int:
+        """HTTP status to return for the next request."""
+        with self._lock:
+            now = time.monotonic()
+            self._window = [t for t in self._window if now - t < 60]
+            if self.rpm and len(self._window) >= self.rpm:
+                status = 429
+            elif self._rng.random() < self.rate_limit_rate:
+                status = 429
+            elif self._rng.random() < self.error_rate:
+                status = 500
+            else:
+                status = 200
+                self._window.append(now)
+            self.counts["ok" if status == 200 else str(status)] += 1
+            return status
+
+
+def make_handler(limits: Limits, embeddings: StubEmbeddings):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):  # keep benchmark output quiet
+            pass
+
+        def _send(self, status: int, payload: dict, headers: Optional[dict] = None) -> None:
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for k, v in (headers or {}).items():
+                self.send_header(k, v)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_stream(self, req: dict, content: str, usage: dict) -> None:
+            """Server-sent events, one word-sized delta per event (for stream=True requests)."""
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            self.close_connection = True
+            base = {"id": "chatcmpl-stub", "object": "chat.completion.chunk", "created": int(time.time()),
+                    "model": req.get("model", "stub")}
+            events = [{**base, "choices": [{"index": 0, "delta": {"role": "assistant", "content": piece},
+                                            "finish_reason": None}]}
+                      for piece in re.findall(r"\S+\s*", content) or [content]]
+            events.append({**base, "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]})
+            if (req.get("stream_options") or {}).get("include_usage"):
+                events.append({**base, "choices": [], "usage": usage})
+            for event in events:
+                self.wfile.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+            self.wfile.write(b"data: [DONE]\n\n")
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            req = json.loads(self.rfile.read(length) or b"{}")
+            if limits.latency:
+                time.sleep(limits.latency)
+
+            status = limits.check()
+            if status == 429:
+                return self._send(
+                    429,
+                    {"error": {"message": "Rate limit reached", "type": "requests", "code": "rate_limit_exceeded"}},
+                    {"retry-after": "1"},
+                )
+            if status == 500:
+                return self._send(500, {"error": {"message": "Injected server error", "type": "server_error"}})
+
+            if self.path.endswith("/chat/completions"):
+                messages = req.get("messages", [])
+                system = next((m["content"] for m in messages if m["role"] == "system"), "")
+                user = messages[-1]["content"] if messages else ""
+                content = respond(system, user)
+                prompt_tokens = (len(system) + len(user)) // 4
+                completion_tokens = len(content) // 4
+                usage = {
+                    "prompt_tokens": prompt_tokens,
+                    "completion_tokens": completion_tokens,
+                    "total_tokens": prompt_tokens + completion_tokens,
+                }
+                if req.get("stream"):
+                    return self._send_stream(req, content, usage)
+                return self._send(200, {
+                    "id": "chatcmpl-stub",
+                    "object": "chat.completion",
+                    "created": int(time.time()),
+                    "model": req.get("model", "stub"),
+                    "choices": [{
+                        "index": 0,
+                        "message": {"role": "assistant", "content": content},
+                        "finish_reason": "stop",
+                    }],
+                    "usage": usage,
+                })
+            if self.path.endswith("/embeddings"):
+                inputs = req.get("input", [])
+                if isinstance(inputs, str):
+                    inputs = [inputs]
+                # langchain may send token-id lists; embed their string form
+                texts = [i if isinstance(i, str) else " ".join(map(str, i)) for i in inputs]
+                vectors = embeddings.embed_documents(texts)
+                return self._send(200, {
+                    "object": "list",
+                    "data": [{"object": "embedding", "index": i, "embedding": v} for i, v in enumerate(vectors)],
+                    "model": req.get("model", "stub"),
+                    "usage": {"prompt_tokens": 0, "total_tokens": 0},
+                })
+            return self._send(404, {"error": {"message": f"unknown path {self.path}"}})
+
+    return Handler
+
+
+def start_server(port: int = 0, limits: Optional[Limits] = None, dim: int = 1536):
+    """Start the stub in a background thread; returns (server, base_url)."""
+    limits = limits or Limits()
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(limits, StubEmbeddings(dim=dim)))
+    server.limits = limits  # type: ignore[attr-defined]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="OpenAI-compatible stub server")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rpm", type=int, default=0, help="Requests/minute before 429s (0 = unlimited)")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Random 429 probability")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Random 500 probability")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per request")
+    args = parser.parse_args(argv)
+
+    limits = Limits(args.rpm, args.error_rate, args.rate_limit_rate, args.latency)
+    server, url = start_server(args.port, limits)
+    print(f"Stub OpenAI server at {url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,148 @@
+"""
+Deterministic local stand-ins for the chat and embedding models.
+
+`install_stubs()` patches `llm_utils.get_llm` and
+`embedding.get_embedding_model`, so the pipeline runs without network
+access. Optional latency (seconds per call) simulates the real providers.
+"""
+import hashlib
+import json
+import re
+import time
+from typing import List
+
+import numpy as np
+
+from benchmarks.synthetic import OUTCOMES, ROLES, SKILLS
+
+
+def _jd_json(jd_text: str) -> dict:
+    lower = jd_text.lower()
+    must, nice = [], []
+    for line in jd_text.splitlines():
+        if line.lower().startswith("must have:"):
+            must = [s.strip() for s in line.split(":", 1)[1].split(",") if s.strip()]
+        elif line.lower().startswith("nice to have:"):
+            nice = [s.strip() for s in line.split(":", 1)[1].split(",") if s.strip()]
+    if not must:
+        must = [s for s in SKILLS if s.lower() in lower]
+    m = re.search(r"(\d+)\+?\s+years?", jd_text, re.I)
+    years = float(m.group(1)) if m else 0.0
+    role = next((r for r in ROLES if r.lower() in lower), "Unspecified Role")
+    return {
+        "role_title": role,
+        "must_have_skills": must,
+        "nice_to_have_skills": nice,
+        "min_years_experience": years,
+        "max_years_experience": years + 5,
+        "locations": ["Remote"],
+        "employment_type": "full-time",
+        "key_outcomes": [o for o in OUTCOMES if o in lower],
+        "risk_flags": [],
+    }
+
+
+def _rationale_json(user: str) -> dict:
+    return {
+        "summary": "Synthetic rationale: candidate matches several must-have skills.",
+        "evidence": [
+            {"text": user[-200:], "source": "resume.skills", "score_dimension": "SkillScore"}
+        ],
+        "confidence": 0.7,
+        "action": "Review",
+    }
+
+
+def respond(system: str, user: str) -> str:
+    """Deterministic completion for a (system, user) prompt pair."""
+    # Dispatch on the (formatted) system prompt of each task
+    if "Convert the job description" in system:
+        return json.dumps(_jd_json(user))
+    if "CANDIDATES_JSON" in system:
+        candidates = json.loads(user.split("CANDIDATES_JSON:\n", 1)[1])
+        return json.dumps(
+            {
+                "rationales": [
+                    {"resume_id": c["resume_id"], **_rationale_json(json.dumps(c["evidence"]))}
+                    for c in candidates
+                ]
+            }
+        )
+    if "senior recruiter assistant" in system:
+        return json.dumps(_rationale_json(user))
+    return "Synthetic fairness narrative: no obvious bias risks detected."
+
+
+class StubChatModel:
+    """Builds a LangChain runnable that answers JD-parse, rationale and bias prompts."""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+
+    def _stream(self, prompt_values):
+        from langchain_core.messages import AIMessageChunk
+
+        for prompt_value in prompt_values:
+            messages = prompt_value.to_messages()
+            system = messages[0].content if messages else ""
+            user = messages[-1].content if messages else ""
+            content = respond(system, user)
+            # Word-sized chunks; a fifth of the latency before the first token
+            pieces = re.findall(r"\S+\s*", content) or [content]
+            if self.latency:
+                time.sleep(self.latency * 0.2)
+            for i, piece in enumerate(pieces):
+                if i and self.latency:
+                    time.sleep(self.latency * 0.8 / len(pieces))
+                yield AIMessageChunk(content=piece)
+            prompt_tokens = (len(system) + len(user)) // 4
+            completion_tokens = len(content) // 4
+            yield AIMessageChunk(
+                content="",
+                response_metadata={
+                    "token_usage": {
+                        "prompt_tokens": prompt_tokens,
+                        "completion_tokens": completion_tokens,
+                        "total_tokens": prompt_tokens + completion_tokens,
+                    }
+                },
+            )
+
+    def runnable(self):
+        from langchain_core.runnables import RunnableGenerator
+
+        # invoke() aggregates the chunks into one message; stream() yields them
+        return RunnableGenerator(self._stream)
+
+
+class StubEmbeddings:
+    """Hashing-trick embeddings: deterministic, CPU-only, no network."""
+
+    def __init__(self, dim: int = 1536, latency: float = 0.0):
+        self.dim = dim
+        self.dimension = dim
+        self.latency = latency
+
+    def _embed(self, text: str) -> List[float]:
+        vec = np.zeros(self.dim, dtype="float32")
+        for tok in re.findall(r"[a-z0-9]+", text.lower()):
+            h = int.from_bytes(hashlib.blake2b(tok.encode(), digest_size=8).digest(), "little")
+            vec[h % self.dim] += 1.0 if (h >> 63) else -1.0
+        return vec.tolist()
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self.latency:
+            time.sleep(self.latency)
+        return [self._embed(t) for t in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return self.embed_documents([text])[0]
+
+
+def install_stubs(chat_latency: float = 0.0, embed_latency: float = 0.0) -> None:
+    from Agentic_AI import embedding, llm_utils
+
+    chat = StubChatModel(latency=chat_latency)
+    emb = StubEmbeddings(latency=embed_latency)
+    llm_utils.get_llm = lambda temperature=0.0: chat.runnable()  # type: ignore[assignment]
+    embedding.get_embedding_model = lambda: emb  # type: ignore[assignment]
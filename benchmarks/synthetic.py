@@ -0,0 +1,148 @@
+"""
+Seeded generator for synthetic resumes (PDF / DOCX / TXT) and JDs.
+
+The same seed always yields the same corpus, so benchmark runs are
+comparable across commits.
+"""
+import random
+from pathlib import Path
+from typing import List
+
+SKILLS = [
+    "Python", "SQL", "Machine Learning", "Deep Learning", "PyTorch", "TensorFlow",
+    "Docker", "Kubernetes", "AWS", "GCP", "Azure", "Spark", "Airflow", "Kafka",
+    "React", "TypeScript", "Java", "Go", "Rust", "PostgreSQL", "MongoDB", "Redis",
+    "LangChain", "NLP", "Computer Vision", "MLOps", "CI/CD", "Terraform",
+    "Data Visualization", "Statistics", "A/B Testing", "REST APIs", "GraphQL",
+]
+OUTCOMES = [
+    "reduce inference latency",
+    "improve model accuracy",
+    "scale data pipelines",
+    "ship customer-facing features",
+    "cut cloud costs",
+    "mentor junior engineers",
+    "own end-to-end delivery",
+]
+ROLES = [
+    "Machine Learning Engineer", "Data Scientist", "Backend Engineer",
+    "Data Engineer", "Full Stack Developer", "MLOps Engineer",
+]
+FIRST = ["Asha", "Ravi", "Maria", "John", "Wei", "Fatima", "Lucas", "Priya", "Omar", "Elena"]
+LAST = ["Kumar", "Smith", "Garcia", "Chen", "Okafor", "Novak", "Ito", "Rao", "Silva", "Khan"]
+BUZZWORDS = ["hard-working", "team player", "self-starter", "passionate"]
+COMPANIES = ["Acme Corp", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries"]
+
+
+def make_jd_text(rng: random.Random) -> str:
+    role = rng.choice(ROLES)
+    must = rng.sample(SKILLS, 5)
+    nice = rng.sample([s for s in SKILLS if s not in must], 3)
+    outcomes = rng.sample(OUTCOMES, 3)
+    years = rng.randint(2, 8)
+    return "\n".join(
+        [
+            f"Job Title: {role}",
+            f"We are looking for a {role} with {years}+ years of experience.",
+            "Must have: " + ", ".join(must),
+            "Nice to have: " + ", ".join(nice),
+            "Key outcomes: " + "; ".join(outcomes),
+            "Location: Remote or Bangalore. Full-time.",
+        ]
+    )
+
+
+def make_resume_text(rng: random.Random, idx: int) -> str:
+    name = f"{rng.choice(FIRST)} {rng.choice(LAST)} {idx}"
+    email = f"{name.lower().replace(' ', '.')}@example.com"
+    phone = "+91 " + "".join(str(rng.randint(0, 9)) for _ in range(10))
+    skills = rng.sample(SKILLS, rng.randint(4, 12))
+    years = rng.randint(0, 15)
+    lines = [
+        name,
+        f"{email} | {phone}",
+        "",
+        "Summary",
+        f"{rng.choice(ROLES)} with {years} years of experience. "
+        + " ".join(rng.sample(BUZZWORDS, rng.randint(0, 4))),
+        "",
+        "Skills",
+        ", ".join(skills),
+        "",
+        "Experience",
+    ]
+    for _ in range(rng.randint(1, 4)):
+        start = rng.randint(2008, 2022)
+        lines.append(f"{rng.choice(ROLES)} at {rng.choice(COMPANIES)} ({start}–{start + rng.randint(1, 4)})")
+        for _ in range(rng.randint(2, 5)):
+            lines.append(
+                f"- Worked to {rng.choice(OUTCOMES)} using {rng.choice(skills)}, "
+                f"delivering a {rng.randint(5, 60)}% improvement."
+            )
+    lines += [
+        "",
+        "Education",
+        "B.Tech in Computer Science",
+        "",
+        "Projects",
+        f"- Built a {rng.choice(skills)} project to {rng.choice(OUTCOMES)}.",
+    ]
+    return "\n".join(lines)
+
+
+def _write_txt(path: Path, text: str) -> None:
+    path.write_text(text, encoding="utf-8")
+
+
+def _write_docx(path: Path, text: str) -> None:
+    import docx
+
+    document = docx.Document()
+    for line in text.splitlines():
+        document.add_paragraph(line)
+    document.save(str(path))
+
+
+def _write_pdf(path: Path, text: str) -> None:
+    from reportlab.lib.pagesizes import A4
+    from reportlab.pdfgen import canvas
+
+    c = canvas.Canvas(str(path), pagesize=A4)
+    width, height = A4
+    y = height - 40
+    for line in text.splitlines():
+        if y < 40:
+            c.showPage()
+            y = height - 40
+        c.drawString(40, y, line[:110])
+        y -= 14
+    c.save()
+
+
+WRITERS = {"txt": _write_txt, "docx": _write_docx, "pdf": _write_pdf}
+
+
+def generate_corpus(
+    out_dir: Path,
+    n_resumes: int,
+    seed: int = 0,
+    formats: List[str] = ("pdf", "docx", "txt"),
+) -> List[str]:
+    """Write `n_resumes` resumes to out_dir (cycling through formats); return paths."""
+    rng = random.Random(seed)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(n_resumes):
+        fmt = formats[i % len(formats)]
+        path = out_dir / f"resume_{i:06d}.{fmt}"
+        if not path.exists():
+            WRITERS[fmt](path, make_resume_text(rng, i))
+        else:
+            make_resume_text(rng, i)  # keep the RNG stream aligned
+        paths.append(str(path))
+    return paths
+
+
+def generate_jds(n: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed + 10_000)
+    return [make_jd_text(rng) for _ in range(n)]
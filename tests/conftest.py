@@ -0,0 +1,40 @@
+"""
+Shared test setup: the app package on sys.path, local CPU embeddings, the
+deterministic stub chat model, and data directories under tmp_path.
+
+    python -m pytest -q
+"""
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / "app"))
+sys.path.insert(0, str(ROOT))
+
+# Read once by Agentic_AI.config on first access
+os.environ.setdefault("EMBED_BACKEND", "hashing")
+os.environ.setdefault("FEATURE_STORE_ENABLED", "0")
+os.environ.setdefault("EMBED_STORE_ENABLED", "0")
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+
+@pytest.fixture
+def stubs():
+    from benchmarks.stubs import install_stubs
+
+    install_stubs()
+
+
+@pytest.fixture
+def data_dirs(tmp_path, monkeypatch):
+    """Checkpoints and run logs go to tmp_path instead of data/."""
+    from Agentic_AI import checkpoint, storage
+
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_DIR", tmp_path / "checkpoints")
+    monkeypatch.setattr(storage, "LOG_DIR", tmp_path / "logs")
+    monkeypatch.setattr(storage, "RUNS_LOG", tmp_path / "logs" / "runs.jsonl")
+    monkeypatch.setattr(storage, "RESULTS_DIR", tmp_path / "logs" / "results")
+    return tmp_path
@@ -0,0 +1,53 @@
+import dataclasses
+from pathlib import Path
+
+import pytest
+from streamlit.testing.v1 import AppTest
+
+from Agentic_AI import graph
+from Agentic_AI.config import DEFAULT_WEIGHTS
+from benchmarks.synthetic import generate_corpus, generate_jds
+
+APP = Path(__file__).resolve().parents[1] / "app" / "app.py"
+
+
+@pytest.fixture
+def last_run(stubs, data_dirs, tmp_path):
+    paths = generate_corpus(tmp_path / "pool", 4, formats=["txt"])
+    state = graph.build_agent_graph().invoke({
+        "run_id": "ui",
+        "jd_text": generate_jds(1)[0],
+        "resume_files": [(p, open(p, "rb").read()) for p in paths],
+        "weights": dict(DEFAULT_WEIGHTS),
+    })
+    return {
+        "run_id": "ui",
+        "jd": state["jd"],
+        "full_results": state["full_results"],
+        "results_table": state["results_table"],
+        "duplicate_clusters": state.get("duplicate_clusters", []),
+        "jd_changes": [],
+        "perf": state["perf"].to_dict(),
+        "rationale_stats": dataclasses.asdict(state["rationale_stats"]),
+        "profile_dir": None,
+    }
+
+
+def test_widget_reruns_render_the_stored_run_without_rerunning_the_graph(monkeypatch, last_run):
+    monkeypatch.setattr(graph, "build_agent_graph", lambda: pytest.fail("graph rebuilt on a rerun"))
+    at = AppTest.from_file(str(APP), default_timeout=60)
+    at.session_state["last_run"] = last_run
+    at.run()
+    assert not at.exception
+
+    names = {f"### {c.resume.name}" for c in last_run["full_results"]}
+    cards = lambda: {m.value for m in at.markdown} & names  # noqa: E731
+    shown = cards()
+    assert shown
+
+    prepare = [b for b in at.button if b.label == "Prepare candidate report (PDF)"]
+    prepare[0].click().run()
+    assert not at.exception
+    assert cards() == shown
+    rid = prepare[0].key[len("prep_"):]
+    assert [d.key for d in at.get("download_button") if d.label.endswith("(PDF)")] == [f"pdf_{rid}"]
@@ -0,0 +1,32 @@
+import hashlib
+from pathlib import Path
+
+import pytest
+
+from Agentic_AI.blob_store import BlobStore
+from Agentic_AI.resume_parser import parse_resume_bytes
+from benchmarks.synthetic import generate_corpus
+
+
+def test_identical_uploads_are_stored_once(tmp_path):
+    store = BlobStore(tmp_path / "uploads")
+    first = store.put(b"Jane Doe\nPython", "resume.PDF")
+    assert store.put(b"Jane Doe\nPython", "copy.pdf") == first
+    assert first.name == hashlib.sha256(b"Jane Doe\nPython").hexdigest() + ".pdf"
+
+    other = store.put_async(b"John Roe\nJava", "resume.pdf").result()
+    assert other != first and other.read_bytes() == b"John Roe\nJava"
+    assert sorted(p.name for p in (tmp_path / "uploads").rglob("*") if p.is_file()) == sorted([first.name, other.name])
+
+
+@pytest.mark.parametrize("fmt", ["pdf", "docx"])
+def test_parsing_from_memory_matches_the_text_of_each_format(tmp_path, fmt):
+    plain = generate_corpus(tmp_path / "txt", 3, formats=["txt"])
+    binary = generate_corpus(tmp_path / fmt, 3, formats=[fmt])
+    for txt_path, path in zip(plain, binary):
+        data = Path(path).read_bytes()
+        parsed = parse_resume_bytes(data, Path(path).name)
+        want = parse_resume_bytes(Path(txt_path).read_bytes(), Path(txt_path).name)
+        assert parsed.content_hash == hashlib.sha256(data).hexdigest()
+        assert (parsed.name, parsed.email, parsed.phone.strip()) == (want.name, want.email, want.phone.strip())
+        assert parsed.sections.keys() == want.sections.keys()
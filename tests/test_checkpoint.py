@@ -0,0 +1,62 @@
+import pytest
+
+from Agentic_AI import batch
+from Agentic_AI.checkpoint import CheckpointMismatch, RunCheckpoint, make_run_id, run_manifest
+
+SKILLS = ["Python", "SQL", "Java", "Docker", "AWS", "Spark", "Kubernetes"]
+
+
+@pytest.fixture
+def pool(tmp_path):
+    (tmp_path / "pool").mkdir()
+    paths = []
+    for i, skill in enumerate(SKILLS):
+        path = tmp_path / "pool" / f"resume_{i}.txt"
+        path.write_text(
+            f"Candidate {i}\ncandidate{i}@example.com\n\nSkills\nPython, {skill}\n\n"
+            f"Experience\n{i + 1} years building {skill} services\n",
+            encoding="utf-8",
+        )
+        paths.append(str(path))
+    jd = tmp_path / "jd.txt"
+    jd.write_text("Engineer. Must have: Python, SQL. 3+ years.", encoding="utf-8")
+    return str(jd), paths
+
+
+def test_run_id_covers_chunking_and_content(pool):
+    jd, paths = pool
+    base = make_run_id(run_manifest("jd", paths, {}, chunk_size=3))
+    assert make_run_id(run_manifest("jd", paths, {}, chunk_size=3)) == base
+    assert make_run_id(run_manifest("jd", paths, {}, chunk_size=4)) != base
+    with open(paths[0], "a", encoding="utf-8") as f:
+        f.write("\nEdited in place.")
+    assert make_run_id(run_manifest("jd", paths, {}, chunk_size=3)) != base
+
+
+def test_check_manifest_refuses_other_inputs(data_dirs, pool):
+    _, paths = pool
+    ckpt = RunCheckpoint("run")
+    ckpt.check_manifest(run_manifest("jd", paths, {}, chunk_size=3))
+    ckpt.check_manifest(run_manifest("jd", paths, {}, chunk_size=3))  # same inputs: resume
+    with pytest.raises(CheckpointMismatch):
+        ckpt.check_manifest(run_manifest("jd", paths, {}, chunk_size=4))
+
+
+def _ranking(capsys):
+    out = capsys.readouterr().out
+    return [line for line in out.splitlines() if line[:4].strip().isdigit()]
+
+
+def test_resume_after_changing_chunk_size(stubs, data_dirs, pool, capsys):
+    jd, paths = pool
+    batch.main(["--jd", jd, "--resumes", *paths, "--chunk-size", "3", "--run-id", "fixed"])
+    first = _ranking(capsys)
+    assert len(first) == 7
+
+    # Same explicit run ID, other chunk boundaries: refused instead of mixing chunks
+    with pytest.raises(SystemExit):
+        batch.main(["--jd", jd, "--resumes", *paths, "--chunk-size", "4", "--run-id", "fixed"])
+
+    # Derived run ID: a fresh run with every resume ranked exactly once
+    batch.main(["--jd", jd, "--resumes", *paths, "--chunk-size", "4"])
+    assert _ranking(capsys) == first
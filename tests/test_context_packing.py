@@ -0,0 +1,61 @@
+from Agentic_AI import context_packing, embedding, resume_parser, scoring
+from Agentic_AI.context_packing import EvidencePacker, chunk_resume, estimate_tokens
+from Agentic_AI.embedding_store import EmbeddingStore
+from Agentic_AI.schemas import JD
+from benchmarks.synthetic import generate_corpus
+
+RESUME = """Jane Doe
+jane@example.com
+
+Summary
+Data engineer who enjoys hiking and photography.
+
+Skills
+Python, SQL, Apache Spark
+
+Experience
+6 years at Acme. Cut costs by 30% by rewriting nightly SQL jobs in Python.
+Organised the office book club.
+"""
+
+
+def test_section_markers_are_shared():
+    assert scoring.SECTION_MARKERS is resume_parser.SECTION_MARKERS
+    assert context_packing.SECTION_MARKERS is resume_parser.SECTION_MARKERS
+
+
+def test_packer_stays_within_budget_and_leads_with_skill_evidence(tmp_path):
+    path = tmp_path / "jane.txt"
+    path.write_text(RESUME, encoding="utf-8")
+    resume = resume_parser.parse_resume(str(path))
+    assert {c.section for c in chunk_resume(resume)} >= {"resume.skills", "resume.experience"}
+
+    jd = JD("Data Engineer", must_have_skills=["Python", "SQL"], key_outcomes=["cut costs"])
+    evidence = EvidencePacker(jd, budget_tokens=40).pack_many([resume])[resume.resume_id]
+    assert evidence and sum(estimate_tokens(e["text"]) for e in evidence) <= 40
+    assert evidence[0]["score_dimension"] == "SkillScore"
+    assert "python" in evidence[0]["text"].lower()
+    assert not any("hiking" in e["text"] for e in evidence)
+
+
+def test_packer_reuses_stored_embeddings(tmp_path, monkeypatch):
+    store = EmbeddingStore(tmp_path / "store", embedding.embedding_dimension())
+    monkeypatch.setattr(scoring, "get_embedding_store", lambda: store)
+    embedded = []
+    real = embedding.embed_texts
+
+    def counting(texts):
+        embedded.extend(texts)
+        return real(texts)
+
+    monkeypatch.setattr(embedding, "embed_texts", counting)
+    resumes = [resume_parser.parse_resume(p) for p in generate_corpus(tmp_path / "pool", 3, formats=["txt"])]
+    jd = JD("Data Engineer", must_have_skills=["python", "sql"], key_outcomes=["cut costs"])
+
+    first = EvidencePacker(jd).pack_many(resumes)
+    n_chunks = sum(len(chunk_resume(r)) for r in resumes)
+    assert 0 < len(embedded) <= n_chunks + 4
+    embedded.clear()
+    # Another run (or another JD sharing the skills): nothing is re-embedded
+    assert EvidencePacker(jd).pack_many(resumes) == first
+    assert embedded == []
@@ -0,0 +1,37 @@
+import numpy as np
+
+from Agentic_AI import dedupe
+
+
+def test_minhash_matches_exact_arithmetic():
+    x = dedupe.shingles("senior data engineer python sql airflow spark kafka " * 3)
+    assert x.max() < 1 << 32
+    expected = [
+        min(((int(a) * int(v) + int(b)) % dedupe._PRIME) & 0xFFFFFFFF for v in x)
+        for a, b in zip(dedupe._A, dedupe._B)
+    ]
+    assert dedupe.minhash(x).tolist() == expected
+
+
+def test_minhash_estimates_jaccard():
+    words = [f"w{i}" for i in range(400)]
+    a, b = " ".join(words[:300]), " ".join(words[100:])
+    sa, sb = set(dedupe.shingles(a).tolist()), set(dedupe.shingles(b).tolist())
+    true = len(sa & sb) / len(sa | sb)
+    estimate = dedupe._similarity(dedupe.minhash(dedupe.shingles(a)), dedupe.minhash(dedupe.shingles(b)))
+    assert abs(estimate - true) < 0.1
+
+
+def test_group_compares_every_bucket_member():
+    rows = dedupe.NUM_PERM // dedupe.BANDS
+    rng = np.random.default_rng(0)
+    base = rng.integers(0, 1 << 32, size=dedupe.NUM_PERM, dtype=np.uint64)
+    # b and c agree on band 0 and 7 of 8 values in every other band (~0.88);
+    # a shares only band 0, so it lands first in the only bucket b and c share
+    b = base.copy()
+    c = base.copy()
+    c[rows::rows] += 1
+    a = rng.integers(0, 1 << 32, size=dedupe.NUM_PERM, dtype=np.uint64)
+    a[:rows] = base[:rows]
+    groups = dedupe._group(3, {0: a, 1: b, 2: c}, threshold=0.8)
+    assert sorted(groups) == [[0], [1, 2]]
@@ -0,0 +1,19 @@
+import numpy as np
+
+from Agentic_AI import embedding
+
+
+def test_empty_input_needs_no_backend(monkeypatch):
+    def no_backend(*args, **kwargs):
+        raise RuntimeError("backend built for an empty input")
+
+    monkeypatch.setattr(embedding, "EMBED_BACKEND", "openai")
+    monkeypatch.setattr(embedding, "get_embedding_model", no_backend)
+    out = embedding.embed_texts([])
+    # The OpenAI size is known from config: no client or API key needed
+    assert out.shape == (0, embedding.OPENAI_EMBED_DIMS[embedding.OPENAI_EMBED_MODEL])
+    assert out.dtype == np.float32
+
+
+def test_empty_input_matches_backend_dimension():
+    assert embedding.embed_texts([]).shape[1] == embedding.embed_texts(["python sql"]).shape[1]
@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from Agentic_AI.embedding_store import EmbeddingStore
+
+
+def _unit(n, dim, seed=0):
+    v = np.random.default_rng(seed).standard_normal((n, dim)).astype("float32")
+    return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+
+@pytest.mark.parametrize("dtype, atol", [("float32", 0.0), ("float16", 1e-3), ("int8", 0.01)])
+def test_round_trip_across_reopen(tmp_path, dtype, atol):
+    vectors = _unit(50, 64)
+    keys = [f"k{i}" for i in range(50)]
+    store = EmbeddingStore(tmp_path, 64, dtype)
+    store.add(keys[:30], vectors[:30])
+    store.add(keys[20:], vectors[20:])  # overlapping keys keep their first rows
+
+    reopened = EmbeddingStore(tmp_path, 64, dtype)
+    assert len(reopened) == 50
+    got, missing = reopened.get(keys[::-1] + ["absent"])
+    assert missing == [50]
+    np.testing.assert_allclose(got, vectors[::-1], atol=atol, rtol=0)
+
+
+@pytest.mark.parametrize("dtype", ["float16", "int8"])
+def test_quantized_search_keeps_the_ranking(tmp_path, dtype):
+    vectors = _unit(200, 64, seed=1)
+    store = EmbeddingStore(tmp_path, 64, dtype)
+    store.add([f"k{i}" for i in range(200)], vectors)
+    query = vectors[7] + 0.05 * _unit(1, 64, seed=2)[0]
+    rows, scores = store.search(query, k=5, block_rows=64)
+    assert rows[0] == 7
+    # Quantization may swap near-ties, but scores stay close to the float32 ones
+    assert len(set(rows) & set(np.argsort(-(vectors @ query))[:5])) >= 4
+    np.testing.assert_allclose(scores, vectors[rows] @ query, atol=0.02)
+    assert np.all(np.diff(scores) <= 0)
+
+
+def test_int8_zero_vector(tmp_path):
+    store = EmbeddingStore(tmp_path, 8, "int8")
+    store.add(["zero"], np.zeros((1, 8), dtype="float32"))
+    got, _ = store.get(["zero"])
+    assert not np.isnan(got).any() and not got.any()
+
+
+@pytest.mark.parametrize("dtype", ["float16", "int8"])
+def test_quantized_rows_come_back_unit_norm(tmp_path, dtype):
+    store = EmbeddingStore(tmp_path, 64, dtype)
+    store.add([f"k{i}" for i in range(20)], _unit(20, 64, seed=3))
+    got, _ = store.get([f"k{i}" for i in range(20)])
+    np.testing.assert_allclose(np.linalg.norm(got, axis=1), 1.0, atol=1e-5)
+
+
+def test_refit_tfidf_model_gets_a_new_store(tmp_path, monkeypatch):
+    from Agentic_AI import embedding, embedding_store
+
+    texts = [f"python sql engineer {i} spark aws docker" for i in range(20)]
+    path = tmp_path / "tfidf.npz"
+    embedding.fit_tfidf_svd(texts, n_components=8, path=path, seed=0)
+    monkeypatch.setattr(embedding_store, "EMBED_STORE_DTYPE", "float32")
+    monkeypatch.setattr(embedding, "get_embedding_model", lambda: embedding.TfidfSvdBackend(path))
+    before = embedding_store.store_name()
+    embedding.fit_tfidf_svd(texts + ["kubernetes terraform golang"] * 5, n_components=8, path=path, seed=0)
+    after = embedding_store.store_name()
+    assert before != after
+    assert before.startswith("tfidf-") and before.endswith("-8-float32")
@@ -0,0 +1,57 @@
+from dataclasses import replace
+
+import pytest
+
+from Agentic_AI import feature_store
+from Agentic_AI.feature_store import FeatureStore
+from Agentic_AI.scoring import extract_features
+from Agentic_AI.resume_parser import parse_resume
+from benchmarks.synthetic import generate_corpus
+
+
+@pytest.fixture
+def extracted(monkeypatch):
+    calls = []
+
+    def counting(resume):
+        calls.append(resume.resume_id)
+        return extract_features(resume)
+
+    monkeypatch.setattr(feature_store, "extract_features", counting)
+    return calls
+
+
+@pytest.fixture
+def resumes(tmp_path):
+    return [parse_resume(p) for p in generate_corpus(tmp_path / "pool", 3, formats=["txt"])]
+
+
+def test_features_are_reused_across_stores(tmp_path, resumes, extracted):
+    first = FeatureStore(tmp_path / "f.sqlite").get_many(resumes)
+    assert len(extracted) == 3
+    # A new process (fresh store, empty memo) reads them from disk
+    assert FeatureStore(tmp_path / "f.sqlite").get_many(resumes) == first
+    assert len(extracted) == 3
+
+
+def test_changed_resume_misses(tmp_path, resumes, extracted):
+    store = FeatureStore(tmp_path / "f.sqlite")
+    store.get_many(resumes)
+    edited = replace(resumes[0], raw_text=resumes[0].raw_text + "\nKubernetes, Terraform")
+    store.get_many([edited])
+    assert extracted[-1] == edited.resume_id and len(extracted) == 4
+
+
+def test_parser_change_misses(tmp_path, resumes, extracted):
+    FeatureStore(tmp_path / "f.sqlite").get_many(resumes)
+    # Same text, different section boundaries (e.g. a new parser release)
+    reparsed = replace(resumes[0], sections={**resumes[0].sections, "skills": "python"})
+    FeatureStore(tmp_path / "f.sqlite").get_many([reparsed])
+    assert len(extracted) == 4
+
+
+def test_feature_version_bump_misses(tmp_path, resumes, extracted, monkeypatch):
+    FeatureStore(tmp_path / "f.sqlite").get_many(resumes)
+    monkeypatch.setattr(feature_store, "FEATURE_VERSION", feature_store.FEATURE_VERSION + 1)
+    FeatureStore(tmp_path / "f.sqlite").get_many(resumes)
+    assert len(extracted) == 6
@@ -0,0 +1,11 @@
+import pytest
+
+from benchmarks import import_time
+
+
+@pytest.mark.parametrize("module", ["Agentic_AI.graph", "Agentic_AI.batch"])
+def test_package_import_defers_heavy_dependencies_and_data_dirs(module):
+    before = import_time._data_dir_snapshot()
+    result = import_time.measure(module, repeat=1)
+    assert result["lazy_loaded"] == []
+    assert import_time._data_dir_snapshot() == before
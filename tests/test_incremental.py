@@ -0,0 +1,81 @@
+import dataclasses
+
+import numpy as np
+import pytest
+
+from Agentic_AI import scoring
+from Agentic_AI.config import DEFAULT_WEIGHTS
+from Agentic_AI.embedding import embed_texts
+from Agentic_AI.incremental import ScoringCache, score_incremental
+from Agentic_AI.resume_parser import parse_resume_bytes
+from Agentic_AI.schemas import JD
+from benchmarks.synthetic import generate_corpus
+
+
+def _resumes(tmp_path, n):
+    paths = generate_corpus(tmp_path / "pool", n, formats=["txt"])
+    return [parse_resume_bytes(open(p, "rb").read(), p) for p in paths]
+
+
+def test_memos_are_bounded(tmp_path):
+    cache = ScoringCache(max_resumes=4, max_jds=2)
+    resumes = _resumes(tmp_path, 10)
+    for i in range(5):
+        jd = JD(f"Role {i}", must_have_skills=[f"skill{i}", "python"])
+        score_incremental(cache, jd, resumes, dict(DEFAULT_WEIGHTS))
+    assert len(cache._jd_embeds) == 2
+    assert len(cache._resume_embeds) == 8
+    assert len(cache._skill_hits) <= 64
+    assert all(len(cache._skill_hits.get(s)) <= 4 for s in ("python", "skill4"))
+
+
+def test_pool_larger_than_cache_scores_like_a_fresh_cache(tmp_path):
+    resumes = _resumes(tmp_path, 10)
+    jd = JD("Data Engineer", must_have_skills=["python", "sql"], key_outcomes=["reduced latency"])
+    small = ScoringCache(max_resumes=3)
+    for _ in range(2):  # second pass: hits and misses mixed, evicting as it goes
+        got = score_incremental(small, jd, resumes, dict(DEFAULT_WEIGHTS))
+    want = score_incremental(ScoringCache(), jd, resumes, dict(DEFAULT_WEIGHTS))
+    np.testing.assert_allclose(
+        [c.scores.composite_score for c in got], [c.scores.composite_score for c in want], rtol=1e-6
+    )
+
+
+def _fresh(jd, resumes, weights, blind_mode):
+    return scoring.score_candidates(
+        jd,
+        resumes,
+        weights,
+        embed_texts([scoring.jd_embed_text(jd)])[0],
+        scoring.embed_resumes(resumes, blind_mode=blind_mode),
+        [scoring.extract_features(r) for r in resumes],
+    )
+
+
+def _assert_same_scores(got, want):
+    assert len(got) == len(want)
+    for a, b in zip(got, want):
+        assert a.resume is b.resume
+        np.testing.assert_allclose(
+            list(dataclasses.astuple(a.scores)), list(dataclasses.astuple(b.scores)), rtol=1e-5, atol=1e-6
+        )
+        for extra in ("must_have_hits", "must_have_miss", "nice_to_have_hits", "years_experience"):
+            assert getattr(a.scores, extra) == pytest.approx(getattr(b.scores, extra))
+
+
+@pytest.mark.parametrize("blind_mode", [False, True])
+def test_jd_edits_score_like_score_candidates(tmp_path, blind_mode):
+    resumes = _resumes(tmp_path, 12)
+    weights = dict(DEFAULT_WEIGHTS, skill=0.5, semantic=0.2)
+    edits = [
+        JD("Data Engineer", must_have_skills=["python", "sql"]),
+        JD("Data Engineer", must_have_skills=["python", "sql", "spark"], nice_to_have_skills=["aws"]),
+        JD("Data Engineer", must_have_skills=["python", "spark"], min_years_experience=5,
+           key_outcomes=["reduced latency"]),
+        JD("Data Engineer", must_have_skills=["python", "sql"]),  # back to the first JD
+    ]
+    # max_resumes=5 < 12 resumes: every pass evicts and recomputes part of the pool
+    cache = ScoringCache(max_resumes=5, max_jds=1)
+    for jd in edits:
+        got = score_incremental(cache, jd, resumes, weights, blind_mode)
+        _assert_same_scores(got, _fresh(jd, resumes, weights, blind_mode))
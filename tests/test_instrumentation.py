@@ -0,0 +1,46 @@
+import json
+
+from Agentic_AI.config import DEFAULT_WEIGHTS
+from Agentic_AI.graph import build_agent_graph
+from Agentic_AI.instrumentation import RunProfile, instrument_node, record_cache_hits, span
+from benchmarks.synthetic import generate_corpus, generate_jds
+
+
+def test_spans_aggregate_per_parent_and_name():
+    @instrument_node("work")
+    def node(state):
+        for _ in range(3):
+            with span("step") as sp:
+                sp.items = 2
+                record_cache_hits()
+        return {}
+
+    profile = RunProfile()
+    out = node({"perf": profile})
+    assert out["perf"] is profile
+    rows = {(r["parent"], r["name"]): r for r in profile.spans()}
+    assert rows[(None, "node.work")]["calls"] == 1
+    step = rows[("node.work", "step")]
+    assert (step["calls"], step["items"], step["cache_hits"]) == (3, 6, 3)
+    with span("outside") as sp:  # no active run: a no-op
+        sp.items = 1
+    assert len(profile.spans()) == 2
+
+
+def test_graph_run_reports_every_node_and_llm_usage(stubs, data_dirs, tmp_path):
+    paths = generate_corpus(tmp_path / "pool", 4, formats=["txt"])
+    state = build_agent_graph().invoke({
+        "run_id": "perf",
+        "jd_text": generate_jds(1)[0],
+        "resume_paths": paths,
+        "weights": dict(DEFAULT_WEIGHTS),
+    })
+    spans = state["perf"].spans()
+    nodes = [s["name"] for s in spans if s["parent"] is None]
+    assert len(nodes) == len(set(nodes))
+    assert {"node.parse_jd", "node.parse_resumes", "node.score_full", "node.score_blind"} <= set(nodes)
+    jd_call = next(s for s in spans if s["parent"] == "node.parse_jd" and s["name"].startswith("llm."))
+    assert jd_call["calls"] == 1 and jd_call["prompt_tokens"] > 0 and jd_call["completion_tokens"] > 0
+    parsed = next(s for s in spans if s["parent"] == "node.parse_resumes")
+    assert parsed["calls"] == 4 and parsed["items"] == 4
+    json.dumps(state["perf"].to_dict())  # logged with the run
@@ -0,0 +1,95 @@
+import os
+import signal
+import time
+
+import pytest
+
+from Agentic_AI import job_server
+from Agentic_AI.config import DEFAULT_WEIGHTS
+from Agentic_AI.graph import build_agent_graph
+from Agentic_AI.job_client import JobClient
+from Agentic_AI.job_server import Job, JobManager, QueueFull, run_job, start_server
+from Agentic_AI.serialization import candidate_to_dict, jd_to_dict
+from benchmarks.synthetic import generate_corpus, generate_jds
+
+
+def _wait_terminal(manager, job, timeout=60.0):
+    deadline = time.monotonic() + timeout
+    while job.state in ("queued", "running") and time.monotonic() < deadline:
+        time.sleep(0.05)
+    return job.state
+
+
+def test_dead_worker_fails_job_and_frees_slot():
+    manager = JobManager(workers=1, queue_depth=4)
+    try:
+        job = manager.submit({"jd_text": "x", "resumes": []}, "a")
+        while job.state == "queued":
+            time.sleep(0.01)
+        for pid in list(manager.pool._processes):  # simulate an OOM kill
+            os.kill(pid, signal.SIGKILL)
+        assert _wait_terminal(manager, job) == "failed"
+        assert "worker process died" in job.error
+
+        # The slot was released and a fresh pool took over
+        nxt = manager.submit({"jd_text": "x"}, "a")  # no resumes: fails fast in the worker
+        assert _wait_terminal(manager, nxt) == "failed"
+        assert "KeyError" in nxt.error
+        assert manager.health()["running"] == 0
+    finally:
+        manager.close()
+
+
+def test_partial_ranking_pages_while_running(stubs, data_dirs, tmp_path):
+    paths = generate_corpus(tmp_path / "pool", 7, formats=["txt"])
+    chunks = []
+    final = build_agent_graph().invoke({
+        "run_id": "partial",
+        "jd_text": generate_jds(1)[0],
+        "resume_files": [(p, open(p, "rb").read()) for p in paths],
+        "weights": dict(DEFAULT_WEIGHTS),
+        "chunk_size": 3,
+        "on_scored": lambda jd, scored: chunks.append((jd, scored)),
+    })
+    assert [len(scored) for _, scored in chunks] == [3, 3, 1]
+
+    manager = JobManager(workers=1, queue_depth=4)
+    server, url = start_server(0, manager)
+    try:
+        job = Job("j1", "a", {"jd_text": "x", "resumes": [{}] * 7}, state="running")
+        manager.jobs[job.job_id] = job
+        client = JobClient(url)
+        for jd, scored in chunks:
+            manager._publish(job.job_id, jd_to_dict(jd), [candidate_to_dict(c) for c in scored])
+        assert client.status(job.job_id)["n_scored"] == 7
+
+        _, page, summary = client.results(job.job_id, offset=2, limit=3)
+        assert summary["partial"] and summary["total"] == 7 and summary["n_resumes"] == 7
+        # Once every chunk is in, the partial ranking is the final one
+        expected = [c.resume.resume_id for c in final["full_results"]]
+        assert [c.resume.resume_id for c in page] == expected[2:5]
+    finally:
+        server.shutdown()
+        manager.close()
+
+
+def test_missing_weights_default_and_full_queue_leaves_no_job(monkeypatch):
+    seen = {}
+
+    class Graph:
+        def invoke(self, state):
+            seen.update(state)
+            raise RuntimeError("stop")
+
+    monkeypatch.setattr(job_server, "_GRAPH", Graph())
+    with pytest.raises(RuntimeError):
+        run_job("j", {"jd_text": "x", "resumes": []})
+    assert seen["weights"] == DEFAULT_WEIGHTS
+
+    manager = JobManager(workers=1, queue_depth=0)
+    try:
+        with pytest.raises(QueueFull):
+            manager.submit({"jd_text": "x", "resumes": []}, "a")
+        assert manager.jobs == {}
+    finally:
+        manager.close()
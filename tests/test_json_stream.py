@@ -0,0 +1,44 @@
+import json
+
+import pytest
+
+from Agentic_AI.json_stream import JSONFieldScanner
+
+DOC = {
+    "rationales": [
+        {"resume_id": "r1", "summary": 'Led "Project X"; cut cost\\u2014 by 30%', "action": "shortlist"},
+        {"resume_id": "r2", "summary": "Line one\nline two \\ backslash, braces {} and [brackets]", "action": "reject"},
+    ]
+}
+
+
+def _final_fields(chunks):
+    scanner = JSONFieldScanner()
+    last = {}
+    for chunk in chunks:
+        for fields in scanner.feed(chunk):
+            if "resume_id" in fields:
+                last[fields["resume_id"]] = fields
+    return last
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64])
+def test_fields_survive_any_chunking(size):
+    text = "```json\n" + json.dumps(DOC, indent=1) + "\n```"
+    chunks = [text[i: i + size] for i in range(0, len(text), size)]
+    assert _final_fields(chunks) == {r["resume_id"]: r for r in DOC["rationales"]}
+
+
+def test_escape_split_across_chunks():
+    scanner = JSONFieldScanner()
+    updates = []
+    for chunk in ['{"summary": "say \\', '"hi\\', '" and \\u00', 'e9', '"}']:
+        updates += scanner.feed(chunk)
+    assert updates == [{"summary": 'say "hi" and é'}]
+
+
+def test_field_reported_when_its_quote_closes():
+    scanner = JSONFieldScanner()
+    assert scanner.feed('{"resume_id": "r1", "summary": "Strong') == [{"resume_id": "r1"}]
+    assert scanner.feed(' match"') == [{"resume_id": "r1", "summary": "Strong match"}]
+    assert scanner.feed(', "score": 0.9, "tags": ["a", "b"]}') == []
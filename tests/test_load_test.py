@@ -0,0 +1,25 @@
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _tree(path: Path) -> dict:
+    return {p: p.stat().st_mtime_ns for p in path.rglob("*")} if path.exists() else {}
+
+
+def test_graph_load_run_reports_levels_and_leaves_data_alone(tmp_path):
+    before = _tree(ROOT / "data")
+    out = tmp_path / "load.json"
+    subprocess.run(
+        [sys.executable, "-m", "benchmarks.load_test", "--target", "graph", "--users", "1", "2",
+         "--runs-per-user", "1", "--resumes-per-run", "3", "--corpus", "6", "--formats", "txt",
+         "--latency", "0", "--warmup", "0", "--corpus-dir", str(tmp_path / "corpus"), "--output", str(out)],
+        cwd=ROOT, check=True, capture_output=True, text=True, timeout=300,
+    )
+    levels = json.loads(out.read_text(encoding="utf-8"))["levels"]
+    assert [(lv["users"], lv["runs"], lv["failed"]) for lv in levels] == [(1, 1, 0), (2, 2, 0)]
+    assert all("node.score_full" in lv["stages"] for lv in levels)
+    assert _tree(ROOT / "data") == before
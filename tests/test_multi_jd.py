@@ -0,0 +1,62 @@
+import numpy as np
+
+from Agentic_AI.config import DEFAULT_WEIGHTS
+from Agentic_AI.multi_jd import rank_candidates_multi
+from Agentic_AI.resume_parser import parse_resume
+from Agentic_AI.schemas import JD
+from Agentic_AI.scoring import rank_candidates
+
+JDS = [
+    JD("Data Engineer", must_have_skills=["Python", "SQL", "Apache Spark"], nice_to_have_skills=["AWS"],
+       min_years_experience=3, key_outcomes=["scale data pipelines"]),
+    JD("ML Engineer", must_have_skills=["PyTorch", "Machine Learning"], nice_to_have_skills=["Kubernetes", "MLOps"],
+       min_years_experience=5),
+    JD("Backend Engineer", must_have_skills=["Java", "PostgreSQL", "Docker"]),
+]
+
+SKILLS = [
+    "Python, SQL, Apache Spark, AWS",
+    "PyTorch, Machine Learning, MLOps",
+    "Java, PostgreSQL, Docker, Kubernetes",
+    "Python, Machine Learning, SQL",
+    "Excel, PowerPoint",
+    "Java, Python, Docker",
+]
+
+
+def _resumes(tmp_path):
+    resumes = []
+    for i, skills in enumerate(SKILLS * 2):
+        path = tmp_path / f"resume_{i}.txt"
+        path.write_text(
+            f"Candidate {i}\ncandidate{i}@example.com\n\nSkills\n{skills}\n\n"
+            f"Experience\n{i % 8 + 1} years of experience. Helped scale data pipelines and cut costs by {i}0%.\n",
+            encoding="utf-8",
+        )
+        resumes.append(parse_resume(str(path)))
+    return resumes
+
+
+def test_matrix_ranking_matches_per_jd_ranking(stubs, tmp_path):
+    resumes = _resumes(tmp_path)
+    result = rank_candidates_multi(JDS, resumes, dict(DEFAULT_WEIGHTS))
+
+    best = {}
+    for jd, ranked in zip(JDS, result.rankings):
+        want = rank_candidates(jd, resumes, dict(DEFAULT_WEIGHTS))
+        assert [c.resume.resume_id for c in ranked] == [c.resume.resume_id for c in want]
+        assert [c.rank_full for c in ranked] == list(range(1, len(resumes) + 1))
+        for got, exp in zip(ranked, want):
+            np.testing.assert_allclose(got.scores.composite_score, exp.scores.composite_score, rtol=1e-5)
+            assert got.scores.must_have_hits == exp.scores.must_have_hits
+            assert got.scores.nice_to_have_hits == exp.scores.nice_to_have_hits
+            best.setdefault(got.resume.resume_id, []).append(got.scores.composite_score)
+    for rid, scores in best.items():
+        j, score = result.best_fit[rid]
+        assert j == int(np.argmax(scores))
+        np.testing.assert_allclose(score, max(scores), rtol=1e-5)
+
+
+def test_empty_pool_gives_an_empty_ranking_per_jd():
+    result = rank_candidates_multi(JDS, [], dict(DEFAULT_WEIGHTS))
+    assert result.rankings == [[], [], []] and result.best_fit == {}
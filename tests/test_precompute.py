@@ -0,0 +1,58 @@
+import time
+
+import pytest
+
+from Agentic_AI import graph, incremental, precompute
+from Agentic_AI.config import DEFAULT_WEIGHTS
+from Agentic_AI.incremental import ScoringCache
+from Agentic_AI.precompute import Precomputer
+from benchmarks.synthetic import generate_corpus, generate_jds
+
+
+def _wait_for_jd(pre: Precomputer, timeout: float = 10.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not pre.status()["jd_ready"]:
+        assert time.monotonic() < deadline, "JD was never precomputed"
+        time.sleep(0.01)
+
+
+def _run(uploads, jd_text, cache=None):
+    state = {"run_id": "pre", "jd_text": jd_text, "resume_files": uploads, "weights": dict(DEFAULT_WEIGHTS)}
+    if cache is not None:
+        state["scoring_cache"] = cache
+    out = graph.build_agent_graph().invoke(state)
+    return {c.resume.raw_text: (c.rank_full, c.scores.composite_score) for c in out["full_results"]}
+
+
+def test_run_after_precompute_only_scores(monkeypatch, stubs, data_dirs, tmp_path):
+    paths = generate_corpus(tmp_path / "pool", 6, formats=["txt", "pdf"])
+    uploads = [(p, open(p, "rb").read()) for p in paths]
+    draft, jd_text = generate_jds(2)
+
+    parsed = []
+    parse_jd = precompute.parse_jd
+    monkeypatch.setattr(precompute, "parse_jd", lambda text: parsed.append(text) or parse_jd(text))
+
+    cache = ScoringCache()
+    pre = Precomputer(cache, debounce_s=0.05)
+    pre.submit_uploads(uploads)
+    pre.submit_jd(draft)
+    pre.submit_jd(jd_text)  # edited within the debounce window
+    _wait_for_jd(pre)
+    pre.wait()
+    assert parsed == [jd_text]
+    assert pre.status() == {"resumes_ready": 6, "resumes_total": 6, "jd_ready": True, "busy": False}
+
+    cold = _run(uploads, jd_text)
+
+    def recomputed(*a, **kw):
+        pytest.fail("run redid precomputed work")
+
+    for module, name in [(graph, "parse_jd"), (graph, "parse_resume_bytes"),
+                         (incremental, "embed_resumes"), (incremental, "embed_texts")]:
+        monkeypatch.setattr(module, name, recomputed)
+    warm = _run(uploads, jd_text, cache)
+    assert warm.keys() == cold.keys()
+    for text, (rank, score) in cold.items():
+        assert warm[text][0] == rank
+        assert warm[text][1] == pytest.approx(score, rel=1e-6)
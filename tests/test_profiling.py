@@ -0,0 +1,57 @@
+import json
+import threading
+
+from Agentic_AI import profiling
+from Agentic_AI.graph import build_agent_graph
+from Agentic_AI.config import DEFAULT_WEIGHTS
+from benchmarks.synthetic import generate_corpus, generate_jds
+
+
+class _OverlappingGraph:
+    """Both runs are inside their nodes at the same time."""
+
+    def __init__(self):
+        self.barrier = threading.Barrier(2)
+
+    def invoke(self, state):
+        profiling.node_started(state["node"])
+        self.barrier.wait(timeout=10)
+        self.barrier.wait(timeout=10)
+        profiling.node_finished(state["node"])
+        return state
+
+
+def test_overlapping_runs_keep_their_own_profiles(tmp_path):
+    graph = _OverlappingGraph()
+    runs = [
+        threading.Thread(target=profiling.profile_invoke, args=(graph, {"node": f"node_{i}"}, f"run{i}", tmp_path))
+        for i in range(2)
+    ]
+    for t in runs:
+        t.start()
+    for t in runs:
+        t.join()
+
+    reports = [json.loads((tmp_path / f"run{i}" / "memory.json").read_text()) for i in range(2)]
+    # One run traced memory; the other was refused tracemalloc and is CPU-only
+    traced = [r for r in reports if "memory_skipped" not in r]
+    assert len(traced) == 1
+    (report,) = traced
+    assert list(report["nodes"]) == [f"node_{report['run_id'][-1]}"]
+    assert all((tmp_path / f"run{i}" / "cpu.prof").exists() for i in range(2))
+
+
+def test_graph_nodes_are_profiled(stubs, data_dirs, tmp_path):
+    paths = generate_corpus(tmp_path / "pool", 3, formats=["txt"])
+    state = {
+        "run_id": "profiled",
+        "jd_text": generate_jds(1)[0],
+        "resume_paths": paths,
+        "weights": dict(DEFAULT_WEIGHTS),
+    }
+    _, out_dir = profiling.profile_invoke(build_agent_graph(), state, "profiled", tmp_path / "profiles")
+    report = json.loads((out_dir / "memory.json").read_text())
+    assert {"score_full", "score_blind"} <= set(report["nodes"])
+    # Per-run memory is the traced peak; RSS is labelled as the process-lifetime peak
+    assert report["peak_traced_mb"] > 0
+    assert "peak_rss_mb" not in report and report["process_peak_rss_mb"] >= report["peak_traced_mb"]
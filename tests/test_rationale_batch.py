@@ -0,0 +1,59 @@
+import pytest
+
+from Agentic_AI import llm_utils
+
+
+def _rationale(summary: str) -> dict:
+    return {"summary": summary, "evidence": [{"text": "Python", "source": "skills"}], "confidence": 0.8, "action": "Review"}
+
+
+@pytest.fixture
+def retries(monkeypatch):
+    calls = []
+
+    def single(jd_json, candidate, evidence, on_partial=None):
+        calls.append(candidate["resume_id"])
+        return _rationale(f"retried {candidate['resume_id']}")
+
+    monkeypatch.setattr(llm_utils, "get_llm", lambda **kw: object())
+    monkeypatch.setattr(llm_utils, "generate_rationale_llm", single)
+    return calls
+
+
+CANDIDATES = [{"resume_id": rid, "name": rid} for rid in ("a", "b", "c", "d")]
+
+
+def test_batch_keeps_valid_items_and_retries_the_rest(monkeypatch, retries):
+    reply = {"rationales": [
+        {"resume_id": "a", **_rationale("batched a")},
+        {"resume_id": "b", "summary": "no evidence or action"},
+        {"resume_id": "a", **_rationale("duplicate a")},
+        {"resume_id": "zz", **_rationale("not asked for")},
+        "not an object",
+        {"resume_id": "d", **_rationale("batched d")},
+    ]}
+    monkeypatch.setattr(llm_utils, "parse_json_from_llm", lambda *a, **kw: reply)
+
+    out = llm_utils.generate_rationales_batch_llm({"title": "Engineer"}, CANDIDATES, {})
+
+    assert sorted(retries) == ["b", "c"]
+    assert set(out) == {"a", "b", "c", "d"}
+    assert out["a"]["summary"] == "batched a" and out["d"]["summary"] == "batched d"
+    assert out["b"]["summary"] == "retried b" and out["c"]["summary"] == "retried c"
+    assert "resume_id" not in out["a"]
+
+
+def test_failed_batch_call_retries_every_candidate(monkeypatch, retries):
+    def boom(*a, **kw):
+        raise ValueError("unparseable")
+
+    monkeypatch.setattr(llm_utils, "parse_json_from_llm", boom)
+    out = llm_utils.generate_rationales_batch_llm({"title": "Engineer"}, CANDIDATES, {})
+    assert retries == ["a", "b", "c", "d"]
+    assert all(out[rid]["summary"] == f"retried {rid}" for rid in out)
+
+
+def test_single_candidate_skips_the_batch_prompt(monkeypatch, retries):
+    monkeypatch.setattr(llm_utils, "parse_json_from_llm", lambda *a, **kw: pytest.fail("batched a single candidate"))
+    out = llm_utils.generate_rationales_batch_llm({"title": "Engineer"}, CANDIDATES[:1], {})
+    assert retries == ["a"] and out["a"]["summary"] == "retried a"
@@ -0,0 +1,65 @@
+import jsonschema
+import pytest
+
+from Agentic_AI.llm_utils import RATIONALE_SCHEMA
+from Agentic_AI.rationale_policy import BORDERLINE, REJECT, SHORTLIST, RationalePolicy, template_rationale
+from Agentic_AI.schemas import JD, CandidateResult, CandidateScores, ResumeParsed
+
+POLICY = RationalePolicy(
+    shortlist_score=0.7, reject_score=0.3, min_gap=0.05, shortlist_coverage=1.0, reject_coverage=0.5, llm_budget=2
+)
+
+
+def _candidate(rid: str, score: float, hits: int = 2, miss: int = 0) -> CandidateResult:
+    scores = CandidateScores(0, 0, 0, 0, 0, score)
+    scores.must_have_hits = [f"skill{i}" for i in range(hits)]
+    scores.must_have_miss = [f"gap{i}" for i in range(miss)]
+    scores.years_experience = 4.0
+    resume = ResumeParsed(rid, rid, None, None, "skill0 in production\n", {"skills": "skill0, skill1"})
+    return CandidateResult(resume, scores, JD("Engineer", must_have_skills=["skill0", "skill1"]))
+
+
+def _plan(*candidates):
+    to_llm, templated = POLICY.plan(list(candidates))
+    return [c.resume.resume_id for c in to_llm], templated
+
+
+def test_clear_cases_are_templated():
+    to_llm, templated = _plan(_candidate("top", 0.9), _candidate("low", 0.2))
+    assert to_llm == [] and templated == {"top": SHORTLIST, "low": REJECT}
+
+
+@pytest.mark.parametrize(
+    "candidate, reason",
+    [
+        (_candidate("a", 0.69), "below the shortlist score"),
+        (_candidate("a", 0.9, hits=1, miss=1), "must-have coverage under shortlist_coverage"),
+    ],
+)
+def test_borderline_goes_to_the_llm(candidate, reason):
+    assert _plan(candidate, _candidate("z", 0.1))[0] == ["a"], reason
+
+
+def test_small_gap_to_the_next_candidate_is_borderline():
+    to_llm, templated = _plan(_candidate("a", 0.90), _candidate("b", 0.88), _candidate("c", 0.2))
+    # a is only 0.02 ahead of b; b is well ahead of c
+    assert to_llm == ["a"] and templated == {"b": SHORTLIST, "c": REJECT}
+
+
+def test_low_coverage_rejects_even_a_high_score():
+    assert _plan(_candidate("a", 0.95, hits=1, miss=3))[1] == {"a": REJECT}
+
+
+def test_llm_budget_caps_borderline_calls_in_rank_order():
+    ranked = [_candidate(f"b{i}", 0.5 - i * 0.01) for i in range(5)]
+    to_llm, templated = _plan(*ranked)
+    assert to_llm == ["b0", "b1"]
+    assert templated == {f"b{i}": BORDERLINE for i in range(2, 5)}
+
+
+@pytest.mark.parametrize("decision", [SHORTLIST, REJECT, BORDERLINE])
+def test_template_rationales_match_the_llm_schema(decision):
+    c = _candidate("a", 0.5, hits=1, miss=1)
+    c.rank_full = 1
+    rationale = template_rationale(c, c.jd, decision)
+    jsonschema.validate({k: v for k, v in rationale.items() if k != "generated_by"}, RATIONALE_SCHEMA)
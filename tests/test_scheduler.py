@@ -0,0 +1,70 @@
+import threading
+import time
+
+import openai
+import pytest
+
+from Agentic_AI.scheduler import BATCH, INTERACTIVE, AdaptiveScheduler
+from benchmarks.stub_openai_server import Limits, start_server
+
+
+@pytest.fixture
+def stub_server():
+    servers = []
+
+    def start(**limits):
+        server, url = start_server(0, Limits(**limits))
+        servers.append(server)
+        return openai.OpenAI(base_url=url, api_key="stub", max_retries=0)
+
+    yield start
+    for server in servers:
+        server.shutdown()
+
+
+def _chat(client):
+    return lambda: client.chat.completions.create(model="stub", messages=[{"role": "user", "content": "hi"}])
+
+
+def test_interactive_calls_finish_before_queued_batch_calls(stub_server):
+    client = stub_server(latency=0.1)
+    sched = AdaptiveScheduler("chat", 0, 0, max_concurrency=1, target_latency=10)
+    finished = []
+
+    def run(name, level):
+        sched.call(_chat(client), level=level)
+        finished.append(name)
+
+    threads = [threading.Thread(target=run, args=(f"batch{i}", BATCH)) for i in range(4)]
+    for t in threads:
+        t.start()
+    while sched.snapshot()["queued"] < 3:  # one batch call in flight, three waiting
+        time.sleep(0.01)
+    interactive = threading.Thread(target=run, args=("interactive", INTERACTIVE))
+    interactive.start()
+    for t in threads + [interactive]:
+        t.join()
+    assert finished.index("interactive") == 1
+    assert sched.snapshot()["calls"] == 5
+
+
+def test_rate_limits_cut_concurrency(stub_server):
+    client = stub_server(rate_limit_rate=1.0)
+    sched = AdaptiveScheduler("chat", 0, 0, max_concurrency=8, max_retries=0)
+    errors = []
+
+    def run():
+        try:
+            sched.call(_chat(client))
+        except openai.RateLimitError as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=run) for _ in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    stats = sched.snapshot()
+    assert len(errors) == 16
+    assert stats["rate_limited"] == stats["failures"] == 16  # no lost updates
+    assert stats["concurrency_limit"] == 4  # halved once per cooldown, not once per 429
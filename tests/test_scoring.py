@@ -0,0 +1,37 @@
+from Agentic_AI.graph import build_agent_graph
+from Agentic_AI.config import DEFAULT_WEIGHTS
+from Agentic_AI.schemas import JD, CandidateResult, CandidateScores, ResumeParsed
+from Agentic_AI.scoring import sort_candidates
+from benchmarks.synthetic import generate_corpus, generate_jds
+
+
+def _candidate(i: int, score: float) -> CandidateResult:
+    resume = ResumeParsed(f"r{i}", f"Candidate {i}", None, None, "", {})
+    jd = JD("Engineer")
+    return CandidateResult(resume, CandidateScores(0, 0, 0, 0, 0, score), jd)
+
+
+def test_sort_candidates_top_k_matches_stable_sort():
+    scores = [0.5, 0.9, 0.7, 0.9, 0.7, 0.1, 0.7, 0.5]
+    results = [_candidate(i, s) for i, s in enumerate(scores)]
+    full = [c.resume.resume_id for c in sort_candidates(results)]
+    assert full == ["r1", "r3", "r2", "r4", "r6", "r0", "r7", "r5"]
+    for k in range(1, len(results) + 1):
+        # Ties at the cut keep input order, exactly as in the full sort
+        assert [c.resume.resume_id for c in sort_candidates(results, k)] == full[:k]
+
+
+def test_top_k_keeps_blind_ranks_for_the_whole_pool(stubs, data_dirs, tmp_path):
+    paths = generate_corpus(tmp_path / "pool", 7, formats=["txt"])
+    files = [(p, open(p, "rb").read()) for p in paths]
+    state = build_agent_graph().invoke({
+        "run_id": "top-k",
+        "jd_text": generate_jds(1)[0],
+        "resume_files": files,
+        "weights": dict(DEFAULT_WEIGHTS),
+        "top_k": 2,
+    })
+    assert len(state["full_results"]) == 2
+    blind_ranks = {c.resume.resume_id: c.rank_blind for c in state["blind_results"]}
+    assert sorted(blind_ranks.values()) == list(range(1, 8))
+    assert all(c.resume.resume_id in blind_ranks for c in state["full_results"])
@@ -0,0 +1,127 @@
+import socket
+import threading
+
+import pytest
+
+from Agentic_AI import graph
+from Agentic_AI.config import DEFAULT_WEIGHTS
+from Agentic_AI.embedding import embed_texts
+from Agentic_AI.resume_parser import parse_resume
+from Agentic_AI.schemas import JD, CandidateResult, CandidateScores, ResumeParsed
+from Agentic_AI.scoring import jd_embed_text, sort_candidates
+from Agentic_AI.sharding import (
+    ShardTask,
+    pool_ranks,
+    run_remote,
+    score_shard,
+    serve_queues,
+    split_shards,
+    work,
+)
+from benchmarks.synthetic import generate_corpus, generate_jds
+
+AUTHKEY = b"test-secret"
+
+
+def _free_address() -> str:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return f"127.0.0.1:{s.getsockname()[1]}"
+
+
+def _wait_for(address: str) -> None:
+    host, port = address.split(":")
+    for _ in range(100):
+        try:
+            socket.create_connection((host, int(port)), timeout=0.1).close()
+            return
+        except OSError:
+            threading.Event().wait(0.05)
+
+
+def test_concurrent_coordinators_get_their_own_results(tmp_path):
+    address = _free_address()
+    threading.Thread(target=serve_queues, args=(address, AUTHKEY), daemon=True).start()
+    _wait_for(address)
+    threading.Thread(target=work, args=(address, AUTHKEY), daemon=True).start()
+
+    resumes = [parse_resume(p) for p in generate_corpus(tmp_path / "pool", 8, formats=["txt"])]
+    jd = JD("Data Engineer", must_have_skills=["python", "sql"])
+    jd_embed = embed_texts([jd_embed_text(jd)])[0]
+    outputs = {}
+
+    def coordinate(run: int) -> None:
+        tasks = [ShardTask(i, jd, jd_embed, shard, dict(DEFAULT_WEIGHTS), False, 0) for i, shard in enumerate(split_shards(resumes, 4))]
+        outputs[run] = sorted(r.shard for r in run_remote(tasks, address, AUTHKEY, timeout=30))
+
+    runs = [threading.Thread(target=coordinate, args=(run,)) for run in range(3)]
+    for t in runs:
+        t.start()
+    for t in runs:
+        t.join()
+    assert outputs == {run: [0, 1, 2, 3] for run in range(3)}
+
+
+def test_network_address_requires_authkey():
+    with pytest.raises(ValueError, match="SHARD_AUTHKEY"):
+        serve_queues("0.0.0.0:50000", b"")
+    with pytest.raises(ValueError, match="SHARD_AUTHKEY"):
+        list(run_remote([], "10.1.2.3:50000", b""))
+
+
+def test_loopback_runs_without_authkey(tmp_path):
+    address = _free_address()
+    threading.Thread(target=serve_queues, args=(address, b""), daemon=True).start()
+    _wait_for(address)
+    threading.Thread(target=work, args=(address, b""), daemon=True).start()
+    resumes = [parse_resume(p) for p in generate_corpus(tmp_path / "pool", 2, formats=["txt"])]
+    jd = JD("Data Engineer")
+    task = ShardTask(0, jd, embed_texts([jd_embed_text(jd)])[0], resumes, dict(DEFAULT_WEIGHTS))
+    assert [r.shard for r in run_remote([task], address, b"", timeout=30)] == [0]
+
+
+def test_pool_ranks_match_a_stable_sort_of_the_pool(monkeypatch):
+    scores = [0.5, 0.9, 0.7, 0.9, 0.7, 0.1, 0.7, 0.5, 0.3]
+    candidates = {
+        f"r{i}": CandidateResult(ResumeParsed(f"r{i}", "", None, None, "", {}), CandidateScores(0, 0, 0, 0, 0, s), JD("x"))
+        for i, s in enumerate(scores)
+    }
+    expected = {c.resume.resume_id: i + 1 for i, c in enumerate(sort_candidates(list(candidates.values())))}
+    keep = ["r0", "r2", "r4", "r6", "r8"]
+
+    def fake_score(jd, resumes, *args):
+        return [candidates[r.resume_id] for r in resumes]
+
+    monkeypatch.setattr("Agentic_AI.scoring.embed_resumes", lambda resumes, blind_mode=False: None)
+    monkeypatch.setattr("Agentic_AI.scoring.score_candidates", fake_score)
+    monkeypatch.setattr("Agentic_AI.feature_store.resume_features", lambda resumes: None)
+    results = []
+    for i, shard in enumerate(split_shards([c.resume for c in candidates.values()], 3)):
+        ids = [r.resume_id for r in shard if r.resume_id in keep]
+        results.append(score_shard(ShardTask(i, JD("x"), None, shard, {}, True, 0, ids)))
+    # Only the kept candidates travel back, ranked against the whole pool
+    assert sorted(c.resume.resume_id for r in results for c in r.top) == keep
+    assert pool_ranks(results) == {k: expected[k] for k in keep}
+
+
+def test_sharded_top_k_keeps_pool_wide_blind_ranks(stubs, data_dirs, tmp_path, monkeypatch):
+    monkeypatch.setattr(graph, "SHARD_WORKERS", 1)  # shards run in this process, with the stubs
+    paths = generate_corpus(tmp_path / "pool", 30, formats=["txt"])
+    files = [(p, open(p, "rb").read()) for p in paths]
+    jd_text = generate_jds(1)[0]
+
+    def run(shards):
+        return graph.build_agent_graph().invoke({
+            "run_id": f"shards{shards}",
+            "jd_text": jd_text,
+            "resume_files": files,
+            # Semantic only: redacting PII moves blind ranks away from the full ones
+            "weights": {"skill": 0.0, "semantic": 1.0, "experience": 0.0, "outcome": 0.0, "risk": 0.0},
+            "shards": shards,
+            "top_k": 5,
+        })
+
+    sharded, whole = run(3), run(0)
+    assert len(sharded["blind_results"]) == 5  # not the whole pool
+    ranks = lambda state: [(c.resume.raw_text, c.rank_full, c.rank_blind) for c in state["full_results"]]
+    assert ranks(sharded) == ranks(whole)[:5]
@@ -0,0 +1,18 @@
+import json
+
+import pyarrow.parquet as pq
+
+from Agentic_AI import storage
+from Agentic_AI.results_table import results_table
+
+
+def test_log_run_points_at_the_parquet_table(data_dirs):
+    storage.log_run({"role_title": "Engineer"}, {"skills": 1.0}, results_table([]), run_id="r1")
+    storage.log_run({"role_title": "Engineer"}, {"skills": 1.0}, results_table([]), run_id="r2")
+    entries = [json.loads(line) for line in storage.RUNS_LOG.read_text(encoding="utf-8").splitlines()]
+    assert [e["run_id"] for e in entries] == ["r1", "r2"]
+    for entry in entries:
+        # "candidates" meant the candidate list in older lines: not reused for a count
+        assert "candidates" not in entry
+        assert entry["n_candidates"] == 0
+        assert pq.read_table(storage.LOG_DIR / entry["results_path"]).num_rows == 0
@@ -0,0 +1,57 @@
+import json
+
+import pytest
+
+from Agentic_AI import streaming
+from Agentic_AI.checkpoint import RunCheckpoint
+from Agentic_AI.config import DEFAULT_WEIGHTS
+from Agentic_AI.graph import build_agent_graph
+from Agentic_AI.jd_parser import parse_jd
+from benchmarks.synthetic import generate_corpus, generate_jds
+
+
+@pytest.fixture
+def pool(stubs, data_dirs, tmp_path, monkeypatch):
+    monkeypatch.setattr(streaming, "STREAM_SPILL_DIR", tmp_path / "spill")
+    return [str(p) for p in generate_corpus(tmp_path / "pool", 20, formats=["txt"])]
+
+
+def test_resume_after_crash_mid_chunk_spills_each_resume_once(pool, tmp_path, monkeypatch):
+    jd = parse_jd(generate_jds(1)[0])
+    score_chunk = streaming.score_chunk
+    calls = []
+
+    def crash_on_second_chunk(*args):
+        calls.append(1)
+        if len(calls) == 2:  # after the chunk was spilled, before it was checkpointed
+            raise RuntimeError("killed")
+        return score_chunk(*args)
+
+    monkeypatch.setattr(streaming, "score_chunk", crash_on_second_chunk)
+    run = lambda: streaming.stream_rank(
+        jd, pool, DEFAULT_WEIGHTS, top_k=3, spill=True, run_id="r", ckpt=RunCheckpoint("r"), first_chunk=4
+    )
+    with pytest.raises(RuntimeError):
+        run()
+    monkeypatch.setattr(streaming, "score_chunk", score_chunk)
+    result = run()
+
+    lines = (tmp_path / "spill" / "r.jsonl").read_text(encoding="utf-8").splitlines()
+    assert sorted(json.loads(line)["path"] for line in lines) == sorted(pool)
+    assert result.table.num_rows == len(pool)
+
+
+def test_streamed_ranking_matches_the_graph(pool):
+    jd_text = generate_jds(1)[0]
+    final = build_agent_graph().invoke({
+        "run_id": "graph",
+        "jd_text": jd_text,
+        "resume_paths": pool,
+        "weights": dict(DEFAULT_WEIGHTS),
+        "dedupe": False,
+    })
+    result = streaming.stream_rank(final["jd"], pool, DEFAULT_WEIGHTS, top_k=5, first_chunk=4)
+    assert result.chunks > 1
+    want = [(c.resume.raw_text, c.rank_full, c.rank_blind) for c in final["full_results"][:5]]
+    assert [(c.resume.raw_text, c.rank_full, c.rank_blind) for c in result.top] == want
+    assert result.table.column("rank_full").to_pylist() == list(range(1, len(pool) + 1))